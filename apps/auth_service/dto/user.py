@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import date
 
 class UserCreateDTO(BaseModel):
@@ -39,6 +39,17 @@ class UserUpdateDTO(BaseModel):
     weight: Optional[int] = Field(None, ge=20, le=300)
     country_id: Optional[int] = None
 
+class UserBatchLookupDTO(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class UserDisplayNameDTO(BaseModel):
+    user_id: int
+    username: str
+    nickname: Optional[str] = None
+
+class UserBatchLookupResponseDTO(BaseModel):
+    users: Dict[int, UserDisplayNameDTO]
+
 class LineUserInfoDTO(BaseModel):
     user_id: str
     display_name: str
@@ -286,6 +286,13 @@ class UserRepository:
         """ID로 사용자 조회 (세션 파라미터 버전)"""
         return db.query(User).filter(User.id == user_id).first()
     
+    @staticmethod
+    def get_by_ids(user_ids: List[int], db: Session) -> List[User]:
+        """ID 목록으로 사용자 일괄 조회 (IN 쿼리 한 번)"""
+        if not user_ids:
+            return []
+        return db.query(User).filter(User.id.in_(user_ids)).all()
+    
     @staticmethod
     def get_refresh_token(user_id: int, db: Session) -> Optional[str]:
         """사용자의 리프레시 토큰 조회"""
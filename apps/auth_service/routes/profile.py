@@ -3,16 +3,19 @@
 프로필 생성, 조회, 업데이트, 삭제
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, status
 from sqlalchemy.orm import Session
 from common.base import get_db
 from services.profile_service import ProfileService
 from services.jwt_service import JWTService
+from services.profile_event_service import ProfileEventService
+from repository.user import UserRepository
 from dto.auth import (
     ProfileCreateDTO,
     ProfileUpdateDTO,
     UserProfileDTO
 )
+from dto.user import UserBatchLookupDTO, UserBatchLookupResponseDTO, UserDisplayNameDTO
 import logging
 
 logger = logging.getLogger(__name__)
@@ -87,6 +90,7 @@ async def get_profile(
 @router.put("/update", response_model=dict)
 async def update_profile(
     profile_data: ProfileUpdateDTO,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(JWTService.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -107,6 +111,12 @@ async def update_profile(
         user_id = current_user["user_id"]
         result = ProfileService.update_profile(user_id, profile_data, db)
         
+        # 표시 이름이 바뀌면 사용자 이름 캐시 무효화 알림 (응답 후 전송)
+        if "nickname" in result["updated_fields"]:
+            background_tasks.add_task(
+                ProfileEventService.notify_profile_updated, user_id, result["updated_fields"]
+            )
+        
         return result
         
     except ValueError as e:
@@ -197,8 +207,6 @@ async def get_user_basic_info(
     user_id로 사용자의 기본 정보(username, email, nickname)를 조회합니다.
     """
     try:
-        from repository.user import UserRepository
-        
         user = UserRepository.get_by_id(user_id, db)
         
         if not user:
@@ -221,4 +229,35 @@ async def get_user_basic_info(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="사용자 정보 조회 중 오류가 발생했습니다."
-        )
\ No newline at end of file
+        )
+
+@router.post("/users/batch", response_model=UserBatchLookupResponseDTO)
+async def get_users_basic_info_batch(
+    lookup: UserBatchLookupDTO,
+    db: Session = Depends(get_db)
+):
+    """
+    사용자 표시 이름 일괄 조회 (review-service 등에서 사용)
+    
+    - **user_ids**: 조회할 사용자 ID 목록 (최대 500개)
+    
+    한 번의 쿼리로 조회하며, 존재하지 않는 사용자는 결과에서 제외됩니다.
+    """
+    try:
+        users = UserRepository.get_by_ids(list(set(lookup.user_ids)), db)
+        
+        return UserBatchLookupResponseDTO(users={
+            user.id: UserDisplayNameDTO(
+                user_id=user.id,
+                username=user.username,
+                nickname=user.nickname
+            )
+            for user in users
+        })
+        
+    except Exception as e:
+        logger.error(f"사용자 일괄 조회 오류: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="사용자 정보 조회 중 오류가 발생했습니다."
+        )
@@ -0,0 +1,49 @@
+"""
+프로필 변경 알림 서비스
+닉네임 등 표시 이름이 바뀌면 사용자 이름을 캐시하는 서비스(review-service 등)에 무효화 요청 전송
+"""
+
+import os
+import logging
+from typing import List
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+class ProfileEventService:
+    """프로필 변경 웹훅 전송 서비스"""
+    
+    # 쉼표로 구분된 무효화 웹훅 URL 목록 (예: http://review-service:8000/api/v1/internal/users/invalidate)
+    WEBHOOK_URLS: List[str] = [
+        url.strip() for url in os.getenv("PROFILE_UPDATE_WEBHOOK_URLS", "").split(",") if url.strip()
+    ]
+    TIMEOUT = float(os.getenv("PROFILE_UPDATE_WEBHOOK_TIMEOUT", "3.0"))
+    
+    @staticmethod
+    async def notify_profile_updated(user_id: int, updated_fields: List[str]):
+        """
+        프로필 변경 알림 전송 (응답 후 백그라운드 작업으로 실행)
+        
+        전송에 실패해도 프로필 업데이트는 이미 완료된 상태이며,
+        수신 측 캐시는 TTL이 지나면 자연히 갱신되므로 경고만 남긴다.
+        
+        Args:
+            user_id: 사용자 ID
+            updated_fields: 변경된 필드 목록
+        """
+        if not ProfileEventService.WEBHOOK_URLS:
+            return
+        
+        payload = {
+            "event_type": "profile.updated",
+            "user_ids": [user_id],
+            "updated_fields": updated_fields
+        }
+        async with httpx.AsyncClient(timeout=ProfileEventService.TIMEOUT) as client:
+            for url in ProfileEventService.WEBHOOK_URLS:
+                try:
+                    response = await client.post(url, json=payload)
+                    response.raise_for_status()
+                except Exception as e:
+                    logger.warning(f"프로필 변경 알림 전송 실패 ({url}, user_id={user_id}): {e}")
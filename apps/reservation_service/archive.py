@@ -0,0 +1,166 @@
+"""
+archive.py - Reservation Archival
+예약 날짜가 오래된 완료/취소 예약과 첨부 이미지를 보관 테이블로 이동
+
+운영 테이블(reservations)에는 진행 중이거나 최근 예약만 남겨 활성 예약 조회가 이력 규모와 무관하게 유지된다
+조회 경로(routes.py)는 운영 테이블과 보관 테이블을 함께 조회한다
+
+수동 실행:
+    python archive.py run [--after-days 180] [--batch-size 500]
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models import (
+    Reservation, ReservationImage, ArchivedReservation, ArchivedReservationImage,
+    ARCHIVABLE_STATUSES, utc_now
+)
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+ARCHIVE_AFTER_DAYS = int(os.getenv("RESERVATION_ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("RESERVATION_ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL = float(os.getenv("RESERVATION_ARCHIVE_INTERVAL", "3600"))
+
+# 두 테이블에 공통인 컬럼 이름 (INSERT ... SELECT 대상)
+RESERVATION_COLUMNS = [column.key for column in Reservation.__table__.columns]
+IMAGE_COLUMNS = [column.key for column in ReservationImage.__table__.columns]
+
+def archive_cutoff(after_days: int = ARCHIVE_AFTER_DAYS) -> date:
+    """이 날짜 이전(미포함) 예약 날짜의 완료/취소 예약이 보관 대상"""
+    return date.today() - timedelta(days=after_days)
+
+def archive_batch(db: Session, cutoff: date, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    보관 대상 예약 한 배치를 이미지와 함께 보관 테이블로 이동 (한 트랜잭션), 이동한 예약 수 반환
+    INSERT ... SELECT / DELETE를 ID 목록 단위로 실행하여 행을 애플리케이션으로 읽어오지 않는다
+    """
+    query = db.query(Reservation.reservation_id).filter(
+        and_(
+            Reservation.status.in_(ARCHIVABLE_STATUSES),
+            Reservation.reservation_date < cutoff
+        )
+    ).order_by(Reservation.reservation_id).limit(batch_size)
+    if db.bind.dialect.name == "postgresql":
+        # 여러 인스턴스가 동시에 실행되어도 같은 예약을 중복 이동하지 않도록 잠금
+        query = query.with_for_update(skip_locked=True)
+    reservation_ids: List[int] = [row.reservation_id for row in query.all()]
+
+    if not reservation_ids:
+        db.rollback()
+        return 0
+
+    now = utc_now()
+    db.execute(
+        insert(ArchivedReservation.__table__).from_select(
+            RESERVATION_COLUMNS + ["archived_at"],
+            select(
+                *[Reservation.__table__.c[name] for name in RESERVATION_COLUMNS],
+                literal(now, ArchivedReservation.__table__.c.archived_at.type)
+            ).where(Reservation.reservation_id.in_(reservation_ids))
+        )
+    )
+    db.execute(
+        insert(ArchivedReservationImage.__table__).from_select(
+            IMAGE_COLUMNS,
+            select(*[ReservationImage.__table__.c[name] for name in IMAGE_COLUMNS]).where(
+                ReservationImage.reservation_id.in_(reservation_ids)
+            )
+        )
+    )
+    db.execute(delete(ReservationImage.__table__).where(ReservationImage.reservation_id.in_(reservation_ids)))
+    db.execute(delete(Reservation.__table__).where(Reservation.reservation_id.in_(reservation_ids)))
+    db.commit()
+    return len(reservation_ids)
+
+def archive_reservations(
+    db: Session,
+    after_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    limit: Optional[int] = None
+) -> int:
+    """보관 대상이 없을 때까지 배치 반복 (배치마다 커밋하므로 중단 후 재실행 가능)"""
+    cutoff = archive_cutoff(after_days)
+    total = 0
+    while limit is None or total < limit:
+        size = batch_size if limit is None else min(batch_size, limit - total)
+        moved = archive_batch(db, cutoff, size)
+        total += moved
+        if moved < size:
+            break
+    return total
+
+class ReservationArchiver:
+    """보관 대상 예약을 주기적으로 이동하는 백그라운드 작업"""
+
+    def __init__(self, session_factory, interval: float = ARCHIVE_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def archive_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return archive_reservations(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                # 대량 이동이 이벤트 루프를 막지 않도록 스레드에서 실행
+                moved = await asyncio.to_thread(self.archive_once)
+                if moved:
+                    logger.info("🗄️ 예약 %s건 보관 테이블로 이동", moved)
+            except Exception as e:
+                logger.error("❌ 예약 보관 처리 실패: %s", e)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info("🗄️ 예약 보관 작업 시작 (%s일 경과 완료/취소 예약, 주기 %s초)", ARCHIVE_AFTER_DAYS, self.interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+if __name__ == "__main__":
+    import argparse
+    from database import SessionLocal, create_tables
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="오래된 완료/취소 예약 보관 테이블 이동")
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--after-days", type=int, default=ARCHIVE_AFTER_DAYS, help="예약 날짜 경과 일수")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="배치당 예약 수")
+    parser.add_argument("--limit", type=int, default=None, help="최대 이동 예약 수")
+    args = parser.parse_args()
+
+    create_tables()
+    session = SessionLocal()
+    try:
+        moved = archive_reservations(session, args.after_days, args.batch_size, args.limit)
+        logger.info("✅ 예약 %s건 보관 완료", moved)
+    finally:
+        session.close()
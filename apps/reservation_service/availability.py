@@ -0,0 +1,221 @@
+"""
+availability.py - Reservation Service Slot Availability
+병원 운영시간 기반 예약 가능 시간대 계산 로직
+"""
+
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models import ReservationStatus
+
+# 예약 시간대 간격 (분)
+SLOT_INTERVAL_MINUTES = 30
+
+# 시간대를 점유하는 예약 상태
+ACTIVE_STATUSES = [ReservationStatus.PENDING, ReservationStatus.CONFIRMED]
+
+# 의사 근무 요일 표기 (doctor-service DoctorSchedule.available_days, 0=월요일)
+WEEKDAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+
+def parse_time(value: str) -> time:
+    """'HH:MM' 형식 문자열을 time 객체로 변환"""
+    return datetime.strptime(value, '%H:%M').time()
+
+def find_day_schedule(operating_hours: Optional[list], target_date: date) -> Optional[dict]:
+    """운영시간 목록에서 해당 날짜 요일의 운영시간 찾기 (0=월요일, ..., 6=일요일)"""
+    if not isinstance(operating_hours, list):
+        return None
+
+    weekday_num = target_date.weekday()
+    for schedule in operating_hours:
+        if schedule.get('day_of_week') == weekday_num:
+            return schedule
+    return None
+
+def check_operating_hours(operating_hours: Optional[list], reservation_date: date, reservation_time: time) -> Optional[str]:
+    """
+    예약 날짜/시간이 병원 운영시간에 포함되는지 검증
+    반환: 불가 사유 문자열, 예약 가능하면 None
+    """
+    if not operating_hours or not isinstance(operating_hours, list):
+        return "운영시간 정보가 없습니다."
+
+    day_schedule = find_day_schedule(operating_hours, reservation_date)
+    if not day_schedule:
+        return "해당 요일의 운영시간 정보가 없습니다."
+
+    if day_schedule.get('is_closed', True):
+        return "해당 요일은 휴무일입니다."
+
+    open_time = parse_time(day_schedule['open_time'])
+    close_time = parse_time(day_schedule['close_time'])
+    if not (open_time <= reservation_time <= close_time):
+        return "운영시간 외의 시간입니다."
+
+    if day_schedule.get('lunch_start') and day_schedule.get('lunch_end'):
+        lunch_start_time = parse_time(day_schedule['lunch_start'])
+        lunch_end_time = parse_time(day_schedule['lunch_end'])
+        if lunch_start_time <= reservation_time <= lunch_end_time:
+            return "점심시간입니다."
+
+    return None
+
+def build_time_slots(
+    day_schedule: Optional[dict],
+    reserved_times: Iterable[time],
+    held_times: Iterable[time] = ()
+) -> List[dict]:
+    """
+    하루 운영시간을 30분 간격 시간대로 나누고 예약 가능 여부 계산
+    held_times: 다른 사용자가 임시 점유(홀드) 중인 시간
+    반환: [{"time": "HH:MM", "available": bool, "reason": Optional[str]}, ...]
+    """
+    if not day_schedule or day_schedule.get('is_closed', True):
+        return []
+
+    reserved: Set[time] = set(reserved_times)
+    held: Set[time] = set(held_times)
+    open_time = parse_time(day_schedule['open_time'])
+    close_time = parse_time(day_schedule['close_time'])
+
+    # 점심시간 정보
+    lunch_start_time = None
+    lunch_end_time = None
+    if day_schedule.get('lunch_start') and day_schedule.get('lunch_end'):
+        lunch_start_time = parse_time(day_schedule['lunch_start'])
+        lunch_end_time = parse_time(day_schedule['lunch_end'])
+
+    slots = []
+    current_time = open_time
+
+    while current_time < close_time:
+        is_available = current_time not in reserved
+        reason = None
+
+        if not is_available:
+            reason = "이미 예약됨"
+        elif current_time in held:
+            is_available = False
+            reason = "다른 사용자가 예약 중"
+        elif lunch_start_time and lunch_end_time and lunch_start_time <= current_time <= lunch_end_time:
+            is_available = False
+            reason = "점심시간"
+
+        slots.append({
+            "time": current_time.strftime('%H:%M'),
+            "available": is_available,
+            "reason": reason
+        })
+
+        # 30분 추가 (자정을 넘기면 종료)
+        next_datetime = datetime.combine(date.min, current_time) + timedelta(minutes=SLOT_INTERVAL_MINUTES)
+        if next_datetime.date() != date.min:
+            break
+        current_time = next_datetime.time()
+
+    return slots
+
+def encode_slot_bitmap(slots: List[dict]) -> str:
+    """시간대 목록을 '1'(가능)/'0'(불가) 비트맵 문자열로 인코딩"""
+    return ''.join('1' if slot["available"] else '0' for slot in slots)
+
+def daterange(date_from: date, date_to: date) -> List[date]:
+    """date_from ~ date_to (포함) 날짜 목록"""
+    return [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+
+def group_reserved_times(rows: Iterable) -> Dict[tuple, Set[time]]:
+    """(hospital_id, reservation_date, reservation_time) 행을 (병원, 날짜)별 예약 시간 집합으로 그룹화"""
+    grouped: Dict[tuple, Set[time]] = {}
+    for hospital_id, reservation_date, reservation_time in rows:
+        grouped.setdefault((hospital_id, reservation_date), set()).add(reservation_time)
+    return grouped
+
+# === Doctor Schedules ===
+
+def _to_minutes(value) -> int:
+    """time 또는 'HH:MM[:SS]' 문자열을 자정 기준 분으로 변환"""
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    return value.hour * 60 + value.minute
+
+def doctor_work_windows(doctor_schedules: Optional[list], target_date: date) -> Optional[List[Tuple[int, int]]]:
+    """
+    의사 근무일정 중 해당 날짜 요일의 근무 시간대 (시작 분, 종료 분) 목록
+    근무일정이 등록되지 않은 의사(None 또는 빈 목록)는 제한 없음으로 보고 None 반환
+    """
+    if not doctor_schedules:
+        return None
+
+    day_name = WEEKDAY_NAMES[target_date.weekday()]
+    windows = []
+    for schedule in doctor_schedules:
+        days = [day.strip() for day in (schedule.get('available_days') or '').split(',')]
+        if day_name in days:
+            windows.append((_to_minutes(schedule['work_start_time']), _to_minutes(schedule['work_end_time'])))
+    return windows
+
+def check_doctor_schedule(doctor_schedules: Optional[list], reservation_date: date, reservation_time: time) -> Optional[str]:
+    """
+    예약 시간대가 의사 근무시간에 포함되는지 검증
+    반환: 불가 사유 문자열, 예약 가능하면 None
+    """
+    windows = doctor_work_windows(doctor_schedules, reservation_date)
+    if windows is None:
+        return None
+
+    slot_start = _to_minutes(reservation_time)
+    for start, end in windows:
+        if start <= slot_start and slot_start + SLOT_INTERVAL_MINUTES <= end:
+            return None
+    return "의사 근무시간이 아닙니다."
+
+def compute_doctor_slot_matrix(
+    slots: List[dict],
+    doctor_schedules_map: Dict[int, Optional[list]],
+    target_date: date
+) -> Dict[int, np.ndarray]:
+    """
+    하루 시간대 목록과 의사별 근무일정으로 의사별 예약 가능 여부 벡터 계산
+    - 병원 기준 가능 여부(운영시간, 점심시간, 기존 예약)와 의사 근무시간 마스크를 numpy로 한 번에 교차
+    반환: {doctor_id: bool 배열 (slots와 같은 순서)}
+    """
+    if not slots:
+        return {doctor_id: np.zeros(0, dtype=bool) for doctor_id in doctor_schedules_map}
+
+    slot_minutes = np.array([_to_minutes(slot["time"]) for slot in slots], dtype=np.int32)
+    base_mask = np.array([slot["available"] for slot in slots], dtype=bool)
+
+    result = {}
+    for doctor_id, doctor_schedules in doctor_schedules_map.items():
+        windows = doctor_work_windows(doctor_schedules, target_date)
+        if windows is None:
+            result[doctor_id] = base_mask.copy()
+            continue
+        if not windows:
+            result[doctor_id] = np.zeros(len(slots), dtype=bool)
+            continue
+
+        window_array = np.array(windows, dtype=np.int32)
+        # (근무 시간대 수 x 시간대 수) 비교 후 어느 근무 시간대에든 포함되면 가능
+        in_window = (
+            (slot_minutes[None, :] >= window_array[:, 0:1])
+            & (slot_minutes[None, :] + SLOT_INTERVAL_MINUTES <= window_array[:, 1:2])
+        ).any(axis=0)
+        result[doctor_id] = base_mask & in_window
+    return result
+
+def apply_doctor_schedule(slots: List[dict], doctor_schedules: Optional[list], target_date: date) -> List[dict]:
+    """병원 기준 시간대 목록에 의사 근무시간 제약 적용 (불가 사유: '의사 근무시간 아님')"""
+    available = compute_doctor_slot_matrix(slots, {0: doctor_schedules}, target_date)[0]
+    result = []
+    for slot, is_available in zip(slots, available):
+        if slot["available"] and not is_available:
+            slot = {**slot, "available": False, "reason": "의사 근무시간 아님"}
+        result.append(slot)
+    return result
+
+def encode_mask_bitmap(mask: np.ndarray) -> str:
+    """bool 배열을 '1'/'0' 비트맵 문자열로 인코딩"""
+    return ''.join('1' if value else '0' for value in mask.tolist())
@@ -0,0 +1,258 @@
+"""
+blob_store.py - Reservation Service Blob Storage
+예약 첨부 이미지 저장소 (콘텐츠 해시 기반, 로컬 파일시스템 / S3 호환)
+"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Tuple
+
+# 환경 변수 설정
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")  # local | s3
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "data/blobs")
+BLOB_STORE_BUCKET = os.getenv("BLOB_STORE_BUCKET", "reservation-images")
+BLOB_STORE_PREFIX = os.getenv("BLOB_STORE_PREFIX", "reservation-images/")
+BLOB_STORE_ENDPOINT_URL = os.getenv("BLOB_STORE_ENDPOINT_URL")  # MinIO 등 S3 호환 스토리지
+
+# 스트리밍 읽기 단위
+CHUNK_SIZE = 64 * 1024
+
+def content_key(data: bytes) -> str:
+    """콘텐츠 해시(SHA-256) 기반 저장 키"""
+    return hashlib.sha256(data).hexdigest()
+
+class BlobNotFoundError(Exception):
+    """저장소에 해당 키의 데이터가 없음"""
+    pass
+
+class BlobWriter(ABC):
+    """
+    청크 단위 저장기
+    전체 데이터를 메모리에 올리지 않고 임시 파일에 쓰면서 해시와 크기를 계산한다
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix=".incoming-", delete=False)
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def key(self) -> str:
+        return self._hash.hexdigest()
+
+    def commit(self) -> Tuple[str, int]:
+        """쓰기 완료 후 저장소에 반영, (키, 크기) 반환"""
+        self._file.close()
+        try:
+            self._finalize(self._file.name, self.key)
+        finally:
+            if os.path.exists(self._file.name):
+                os.remove(self._file.name)
+        return self.key, self.size
+
+    def abort(self):
+        """쓰기 취소 및 임시 파일 삭제"""
+        self._file.close()
+        if os.path.exists(self._file.name):
+            os.remove(self._file.name)
+
+    @abstractmethod
+    def _finalize(self, tmp_path: str, key: str):
+        """임시 파일(tmp_path)을 저장소의 key 위치로 반영"""
+
+class BlobStore(ABC):
+    """
+    이미지 저장소 인터페이스
+    같은 내용은 같은 키(SHA-256)로 한 번만 저장된다
+    """
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """데이터 저장 후 키 반환 (이미 존재하면 저장 생략)"""
+
+    @abstractmethod
+    def open_writer(self) -> BlobWriter:
+        """청크 단위 저장을 위한 writer 생성 (write → commit / abort)"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """키의 데이터 존재 여부"""
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """저장된 데이터 크기 (bytes)"""
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """start ~ end(포함) 범위의 데이터를 청크 단위로 반환, end가 None이면 끝까지"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """키의 데이터 삭제 (없으면 무시)"""
+
+class _LocalBlobWriter(BlobWriter):
+    def __init__(self, store: "LocalBlobStore"):
+        self.store = store
+        super().__init__(directory=store.root)
+
+    def _finalize(self, tmp_path: str, key: str):
+        path = self.store._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+
+class LocalBlobStore(BlobStore):
+    """로컬 파일시스템 저장소 (개발/테스트 및 단일 노드 배포용)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # 디렉토리당 파일 수를 줄이기 위해 해시 앞 4자리로 2단계 분산
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def put(self, data: bytes) -> str:
+        key = content_key(data)
+        path = self._path(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 rename하여 부분 기록된 파일이 노출되지 않도록 처리
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return key
+
+    def open_writer(self) -> BlobWriter:
+        return _LocalBlobWriter(self)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        try:
+            f = open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+        def _iterate():
+            with f:
+                f.seek(start)
+                remaining = None if end is None else end - start + 1
+                while remaining is None or remaining > 0:
+                    chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+
+        return _iterate()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class _S3BlobWriter(BlobWriter):
+    def __init__(self, store: "S3BlobStore"):
+        self.store = store
+        super().__init__()
+
+    def _finalize(self, tmp_path: str, key: str):
+        if self.store._head(key) is None:
+            self.store.client.upload_file(tmp_path, self.store.bucket, self.store._object_key(key))
+
+class S3BlobStore(BlobStore):
+    """S3 호환 오브젝트 스토리지 (boto3 필요)"""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("S3 저장소를 사용하려면 boto3 패키지가 필요합니다.")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _head(self, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def put(self, data: bytes) -> str:
+        key = content_key(data)
+        if self._head(key) is None:
+            self.client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data)
+        return key
+
+    def open_writer(self) -> BlobWriter:
+        return _S3BlobWriter(self)
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def size(self, key: str) -> int:
+        head = self._head(key)
+        if head is None:
+            raise BlobNotFoundError(key)
+        return head["ContentLength"]
+
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        byte_range = f"bytes={start}-" if end is None else f"bytes={start}-{end}"
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key), Range=byte_range)
+        except self.client.exceptions.NoSuchKey:
+            raise BlobNotFoundError(key)
+        return response["Body"].iter_chunks(chunk_size=CHUNK_SIZE)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+_blob_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    """환경 설정에 따른 저장소 싱글톤"""
+    global _blob_store
+    if _blob_store is None:
+        if BLOB_STORE_BACKEND == "s3":
+            _blob_store = S3BlobStore(BLOB_STORE_BUCKET, BLOB_STORE_PREFIX, BLOB_STORE_ENDPOINT_URL)
+        else:
+            _blob_store = LocalBlobStore(BLOB_STORE_PATH)
+    return _blob_store
+
+def set_blob_store(store: BlobStore):
+    """저장소 교체 (테스트/벤치마크에서 임시 디렉토리 저장소 주입용)"""
+    global _blob_store
+    _blob_store = store
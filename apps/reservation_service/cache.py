@@ -0,0 +1,61 @@
+"""
+cache.py - Reservation Service Local Cache
+외부 서비스(병원/의사) 조회 결과를 위한 프로세스 내부 TTL 캐시
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class AsyncTTLCache:
+    """
+    비동기 로더 결과를 TTL 동안 보관하는 캐시
+    - 같은 키를 동시에 요청하면 로더는 한 번만 실행된다
+    - 로더가 None을 반환하면(조회 실패) 캐시하지 않는다
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            if value is not None:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # 대기 중인 요청이 없으면 예외가 회수되지 않았다는 경고가 나오지 않도록 처리
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        self._entries[key] = (now + self.ttl_seconds, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """키 하나 또는 전체 캐시 무효화"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -40,6 +40,67 @@ def get_database():
     finally:
         db.close()
 
+# 기존 updated_at 값이 기록된 서버 로컬 시간대 (예약 수정/취소 시 datetime.now()로 기록됨, 컨테이너 기본값 UTC)
+LEGACY_SERVER_TIMEZONE = os.getenv("LEGACY_SERVER_TIMEZONE", "UTC")
+
+def to_timestamptz(table: str, column: str, using: str) -> str:
+    """
+    timestamp(naive) 컬럼을 timestamptz로 변환하는 DDL
+    이미 timestamptz인 컬럼은 건너뛰므로 여러 번 실행해도 값이 다시 변환되지 않는다
+    """
+    return f"""
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = '{table}' AND column_name = '{column}'
+              AND data_type = 'timestamp without time zone'
+        ) THEN
+            ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMPTZ USING {using};
+        END IF;
+    END $$;
+    """
+
+# 기존 테이블에 적용할 스키마 변경 (PostgreSQL, 멱등 DDL)
+SCHEMA_MIGRATIONS = [
+    # 예약 이미지 blob 저장소 이전
+    "ALTER TABLE reservation_images ADD COLUMN IF NOT EXISTS storage_key VARCHAR(64)",
+    "ALTER TABLE reservation_images ALTER COLUMN image_data DROP NOT NULL",
+    
+    # 일시 컬럼 timestamptz 전환 (기존 값은 KST 벽시계 시각으로 저장됨)
+    # updated_at: 생성 후 수정되지 않은 행은 created_at과 같은 KST 값, 수정된 행은 서버 로컬 시각
+    # (created_at 변환 전에 실행해야 두 값을 비교할 수 있음)
+    to_timestamptz(
+        "reservations", "updated_at",
+        "CASE WHEN updated_at IS NULL OR created_at IS NULL "
+        "OR abs(extract(epoch FROM updated_at - created_at)) < 5 "
+        "THEN updated_at AT TIME ZONE 'Asia/Seoul' "
+        f"ELSE updated_at AT TIME ZONE '{LEGACY_SERVER_TIMEZONE}' END"
+    ),
+    to_timestamptz("reservations", "created_at", "created_at AT TIME ZONE 'Asia/Seoul'"),
+    to_timestamptz("reservation_images", "created_at", "created_at AT TIME ZONE 'Asia/Seoul'"),
+    to_timestamptz("reservation_events", "created_at", "created_at AT TIME ZONE 'Asia/Seoul'"),
+    to_timestamptz("reservation_events", "published_at", "published_at AT TIME ZONE 'Asia/Seoul'"),
+    to_timestamptz("reservation_holds", "created_at", "created_at AT TIME ZONE 'Asia/Seoul'"),
+    to_timestamptz("reservation_holds", "expires_at", "expires_at AT TIME ZONE 'Asia/Seoul'"),
+    
+    # 이벤트 피드 순서 (커밋 순서): 컬럼 추가 시 기존 이벤트는 모두 커밋되어 있으므로 event_id 순서를 그대로 사용
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'reservation_events' AND column_name = 'sequence'
+        ) THEN
+            ALTER TABLE reservation_events ADD COLUMN sequence BIGINT;
+            UPDATE reservation_events SET sequence = event_id;
+        END IF;
+    END $$;
+    """,
+    "ALTER TABLE reservation_events ADD COLUMN IF NOT EXISTS claimed_until TIMESTAMPTZ",
+    "DROP INDEX IF EXISTS ix_reservation_events_unpublished",
+]
+
 def create_tables():
     """
     데이터베이스 테이블 생성
@@ -47,11 +108,35 @@ def create_tables():
     """
     try:
         Base.metadata.create_all(bind=engine)
+        apply_schema_migrations()
+        create_missing_indexes()
         logger.info("✅ Reservation service 데이터베이스 테이블이 성공적으로 생성되었습니다.")
     except Exception as e:
-        logger.error(f"❌ 데이터베이스 테이블 생성 실패: {e}")
+        logger.error("❌ 데이터베이스 테이블 생성 실패: %s", e)
         raise
 
+def apply_schema_migrations():
+    """기존 테이블에 컬럼 추가 등 스키마 변경 적용 (create_all은 기존 테이블을 변경하지 않음)"""
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as connection:
+        for statement in SCHEMA_MIGRATIONS:
+            connection.execute(text(statement))
+
+def create_missing_indexes():
+    """
+    모델에 정의된 인덱스 중 DB에 없는 인덱스 생성
+    create_all은 이미 존재하는 테이블에 새 인덱스를 추가하지 않으므로 별도로 처리
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # 기존 중복 데이터 등으로 유니크 인덱스 생성이 실패해도 서비스는 계속 기동
+                logger.error("❌ 인덱스 %s 생성 실패: %s", index.name, e)
+
 def test_connection():
     """
     데이터베이스 연결 테스트
@@ -64,7 +149,7 @@ def test_connection():
         logger.info("✅ Reservation service 데이터베이스 연결이 성공적으로 확인되었습니다.")
         return True
     except Exception as e:
-        logger.error(f"❌ 데이터베이스 연결 실패: {e}")
+        logger.error("❌ 데이터베이스 연결 실패: %s", e)
         return False
 
 if __name__ == "__main__":
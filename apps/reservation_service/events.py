@@ -0,0 +1,319 @@
+"""
+events.py - Reservation Domain Events
+예약 도메인 이벤트 아웃박스 기록 및 구독자 전달 (Transactional Outbox)
+"""
+
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import httpx
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+
+from models import Reservation, ReservationEvent, utc_now
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 타입
+RESERVATION_CREATED = "reservation.created"
+RESERVATION_UPDATED = "reservation.updated"
+RESERVATION_STATUS_CHANGED = "reservation.status_changed"
+
+# 환경 변수 설정
+EVENT_WEBHOOK_URLS = [url.strip() for url in os.getenv("RESERVATION_EVENT_WEBHOOK_URLS", "").split(",") if url.strip()]
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "30"))
+OUTBOX_CLAIM_SECONDS = float(os.getenv("OUTBOX_CLAIM_SECONDS", "60"))
+
+# 이벤트 순서(sequence) 부여를 인스턴스 간 직렬화하는 PostgreSQL advisory lock 키
+OUTBOX_SEQUENCE_LOCK_KEY = 7301033
+
+def serialize_reservation(reservation: Reservation) -> dict:
+    """이벤트 페이로드용 예약 요약 (개인정보 및 증상 등 본문 제외)"""
+    return {
+        "reservation_id": reservation.reservation_id,
+        "user_id": reservation.user_id,
+        "hospital_id": reservation.hospital_id,
+        "doctor_id": reservation.doctor_id,
+        "reservation_date": reservation.reservation_date.isoformat() if reservation.reservation_date else None,
+        "reservation_time": reservation.reservation_time.strftime('%H:%M') if reservation.reservation_time else None,
+        "status": _value(reservation.status),
+        "interpreter_language": _value(reservation.interpreter_language),
+    }
+
+def _value(value):
+    """Enum이면 값으로 변환"""
+    return getattr(value, "value", value)
+
+def record_reservation_event(
+    db: Session,
+    event_type: str,
+    reservation: Reservation,
+    previous: Optional[dict] = None
+) -> ReservationEvent:
+    """
+    예약 변경과 같은 트랜잭션에 이벤트 기록 (커밋은 호출자가 수행)
+    reservation_id가 필요하므로 새 예약은 flush 이후에 호출해야 한다
+    """
+    payload = {"reservation": serialize_reservation(reservation)}
+    if previous is not None:
+        payload["previous"] = previous
+
+    event = ReservationEvent(
+        reservation_id=reservation.reservation_id,
+        hospital_id=reservation.hospital_id,
+        event_type=event_type,
+        payload=payload
+    )
+    db.add(event)
+    return event
+
+def event_to_message(event: ReservationEvent) -> dict:
+    """구독자에게 전달되는 이벤트 메시지"""
+    return {
+        "event_id": event.event_id,
+        "sequence": event.sequence,
+        "event_type": event.event_type,
+        "reservation_id": event.reservation_id,
+        "hospital_id": event.hospital_id,
+        "occurred_at": event.created_at.isoformat() if event.created_at else None,
+        "data": event.payload,
+    }
+
+# === Subscribers ===
+
+class EventSubscriber(ABC):
+    """이벤트 구독자 인터페이스"""
+
+    @abstractmethod
+    async def publish(self, message: dict):
+        """이벤트 메시지 전달 (실패하면 예외를 발생시켜 재시도)"""
+
+class WebhookSubscriber(EventSubscriber):
+    """HTTP POST로 이벤트 전달 (2xx가 아니면 실패로 간주하여 재시도)"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def publish(self, message: dict):
+        response = await self._client.post(self.url, json=message)
+        response.raise_for_status()
+
+    async def close(self):
+        await self._client.aclose()
+
+class InProcessQueueSubscriber(EventSubscriber):
+    """
+    프로세스 내부 큐 (로컬 개발/테스트용 대체 구독자)
+    큐가 가득 차면 가장 오래된 이벤트를 버린다
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def publish(self, message: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+# === Dispatcher ===
+
+class OutboxDispatcher:
+    """
+    미발행 아웃박스 이벤트를 주기적으로 조회하여 구독자에게 전달
+    1. 순서 부여: 커밋된 이벤트에 sequence를 부여 (advisory lock으로 직렬화하므로 sequence 순서 = 부여 트랜잭션 커밋 순서)
+    2. 점유: 미발행 이벤트 한 배치에 claimed_until을 기록하고 바로 커밋 (PostgreSQL은 FOR UPDATE SKIP LOCKED로 점유)
+    3. 전달: 트랜잭션/행 잠금 없이 구독자에게 전달
+    4. 완료: 전달한 이벤트를 발행 완료로 표시하고 나머지는 점유 해제
+    전달 중 중단되면 점유가 만료된 뒤 다른 주기/인스턴스가 다시 전달한다 (at-least-once)
+    """
+
+    def __init__(self, session_factory, subscribers: Optional[List[EventSubscriber]] = None):
+        self.session_factory = session_factory
+        self.subscribers: List[EventSubscriber] = list(subscribers or [])
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._last_purge: Optional[datetime] = None
+
+    def add_subscriber(self, subscriber: EventSubscriber):
+        self.subscribers.append(subscriber)
+
+    def assign_sequences(self) -> int:
+        """
+        순서 미부여 이벤트에 INSERT 순서대로 sequence 부여, 부여한 개수 반환
+        잠금을 커밋까지 유지하므로 먼저 부여된 sequence가 항상 먼저 커밋된다
+        """
+        db = self.session_factory()
+        try:
+            if db.bind.dialect.name == "postgresql":
+                db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": OUTBOX_SEQUENCE_LOCK_KEY})
+            events = db.query(ReservationEvent).filter(
+                ReservationEvent.sequence.is_(None)
+            ).order_by(ReservationEvent.event_id).limit(OUTBOX_BATCH_SIZE).all()
+            if events:
+                last_sequence = db.query(func.max(ReservationEvent.sequence)).scalar() or 0
+                for offset, event in enumerate(events, start=1):
+                    event.sequence = last_sequence + offset
+            db.commit()
+            return len(events)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def claim_batch(self) -> List[dict]:
+        """미발행 이벤트 한 배치를 점유하고 커밋, 전달할 메시지 목록 반환 (sequence 순서)"""
+        db = self.session_factory()
+        try:
+            now = utc_now()
+            query = db.query(ReservationEvent).filter(
+                and_(
+                    ReservationEvent.sequence.isnot(None),
+                    ReservationEvent.published_at.is_(None),
+                    ReservationEvent.attempts < OUTBOX_MAX_ATTEMPTS,
+                    or_(ReservationEvent.claimed_until.is_(None), ReservationEvent.claimed_until < now)
+                )
+            ).order_by(ReservationEvent.sequence).limit(OUTBOX_BATCH_SIZE)
+            if db.bind.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            events = query.all()
+
+            claimed_until = now + timedelta(seconds=OUTBOX_CLAIM_SECONDS)
+            messages = []
+            for event in events:
+                event.claimed_until = claimed_until
+                messages.append(event_to_message(event))
+            db.commit()
+            return messages
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def complete_batch(self, messages: List[dict], published_ids: List[int], error: Optional[Exception] = None):
+        """전달한 이벤트는 발행 완료, 실패한 이벤트는 시도 횟수 증가, 나머지는 점유 해제"""
+        db = self.session_factory()
+        try:
+            published_at = utc_now()
+            published = set(published_ids)
+            events = db.query(ReservationEvent).filter(
+                ReservationEvent.event_id.in_([message["event_id"] for message in messages])
+            ).all()
+            failed_id = messages[len(published_ids)]["event_id"] if error is not None else None
+            for event in events:
+                event.claimed_until = None
+                if event.event_id in published:
+                    event.published_at = published_at
+                elif event.event_id == failed_id:
+                    event.attempts = (event.attempts or 0) + 1
+                    event.last_error = str(error)[:1000]
+                    logger.warning("⚠️ 이벤트 %s 전달 실패 (%s회): %s", event.event_id, event.attempts, error)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def dispatch_once(self) -> int:
+        """
+        순서 부여 후 미발행 이벤트 한 배치 전달, 전달한 이벤트 수 반환
+        DB 작업(동기 세션, advisory lock 대기 포함)은 이벤트 루프를 막지 않도록 스레드에서 실행
+        """
+        await asyncio.to_thread(self.assign_sequences)
+        messages = await asyncio.to_thread(self.claim_batch)
+        if not messages:
+            return 0
+
+        published_ids: List[int] = []
+        error = None
+        for message in messages:
+            try:
+                for subscriber in self.subscribers:
+                    await subscriber.publish(message)
+            except Exception as e:
+                # 순서 보장을 위해 실패한 이벤트 이후는 점유를 해제하고 다음 주기에 재시도
+                error = e
+                break
+            published_ids.append(message["event_id"])
+
+        await asyncio.to_thread(self.complete_batch, messages, published_ids, error)
+        return len(published_ids)
+
+    def purge_published(self):
+        """
+        보관 기간이 지난 발행 완료 이벤트 삭제
+        sequence 최댓값 행은 남긴다 (다음 sequence는 max + 1이므로 모두 지우면 번호가 1부터 다시 시작되어
+        after_sequence를 가진 /events 소비자가 새 이벤트를 건너뛰게 됨)
+        """
+        db = self.session_factory()
+        try:
+            cutoff = utc_now() - timedelta(days=OUTBOX_RETENTION_DAYS)
+            last_sequence = db.query(func.max(ReservationEvent.sequence)).scalar_subquery()
+            deleted = db.query(ReservationEvent).filter(
+                and_(
+                    ReservationEvent.published_at.isnot(None),
+                    ReservationEvent.created_at < cutoff,
+                    ReservationEvent.sequence < last_sequence
+                )
+            ).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                logger.info("🧹 발행 완료 이벤트 %s건 정리", deleted)
+        except Exception as e:
+            db.rollback()
+            logger.error("❌ 이벤트 정리 실패: %s", e)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                published = await self.dispatch_once()
+            except Exception as e:
+                logger.error("❌ 이벤트 디스패치 실패: %s", e)
+                published = 0
+
+            now = utc_now()
+            if self._last_purge is None or now - self._last_purge > timedelta(hours=1):
+                self._last_purge = now
+                await asyncio.to_thread(self.purge_published)
+
+            # 배치를 가득 채웠으면 바로 다음 배치 처리
+            if published < OUTBOX_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info("📣 이벤트 디스패처 시작 (구독자 %s개)", len(self.subscribers))
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        for subscriber in self.subscribers:
+            if isinstance(subscriber, WebhookSubscriber):
+                await subscriber.close()
+
+def create_dispatcher(session_factory) -> OutboxDispatcher:
+    """환경 설정의 웹훅 구독자로 디스패처 생성"""
+    return OutboxDispatcher(
+        session_factory,
+        subscribers=[WebhookSubscriber(url) for url in EVENT_WEBHOOK_URLS]
+    )
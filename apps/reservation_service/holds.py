@@ -0,0 +1,210 @@
+"""
+holds.py - Reservation Slot Holds
+예약 시간대 임시 점유(홀드) 생성/조회/해제 및 만료 홀드 정리
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from models import ReservationHold, utc_now
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+HOLD_DEFAULT_MINUTES = int(os.getenv("RESERVATION_HOLD_DEFAULT_MINUTES", "10"))
+HOLD_MAX_MINUTES = int(os.getenv("RESERVATION_HOLD_MAX_MINUTES", "30"))
+HOLD_SWEEP_INTERVAL = float(os.getenv("RESERVATION_HOLD_SWEEP_INTERVAL", "30"))
+HOLD_SWEEP_BATCH_SIZE = int(os.getenv("RESERVATION_HOLD_SWEEP_BATCH_SIZE", "500"))
+
+def hold_now() -> datetime:
+    """홀드 만료 비교 기준 시각 (UTC)"""
+    return utc_now()
+
+def active_hold_condition(now: datetime):
+    """만료되지 않은 홀드 조건"""
+    return ReservationHold.expires_at > now
+
+def find_slot_hold(db: Session, hospital_id: int, reservation_date: date, reservation_time: time) -> Optional[ReservationHold]:
+    """시간대의 유효한 홀드 조회 (만료된 홀드는 없는 것으로 취급)"""
+    return db.query(ReservationHold).filter(
+        and_(
+            ReservationHold.hospital_id == hospital_id,
+            ReservationHold.reservation_date == reservation_date,
+            ReservationHold.reservation_time == reservation_time,
+            active_hold_condition(hold_now())
+        )
+    ).first()
+
+def find_hold_by_token(db: Session, hold_token: str) -> Optional[ReservationHold]:
+    """토큰으로 유효한 홀드 조회"""
+    return db.query(ReservationHold).filter(
+        and_(
+            ReservationHold.hold_token == hold_token,
+            active_hold_condition(hold_now())
+        )
+    ).first()
+
+def create_hold(
+    db: Session,
+    user_id: int,
+    hospital_id: int,
+    doctor_id: Optional[int],
+    reservation_date: date,
+    reservation_time: time,
+    hold_minutes: int
+) -> ReservationHold:
+    """
+    시간대 홀드 생성 (flush까지만 수행, 커밋은 호출자)
+    같은 시간대에 만료된 홀드가 남아 있으면 먼저 삭제하고, 유효한 홀드가 있으면 유니크 제약 위반(IntegrityError)
+    """
+    now = hold_now()
+    db.query(ReservationHold).filter(
+        and_(
+            ReservationHold.hospital_id == hospital_id,
+            ReservationHold.reservation_date == reservation_date,
+            ReservationHold.reservation_time == reservation_time,
+            ReservationHold.expires_at <= now
+        )
+    ).delete(synchronize_session=False)
+
+    hold = ReservationHold(
+        hold_token=uuid.uuid4().hex,
+        user_id=user_id,
+        hospital_id=hospital_id,
+        doctor_id=doctor_id,
+        reservation_date=reservation_date,
+        reservation_time=reservation_time,
+        expires_at=now + timedelta(minutes=hold_minutes)
+    )
+    db.add(hold)
+    db.flush()
+    return hold
+
+def release_hold(db: Session, hold_token: str) -> int:
+    """토큰의 홀드 삭제 (만료 여부 무관, 커밋은 호출자), 삭제한 행 수 반환"""
+    return db.query(ReservationHold).filter(
+        ReservationHold.hold_token == hold_token
+    ).delete(synchronize_session=False)
+
+def release_slot_hold(db: Session, hold_token: str, hospital_id: int, reservation_date: date, reservation_time: time) -> int:
+    """
+    예약한 시간대와 같은 시간대의 홀드만 토큰으로 삭제 (커밋은 호출자), 삭제한 행 수 반환
+    다른 시간대를 잡아 둔 토큰이 전달되어도 그 홀드는 유지된다
+    """
+    return db.query(ReservationHold).filter(
+        and_(
+            ReservationHold.hold_token == hold_token,
+            ReservationHold.hospital_id == hospital_id,
+            ReservationHold.reservation_date == reservation_date,
+            ReservationHold.reservation_time == reservation_time
+        )
+    ).delete(synchronize_session=False)
+
+def hold_blocks_slot(hold: Optional[ReservationHold], hold_token: Optional[str]) -> bool:
+    """유효한 홀드가 다른 사용자(다른 토큰)의 것이면 True"""
+    return hold is not None and hold.hold_token != hold_token
+
+def get_held_times(db: Session, hospital_id: int, target_date: date) -> Set[time]:
+    """병원/날짜의 유효한 홀드 시간 집합"""
+    rows = db.query(ReservationHold.reservation_time).filter(
+        and_(
+            ReservationHold.hospital_id == hospital_id,
+            ReservationHold.reservation_date == target_date,
+            active_hold_condition(hold_now())
+        )
+    ).all()
+    return {row.reservation_time for row in rows}
+
+def get_held_slots(db: Session, hospital_ids: Iterable[int], date_from: date, date_to: date) -> Dict[tuple, Set[time]]:
+    """여러 병원/기간의 유효한 홀드를 (병원, 날짜)별 시간 집합으로 조회"""
+    rows = db.query(
+        ReservationHold.hospital_id,
+        ReservationHold.reservation_date,
+        ReservationHold.reservation_time
+    ).filter(
+        and_(
+            ReservationHold.hospital_id.in_(list(hospital_ids)),
+            ReservationHold.reservation_date >= date_from,
+            ReservationHold.reservation_date <= date_to,
+            active_hold_condition(hold_now())
+        )
+    ).all()
+
+    grouped: Dict[tuple, Set[time]] = {}
+    for hospital_id, reservation_date, reservation_time in rows:
+        grouped.setdefault((hospital_id, reservation_date), set()).add(reservation_time)
+    return grouped
+
+def sweep_expired_holds(db: Session, batch_size: int = HOLD_SWEEP_BATCH_SIZE) -> int:
+    """
+    만료된 홀드 한 배치 삭제, 삭제한 행 수 반환
+    expires_at 인덱스 범위만 읽으므로 테이블 전체를 스캔하지 않는다
+    """
+    expired_ids = select(ReservationHold.id).where(
+        ReservationHold.expires_at <= hold_now()
+    ).order_by(ReservationHold.expires_at).limit(batch_size)
+
+    deleted = db.query(ReservationHold).filter(
+        ReservationHold.id.in_(expired_ids.scalar_subquery())
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+class HoldSweeper:
+    """만료된 홀드를 주기적으로 정리하는 백그라운드 작업"""
+
+    def __init__(self, session_factory, interval: float = HOLD_SWEEP_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def sweep_once(self) -> int:
+        """만료 홀드를 모두 정리할 때까지 배치 삭제 반복"""
+        db = self.session_factory()
+        try:
+            total = 0
+            while True:
+                deleted = sweep_expired_holds(db)
+                total += deleted
+                if deleted < HOLD_SWEEP_BATCH_SIZE:
+                    return total
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                # 삭제 쿼리가 이벤트 루프를 막지 않도록 스레드에서 실행
+                deleted = await asyncio.to_thread(self.sweep_once)
+                if deleted:
+                    logger.info("🧹 만료된 예약 홀드 %s건 정리", deleted)
+            except Exception as e:
+                logger.error("❌ 예약 홀드 정리 실패: %s", e)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info("⏳ 예약 홀드 스위퍼 시작 (주기 %s초)", self.interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
@@ -0,0 +1,776 @@
+"""
+loadtest.py - Reservation Service Load Test & Benchmark
+예약 생성/검색/가능 시간 조회 엔드포인트 부하 테스트 (엔드포인트별 처리량, p50/p95/p99, DB 쿼리 수)
+
+- 로컬 PostgreSQL 또는 SQLite(기본값)에 현실적인 규모의 데이터를 시드
+- hospital-service / doctor-service는 로컬 스텁 서버로 대체 (응답 지연 설정 가능)
+- 앱은 프로세스 내부(ASGI)에서 구동하여 엔진 이벤트로 요청당 쿼리 수를 측정
+- 결과는 JSON으로 저장하여 이전 실행과 비교
+
+사용법:
+    python loadtest.py [--database-url URL] [--hospitals 200] [--reservations 50000]
+                       [--duration 20] [--concurrency 32] [--rps 150]
+                       [--endpoints create,search,available_times] [--compare 이전결과.json]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time as time_module
+from collections import Counter
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Callable, List, Optional
+
+DEFAULT_DATABASE_URL = "sqlite:///./loadtest_data/loadtest.db"
+DEFAULT_RESULTS_DIR = "loadtest_results"
+
+SLOT_TIMES = [time(hour, minute) for hour in range(9, 18) for minute in (0, 30) if not 12 <= hour < 13]
+LANGUAGES = ["한국어", "일본어", "영어"]
+
+# 100건 목록 검사: 이전 대비 DB 적재 바이트 최소 감소 배수, 이미지 2배 크기에서 허용하는 적재 바이트 증가율
+PAGE_MIN_BYTES_REDUCTION = 10
+PAGE_MAX_BYTES_GROWTH = 1.1
+
+logger = logging.getLogger("loadtest")
+
+# === Stub Services ===
+
+def build_stub_app(latency_ms: float):
+    """hospital-service / doctor-service 스텁 (운영시간, 이름, 근무일정)"""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    operating_hours = [
+        {
+            "day_of_week": day,
+            "is_closed": day == 6,
+            "open_time": "09:00",
+            "close_time": "18:00",
+            "lunch_start": "12:00",
+            "lunch_end": "12:59",
+        }
+        for day in range(7)
+    ]
+
+    async def delay():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @app.get("/hospitals/{hospital_id}")
+    async def hospital(hospital_id: int):
+        await delay()
+        return {
+            "hospital_id": hospital_id,
+            "hospital_name": f"벤치마크병원_{hospital_id}",
+            "hospital_details": [{"operating_hours": json.dumps(operating_hours)}],
+        }
+
+    @app.get("/doctors/{doctor_id}")
+    async def doctor(doctor_id: int):
+        await delay()
+        return {"doctor_id": doctor_id, "doctor_name": f"벤치마크의사_{doctor_id}"}
+
+    @app.get("/doctors/{doctor_id}/schedules")
+    async def doctor_schedules(doctor_id: int):
+        await delay()
+        return [{"available_days": "월,화,수,목,금", "work_start_time": "09:00:00", "work_end_time": "18:00:00"}]
+
+    return app
+
+def start_stub_server(latency_ms: float) -> str:
+    """스텁 서버를 별도 스레드에서 실행하고 기본 URL 반환"""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(build_stub_app(latency_ms), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time_module.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+# === Seed Data ===
+
+def seed_reservations(SessionLocal, hospitals: int, reservations: int, days: int, seed: int):
+    """
+    예약 데이터 시드 (활성 예약 시간대 중복 없이 병원/날짜/시간 조합에서 무작위 추출)
+    이미 예약이 있는 DB는 시드하지 않고 그대로 사용한다 (같은 데이터로 반복 측정)
+    """
+    from sqlalchemy import func, insert
+    from models import Reservation
+
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(Reservation.reservation_id)).scalar()
+        if existing:
+            logger.info("🌱 기존 예약 %s건 사용 (시드 생략)", existing)
+            return existing
+
+        rng = random.Random(seed)
+        first_day = date.today() + timedelta(days=1)
+        capacity = hospitals * days * len(SLOT_TIMES)
+        needed = reservations
+        if needed > capacity:
+            raise ValueError(f"시드 가능한 시간대({capacity})보다 요청 예약 수가 많습니다.")
+
+        statuses = ["PENDING"] * 40 + ["CONFIRMED"] * 30 + ["COMPLETED"] * 15 + ["CANCELLED"] * 15
+        now = datetime.now(timezone.utc)
+        rows = []
+        for slot_index in rng.sample(range(capacity), needed):
+            hospital_index, rest = divmod(slot_index, days * len(SLOT_TIMES))
+            day_index, time_index = divmod(rest, len(SLOT_TIMES))
+            rows.append({
+                "user_id": rng.randint(1, 20000),
+                "hospital_id": hospital_index + 1,
+                "doctor_id": rng.choice([None, rng.randint(1, hospitals * 5)]),
+                "symptoms": "벤치마크 시드 예약 - 정기 검진 및 상담 요청",
+                "reservation_date": first_day + timedelta(days=day_index),
+                "reservation_time": SLOT_TIMES[time_index],
+                "contact_email": "loadtest@example.com",
+                "contact_phone": "010-0000-0000",
+                "interpreter_language": rng.choice(LANGUAGES),
+                "status": rng.choice(statuses),
+                "created_at": now - timedelta(seconds=rng.randint(0, 60 * 86400)),
+                "updated_at": now,
+            })
+
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(Reservation), rows[start:start + 5000])
+        db.commit()
+        logger.info("🌱 예약 %s건 시드 완료 (병원 %s개, %s일)", len(rows), hospitals, days)
+        return len(rows)
+    finally:
+        db.close()
+
+def seed_page_images(SessionLocal, page_size: int, images_per_reservation: int, image_kb: int, seed: int) -> int:
+    """
+    목록 첫 페이지(최신 예약 page_size건)에 blob 저장소 이전 전 형식(image_data에 Base64 본문)의 이미지 추가
+    이미지가 이미 있는 예약은 건너뛰므로 반복 실행해도 페이지 크기만큼만 시드된다
+    """
+    from sqlalchemy import desc, insert
+    from models import Reservation, ReservationImage
+
+    db = SessionLocal()
+    try:
+        reservation_ids = [
+            row.reservation_id for row in db.query(Reservation.reservation_id)
+            .order_by(desc(Reservation.created_at), desc(Reservation.reservation_id))
+            .limit(page_size).all()
+        ]
+        with_images = {
+            row.reservation_id for row in db.query(ReservationImage.reservation_id)
+            .filter(ReservationImage.reservation_id.in_(reservation_ids)).distinct()
+        }
+
+        rng = random.Random(seed)
+        payload = base64.b64encode(rng.randbytes(image_kb * 1024)).decode()
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "reservation_id": reservation_id,
+                "image_data": payload,
+                "image_type": "jpg",
+                "original_filename": f"loadtest_{reservation_id}_{order}.jpg",
+                "file_size": image_kb * 1024,
+                "image_order": order,
+                "created_at": now,
+            }
+            for reservation_id in reservation_ids if reservation_id not in with_images
+            for order in range(1, images_per_reservation + 1)
+        ]
+        if rows:
+            db.execute(insert(ReservationImage), rows)
+            db.commit()
+            logger.info("🌱 목록 첫 페이지 예약 %s건에 이미지 %s장 시드 (%sKB)", len(rows) // images_per_reservation, len(rows), image_kb)
+        return len(rows)
+    finally:
+        db.close()
+
+# === Legacy Listing ===
+
+def add_legacy_listing_route(app, get_database):
+    """
+    예약마다 len(reservation.images)로 이미지 행(Base64 본문 포함)을 지연 로딩하던 이전 목록 재현 (비교 기준)
+    image_data 지연 로딩(deferred) 도입 전과 같이 이미지 본문까지 읽는다
+    """
+    from fastapi import Depends, Query
+    from sqlalchemy import desc
+    from sqlalchemy.orm import Session, lazyload
+    import routes
+    from models import Reservation, ReservationImage
+    from schemas import PaginatedResponse
+
+    @app.get("/legacy/reservations", response_model=PaginatedResponse)
+    async def legacy_search_reservations(
+        limit: int = Query(20),
+        offset: int = Query(0),
+        db: Session = Depends(get_database)
+    ):
+        query = db.query(Reservation).options(
+            lazyload(Reservation.images).undefer(ReservationImage.image_data)
+        )
+        total = query.count()
+        reservations = query.order_by(desc(Reservation.created_at), desc(Reservation.reservation_id)).offset(offset).limit(limit).all()
+
+        hospital_ids = list(set([r.hospital_id for r in reservations if r.hospital_id]))
+        doctor_ids = list(set([r.doctor_id for r in reservations if r.doctor_id]))
+        hospital_names = await routes.get_multiple_hospital_names(hospital_ids) if hospital_ids else {}
+        doctor_names = await routes.get_multiple_doctor_names(doctor_ids) if doctor_ids else {}
+
+        items = []
+        for reservation in reservations:
+            items.append({
+                "reservation_id": reservation.reservation_id,
+                "hospital_id": reservation.hospital_id,
+                "hospital_name": hospital_names.get(reservation.hospital_id, f"병원_{reservation.hospital_id}"),
+                "doctor_id": reservation.doctor_id,
+                "doctor_name": doctor_names.get(reservation.doctor_id, f"의사_{reservation.doctor_id}") if reservation.doctor_id else None,
+                "user_id": reservation.user_id,
+                "symptoms": reservation.symptoms,
+                "reservation_date": reservation.reservation_date,
+                "reservation_time": reservation.reservation_time,
+                "status": reservation.status,
+                "contact_email": reservation.contact_email,
+                "contact_phone": reservation.contact_phone,
+                "interpreter_language": reservation.interpreter_language,
+                "created_at": reservation.created_at,
+                "image_count": len(reservation.images)
+            })
+        return PaginatedResponse(
+            items=items, total=total, limit=limit, offset=offset,
+            has_next=offset + limit < total, has_prev=offset > 0
+        )
+
+# === Query Counter ===
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수 집계"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+class LoadedBytesCounter:
+    """
+    DB에서 읽어 ORM 객체로 적재한 컬럼 값 크기 합계 (DB -> 앱 전송량 근사치)
+    지연 로딩(deferred) 컬럼은 적재되지 않으므로 포함되지 않는다
+    """
+
+    def __init__(self, base):
+        from sqlalchemy import event
+
+        self.bytes = 0
+        self._lock = threading.Lock()
+        event.listen(base, "load", self._on_load, propagate=True)
+
+    def _on_load(self, instance, _context):
+        size = 0
+        for key, value in instance.__dict__.items():
+            if key.startswith("_sa_") or value is None:
+                continue
+            if isinstance(value, str):
+                size += len(value.encode())
+            elif isinstance(value, bytes):
+                size += len(value)
+            elif isinstance(value, (int, float, bool)):
+                size += 8
+            elif isinstance(value, (datetime, date, time)):
+                size += len(value.isoformat())
+        with self._lock:
+            self.bytes += size
+
+# === Scenarios ===
+
+class Scenarios:
+    """엔드포인트별 요청 생성기"""
+
+    def __init__(self, hospitals: int, days: int, seed: int):
+        self.hospitals = hospitals
+        self.days = days
+        self.rng = random.Random(seed)
+
+    def _random_date(self) -> date:
+        return date.today() + timedelta(days=self.rng.randint(1, self.days))
+
+    def create(self):
+        return "POST", "/reservations", {
+            "user_id": self.rng.randint(1, 20000),
+            "hospital_id": self.rng.randint(1, self.hospitals),
+            "doctor_id": self.rng.choice([None, self.rng.randint(1, self.hospitals * 5)]),
+            "symptoms": "부하 테스트 예약 - 허리 통증으로 진료 상담을 원합니다",
+            "reservation_date": self._random_date().isoformat(),
+            "reservation_time": self.rng.choice(SLOT_TIMES).strftime("%H:%M"),
+            "contact_email": "loadtest@example.com",
+            "contact_phone": "010-1234-5678",
+            "interpreter_language": self.rng.choice(LANGUAGES),
+        }
+
+    def search(self):
+        params = {"limit": self.rng.choice([20, 20, 20, 100])}
+        choice = self.rng.random()
+        if choice < 0.5:
+            params["hospital_id"] = self.rng.randint(1, self.hospitals)
+        elif choice < 0.7:
+            params["user_id"] = self.rng.randint(1, 20000)
+        elif choice < 0.9:
+            start = self._random_date()
+            params["date_from"] = start.isoformat()
+            params["date_to"] = (start + timedelta(days=7)).isoformat()
+        return "GET", "/reservations?" + "&".join(f"{key}={value}" for key, value in params.items()), None
+
+    def available_times(self):
+        url = f"/available-times/{self.rng.randint(1, self.hospitals)}?date={self._random_date().isoformat()}"
+        if self.rng.random() < 0.3:
+            url += f"&doctor_id={self.rng.randint(1, self.hospitals * 5)}"
+        return "GET", url, None
+
+# === Load Driver ===
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+async def run_phase(
+    client,
+    make_request: Callable,
+    duration: float,
+    concurrency: int,
+    rps: Optional[float],
+    query_counter: Optional[QueryCounter]
+) -> dict:
+    """
+    한 엔드포인트에 duration초 동안 부하 발생
+    - rps 지정: 고정 간격으로 요청 시작 (open-loop, 지연은 예정 시작 시각부터 측정하여 대기 시간 포함)
+    - rps 미지정: concurrency개 워커가 쉬지 않고 요청 (closed-loop)
+    """
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    queries_before = query_counter.count if query_counter else 0
+
+    async def send(scheduled_at: float):
+        method, url, body = make_request()
+        async with semaphore:
+            try:
+                response = await client.request(method, url, json=body)
+                statuses[str(response.status_code)] += 1
+            except Exception as e:
+                statuses[f"error:{type(e).__name__}"] += 1
+        latencies.append(time_module.perf_counter() - scheduled_at)
+
+    started = time_module.perf_counter()
+    deadline = started + duration
+
+    if rps:
+        tasks = []
+        sent = 0
+        while True:
+            scheduled_at = started + sent / rps
+            if scheduled_at >= deadline:
+                break
+            await asyncio.sleep(max(0.0, scheduled_at - time_module.perf_counter()))
+            tasks.append(asyncio.create_task(send(scheduled_at)))
+            sent += 1
+        await asyncio.gather(*tasks)
+    else:
+        async def worker():
+            while time_module.perf_counter() < deadline:
+                await send(time_module.perf_counter())
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+    elapsed = time_module.perf_counter() - started
+    latencies.sort()
+    total = len(latencies)
+    queries = (query_counter.count - queries_before) if query_counter else None
+
+    return {
+        "requests": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": _ms(percentile(latencies, 0.50)),
+            "p95": _ms(percentile(latencies, 0.95)),
+            "p99": _ms(percentile(latencies, 0.99)),
+            "max": _ms(latencies[-1] if latencies else None),
+        },
+        "status_codes": dict(statuses),
+        "db_queries": queries,
+        "db_queries_per_request": round(queries / total, 2) if queries is not None and total else None,
+    }
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+# === Checks ===
+
+async def check_double_booking(client, hospitals: int, days: int, attempts: int = 20) -> dict:
+    """같은 시간대에 동시 예약 요청 시 하나만 성공하는지 확인"""
+    # 시드 범위 밖의 날짜 (스텁 병원은 일요일 휴무)
+    target_date = date.today() + timedelta(days=days + 1)
+    while target_date.weekday() == 6:
+        target_date += timedelta(days=1)
+
+    body = {
+        "hospital_id": random.randint(1, hospitals),
+        "symptoms": "동시 예약 충돌 확인용 요청입니다",
+        "reservation_date": target_date.isoformat(),
+        "reservation_time": "10:00",
+        "contact_email": "loadtest@example.com",
+        "contact_phone": "010-1234-5678",
+        "interpreter_language": "영어",
+    }
+
+    responses = await asyncio.gather(
+        *[client.post("/reservations", json={**body, "user_id": index + 1}) for index in range(attempts)],
+        return_exceptions=True
+    )
+    statuses = Counter(
+        str(response.status_code) if not isinstance(response, Exception) else type(response).__name__
+        for response in responses
+    )
+    return {"attempts": attempts, "status_codes": dict(statuses), "passed": statuses.get("201", 0) == 1}
+
+def check_index_double_booking(SessionLocal, hospitals: int, days: int, writers: int = 8) -> dict:
+    """
+    사전 SELECT 확인 없이 같은 시간대 예약을 여러 스레드가 각자의 연결에서 동시에 커밋
+    API 요청은 한 이벤트 루프에서 순서대로 DB를 호출하므로 사전 확인이 모든 중복을 걸러내어 인덱스를 검증하지 못한다
+    부분 유니크 인덱스만으로 한 건만 저장되고, 나머지 IntegrityError가 is_slot_conflict(409)로 분류되는지 확인
+    """
+    from sqlalchemy import func
+    from sqlalchemy.exc import IntegrityError
+    from models import Reservation
+    from routes import is_slot_conflict
+
+    target_date = date.today() + timedelta(days=days + 2)
+    slot = {
+        "hospital_id": random.randint(1, hospitals),
+        "reservation_date": target_date,
+        "reservation_time": time(11, 0),
+    }
+    barrier = threading.Barrier(writers)
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+
+    def write(user_id: int):
+        db = SessionLocal()
+        try:
+            db.add(Reservation(
+                user_id=user_id,
+                symptoms="인덱스 동시 삽입 확인용 예약입니다",
+                contact_email="loadtest@example.com",
+                contact_phone="010-1234-5678",
+                interpreter_language="영어",
+                status="PENDING",
+                **slot
+            ))
+            barrier.wait()
+            db.commit()
+            outcome = "created"
+        except IntegrityError as e:
+            db.rollback()
+            outcome = "conflict_409" if is_slot_conflict(e) else "integrity_error"
+        except Exception as e:
+            db.rollback()
+            outcome = f"error:{type(e).__name__}"
+        finally:
+            db.close()
+        with lock:
+            outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=write, args=(index + 1,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db = SessionLocal()
+    try:
+        rows = db.query(func.count(Reservation.reservation_id)).filter(
+            Reservation.hospital_id == slot["hospital_id"],
+            Reservation.reservation_date == slot["reservation_date"],
+            Reservation.reservation_time == slot["reservation_time"],
+            Reservation.status.in_(["PENDING", "CONFIRMED"])
+        ).scalar()
+    finally:
+        db.close()
+
+    return {
+        "writers": writers,
+        "outcomes": dict(outcomes),
+        "active_rows": rows,
+        "passed": rows == 1 and outcomes == Counter({"created": 1, "conflict_409": writers - 1}),
+    }
+
+async def measure_page(
+    client, path: str, requests: int, query_counter: QueryCounter, bytes_counter: LoadedBytesCounter
+) -> dict:
+    """같은 목록 요청을 순차 반복하여 지연 시간, 응답 크기, 요청당 쿼리 수와 DB 적재 바이트 측정"""
+    latencies = []
+    statuses: Counter = Counter()
+    response_bytes = 0
+    queries_before, bytes_before = query_counter.count, bytes_counter.bytes
+    for _ in range(requests):
+        started = time_module.perf_counter()
+        response = await client.get(path)
+        latencies.append(time_module.perf_counter() - started)
+        statuses[str(response.status_code)] += 1
+        response_bytes = max(response_bytes, len(response.content))
+    latencies.sort()
+    return {
+        "status_codes": dict(statuses),
+        "response_bytes": response_bytes,
+        "latency_ms": {"p50": _ms(percentile(latencies, 0.50)), "p95": _ms(percentile(latencies, 0.95))},
+        "db_queries_per_request": round((query_counter.count - queries_before) / requests, 1),
+        "db_loaded_bytes_per_request": (bytes_counter.bytes - bytes_before) // requests,
+    }
+
+def resize_page_images(SessionLocal, page_size: int, double: bool):
+    """목록 첫 페이지 이미지 본문을 두 배로 늘리거나(double) 원래 크기로 되돌림 (이미지 크기 의존성 검사용)"""
+    from sqlalchemy import desc, func
+    from models import Reservation, ReservationImage
+
+    db = SessionLocal()
+    try:
+        reservation_ids = [
+            row.reservation_id for row in db.query(Reservation.reservation_id)
+            .order_by(desc(Reservation.created_at), desc(Reservation.reservation_id))
+            .limit(page_size).all()
+        ]
+        data = ReservationImage.image_data
+        db.query(ReservationImage).filter(
+            ReservationImage.reservation_id.in_(reservation_ids), data.isnot(None)
+        ).update(
+            {data: data.concat(data) if double else func.substr(data, 1, func.length(data) / 2)},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+async def check_page_payload(
+    client, SessionLocal, query_counter: QueryCounter, bytes_counter: LoadedBytesCounter,
+    images_per_reservation: int, image_kb: int, seed: int, requests: int = 10, page_size: int = 100
+) -> dict:
+    """
+    이미지가 첨부된 100건 목록 페이지: 이미지 행 지연 로딩(이전) vs 집계 쿼리 + image_data deferred(현재)
+    현재 목록은 쿼리 수가 페이지 크기보다 작고, DB 적재 바이트가 이전보다 PAGE_MIN_BYTES_REDUCTION배 이상 작으며,
+    이미지 본문을 2배로 늘려도 적재 바이트가 늘지 않아야 한다 (이미지 본문을 읽지 않음)
+    """
+    seed_page_images(SessionLocal, page_size, images_per_reservation, image_kb, seed)
+    before = await measure_page(client, f"/legacy/reservations?limit={page_size}", requests, query_counter, bytes_counter)
+    after = await measure_page(client, f"/reservations?limit={page_size}", requests, query_counter, bytes_counter)
+    resize_page_images(SessionLocal, page_size, double=True)
+    try:
+        after_double = await measure_page(client, f"/reservations?limit={page_size}", requests, query_counter, bytes_counter)
+    finally:
+        resize_page_images(SessionLocal, page_size, double=False)
+
+    after_bytes = after["db_loaded_bytes_per_request"]
+    reduction = before["db_loaded_bytes_per_request"] / max(after_bytes, 1)
+    return {
+        "page_size": page_size,
+        "images_per_reservation": images_per_reservation,
+        "image_kb": image_kb,
+        "before": before,
+        "after": after,
+        "after_double_images": after_double,
+        "bytes_reduction": round(reduction, 1),
+        "passed": (
+            after["db_queries_per_request"] < page_size
+            and reduction >= PAGE_MIN_BYTES_REDUCTION
+            and after_double["db_loaded_bytes_per_request"] <= after_bytes * PAGE_MAX_BYTES_GROWTH
+        ),
+    }
+
+# === Results ===
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+def save_results(results: dict, results_dir: str) -> str:
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{results['started_at'].replace(':', '').replace('-', '')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+def print_report(results: dict, baseline: Optional[dict] = None):
+    print(f"\n📊 Reservation Service 부하 테스트 ({results['database']}, commit {results['git_commit']})")
+    header = f"{'endpoint':<18}{'req':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'q/req':>8}  status"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["endpoints"].items():
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<18}{stats['requests']:>8}{stats['throughput_rps'] or 0:>10.1f}"
+            f"{latency['p50'] or 0:>10.1f}{latency['p95'] or 0:>10.1f}{latency['p99'] or 0:>10.1f}"
+            f"{stats['db_queries_per_request'] if stats['db_queries_per_request'] is not None else '-':>8}  {stats['status_codes']}"
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous:
+            deltas = []
+            for key in ("p50", "p95", "p99"):
+                old, new = previous["latency_ms"].get(key), latency.get(key)
+                if old and new:
+                    deltas.append(f"{key} {100 * (new - old) / old:+.1f}%")
+            if previous.get("throughput_rps") and stats.get("throughput_rps"):
+                deltas.append(f"rps {100 * (stats['throughput_rps'] - previous['throughput_rps']) / previous['throughput_rps']:+.1f}%")
+            print(f"{'':<18}vs baseline: {', '.join(deltas)}")
+
+    for name, check in results["checks"].items():
+        mark = "❌" if check.get("passed") is False else "✔"
+        if name == "page_100":
+            before, after = check["before"], check["after"]
+            print(
+                f"{mark} {name}: 예약당 이미지 {check['images_per_reservation']}장 ({check['image_kb']}KB), "
+                f"DB 적재 {check['bytes_reduction']}배 감소"
+            )
+            for label, stats in (("before", before), ("after", after), ("after2x", check["after_double_images"])):
+                print(
+                    f"{'':<4}{label:<8}p50 {stats['latency_ms']['p50']:>8.1f}ms  p95 {stats['latency_ms']['p95']:>8.1f}ms  "
+                    f"q/req {stats['db_queries_per_request']:>6}  DB {stats['db_loaded_bytes_per_request']:>12,}B  "
+                    f"응답 {stats['response_bytes']:>8,}B"
+                )
+            continue
+        print(f"{mark} {name}: {check}")
+
+# === Main ===
+
+ENDPOINTS = ("create", "search", "available_times")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reservation Service 부하 테스트")
+    parser.add_argument("--database-url", default=os.getenv("LOADTEST_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="벤치마크 DB (기본값: SQLite 파일, 운영 DB를 지정하지 말 것)")
+    parser.add_argument("--hospitals", type=int, default=200, help="시드 병원 수")
+    parser.add_argument("--reservations", type=int, default=50000, help="시드 예약 수")
+    parser.add_argument("--days", type=int, default=90, help="예약 날짜 범위 (내일부터 N일)")
+    parser.add_argument("--duration", type=float, default=20.0, help="엔드포인트별 부하 시간 (초)")
+    parser.add_argument("--concurrency", type=int, default=32, help="최대 동시 요청 수")
+    parser.add_argument("--rps", type=float, default=150.0, help="목표 초당 요청 수 (0이면 closed-loop)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="측정할 엔드포인트 (쉼표 구분)")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20.0, help="스텁 hospital/doctor 서비스 응답 지연")
+    parser.add_argument("--page-images", type=int, default=2, help="목록 페이지 측정 시 예약당 첨부 이미지 수")
+    parser.add_argument("--page-image-kb", type=int, default=200, help="목록 페이지 측정용 이미지 크기 (KB)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR, help="결과 저장 디렉토리")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    return parser.parse_args(argv)
+
+async def run(args) -> dict:
+    # 앱 모듈은 DATABASE_URL을 import 시점에 읽으므로 환경 변수 설정 후 import
+    os.environ["DATABASE_URL"] = args.database_url
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database_url[len("sqlite:///"):])), exist_ok=True)
+
+    import httpx
+    from fastapi import FastAPI
+    from sqlalchemy import event
+    import routes
+    from database import engine, SessionLocal, create_tables, get_database
+    from models import Base
+
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(connection, _):
+            cursor = connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.close()
+
+    create_tables()
+    seeded = seed_reservations(SessionLocal, args.hospitals, args.reservations, args.days, args.seed)
+
+    stub_url = start_stub_server(args.upstream_latency_ms)
+    routes.HOSPITAL_SERVICE_URL = stub_url
+    routes.DOCTOR_SERVICE_URL = stub_url
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    add_legacy_listing_route(app, get_database)
+    query_counter = QueryCounter(engine)
+    bytes_counter = LoadedBytesCounter(Base)
+    scenarios = Scenarios(args.hospitals, args.days, args.seed)
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "database": engine.dialect.name,
+        "config": {
+            "hospitals": args.hospitals,
+            "reservations": seeded,
+            "days": args.days,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "rps": args.rps or None,
+            "upstream_latency_ms": args.upstream_latency_ms,
+        },
+        "endpoints": {},
+        "checks": {},
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60.0) as client:
+        for name in [name.strip() for name in args.endpoints.split(",") if name.strip()]:
+            if name not in ENDPOINTS:
+                raise ValueError(f"알 수 없는 엔드포인트: {name}")
+            logger.info("🚀 %s 부하 시작 (%s초, 동시 %s, 목표 %s rps)", name, args.duration, args.concurrency, args.rps or '-')
+            results["endpoints"][name] = await run_phase(
+                client, getattr(scenarios, name), args.duration, args.concurrency, args.rps or None, query_counter
+            )
+
+        results["checks"]["double_booking"] = await check_double_booking(client, args.hospitals, args.days)
+        results["checks"]["double_booking_index"] = await asyncio.to_thread(
+            check_index_double_booking, SessionLocal, args.hospitals, args.days
+        )
+        results["checks"]["page_100"] = await check_page_payload(
+            client, SessionLocal, query_counter, bytes_counter, args.page_images, args.page_image_kb, args.seed
+        )
+
+    return results
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+    args = parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = asyncio.run(run(args))
+    path = save_results(results, args.results_dir)
+    print_report(results, baseline)
+    print(f"\n💾 결과 저장: {path}")
+    passed = all(check.get("passed", True) for check in results["checks"].values())
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
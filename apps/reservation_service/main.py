@@ -9,14 +9,16 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from database import create_tables, test_connection
+from database import create_tables, test_connection, SessionLocal
+from events import create_dispatcher
+from holds import HoldSweeper
+from archive import ReservationArchiver
+from stats import ensure_daily_stats
 from routes import router
+from observability import configure_logging, ObservabilityMiddleware
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 로깅 설정 (요청 ID, 레벨별 샘플링, LOG_FORMAT=json|text)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
@@ -34,13 +36,37 @@ async def lifespan(app: FastAPI):
             create_tables()
             logger.info("✅ 데이터베이스 테이블 준비 완료")
         except Exception as e:
-            logger.error(f"❌ 테이블 생성 실패: {e}")
+            logger.error("❌ 테이블 생성 실패: %s", e)
+        
+        # 예약 일별 집계 초기화 (집계 테이블이 비어 있는 경우 최초 1회)
+        db = SessionLocal()
+        try:
+            ensure_daily_stats(db)
+        except Exception as e:
+            logger.error("❌ 예약 일별 집계 초기화 실패: %s", e)
+        finally:
+            db.close()
     else:
         logger.error("❌ 데이터베이스 연결 실패")
     
+    # 예약 이벤트 아웃박스 디스패처 시작
+    app.state.event_dispatcher = create_dispatcher(SessionLocal)
+    app.state.event_dispatcher.start()
+    
+    # 만료된 예약 홀드 정리 작업 시작
+    app.state.hold_sweeper = HoldSweeper(SessionLocal)
+    app.state.hold_sweeper.start()
+    
+    # 오래된 완료/취소 예약 보관 작업 시작
+    app.state.reservation_archiver = ReservationArchiver(SessionLocal)
+    app.state.reservation_archiver.start()
+    
     yield
     
     # 종료 시 실행
+    await app.state.reservation_archiver.stop()
+    await app.state.hold_sweeper.stop()
+    await app.state.event_dispatcher.stop()
     logger.info("🛑 Reservation Service 종료")
 
 # FastAPI 애플리케이션 생성
@@ -58,6 +84,7 @@ app = FastAPI(
     - **예약 조회**: 상세 정보 및 첨부 이미지
     - **예약 수정**: 상태 변경 및 정보 업데이트
     - **예약 취소**: 안전한 취소 처리
+    - **예약 보관**: 오래된 완료/취소 예약은 보관 테이블로 이동 (조회 시 함께 검색)
     
     ### 🔍 검색 및 필터링
     - **다중 조건 검색**: 병원, 사용자, 의사, 상태별
@@ -68,9 +95,14 @@ app = FastAPI(
     - **운영시간 조회**: Hospital Service 연동
     - **시간대 확인**: 30분 간격 예약 가능 시간
     - **중복 방지**: 기존 예약과의 충돌 검사
+    - **일괄 조회**: 다중 병원/기간 시간대 비트맵 조회
+    - **의사별 조회**: 의사 근무일정(DoctorSchedule) 반영
+    - **시간대 홀드**: 예약 정보 입력 중 시간대 임시 점유 (자동 만료)
     
     ### 🖼️ 이미지 관리
-    - **Base64 저장**: 안전한 이미지 저장
+    - **Blob 저장소**: 콘텐츠 해시 기반 중복 없는 저장 (로컬/S3 호환)
+    - **스트리밍 업로드**: multipart 업로드, 청크 단위 저장
+    - **스트리밍 다운로드**: Range 요청 지원
     - **메타데이터 추출**: 크기, 형식 자동 인식
     - **다중 첨부**: 최대 10장 이미지 지원
     
@@ -81,6 +113,15 @@ app = FastAPI(
     - ✅ 병원 운영시간 검증
     - ✅ 이미지 개수 및 형식 검증
     
+    ### 📊 통계
+    - **일별 집계**: 병원/상태/통역 언어별 예약 수 증분 유지
+    - **기간 통계**: 예약 수, 취소율, 통역 언어 분포
+    
+    ### 📣 이벤트
+    - **아웃박스**: 예약 변경과 같은 트랜잭션에 이벤트 기록
+    - **웹훅 전달**: RESERVATION_EVENT_WEBHOOK_URLS로 구독
+    - **증분 조회**: 마지막 event_id 이후 이벤트만 조회
+    
     ## 서비스 연동
     
     - 🏥 **Hospital Service**: 운영시간 조회
@@ -108,8 +149,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# 요청 ID 및 엔드포인트별 응답 시간 기록 (가장 바깥 미들웨어)
+app.add_middleware(ObservabilityMiddleware)
+
 # 라우터 등록
 app.include_router(router, tags=["Reservations"])
 
@@ -126,7 +171,13 @@ async def root():
             "docs": "/docs",
             "health": "/health",
             "reservations": "/reservations",
-            "available_times": "/available-times/{hospital_id}"
+            "available_times": "/available-times/{hospital_id}",
+            "doctor_available_times": "/available-times/{hospital_id}/doctors",
+            "availability": "/availability",
+            "holds": "/holds",
+            "metrics": "/metrics",
+            "events": "/events",
+            "stats": "/reservations/stats"
         }
     }
 
@@ -0,0 +1,87 @@
+"""
+migrate_images.py - Reservation Image Storage Migration
+기존 Base64 컬럼에 저장된 예약 이미지를 blob 저장소로 이전
+
+사용법:
+    python migrate_images.py [--batch-size 100] [--limit N] [--keep-base64]
+"""
+
+import argparse
+import base64
+import logging
+
+from sqlalchemy import and_
+from sqlalchemy.orm import undefer
+
+from blob_store import get_blob_store
+from database import SessionLocal, create_tables
+from models import ReservationImage
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def migrate_images(batch_size: int = 100, limit: int = None, keep_base64: bool = False) -> int:
+    """
+    storage_key가 없는 이미지를 배치 단위로 저장소에 옮기고 storage_key 기록
+    배치마다 커밋하므로 중간에 중단되어도 다시 실행하면 이어서 진행된다
+    """
+    store = get_blob_store()
+    migrated = 0
+    last_id = 0
+
+    while limit is None or migrated < limit:
+        db = SessionLocal()
+        try:
+            size = batch_size if limit is None else min(batch_size, limit - migrated)
+            # id 순서로 진행하여 실패한 행이 있어도 같은 행을 반복 조회하지 않음
+            images = db.query(ReservationImage).options(
+                undefer(ReservationImage.image_data)
+            ).filter(
+                and_(
+                    ReservationImage.id > last_id,
+                    ReservationImage.storage_key.is_(None),
+                    ReservationImage.image_data.isnot(None)
+                )
+            ).order_by(ReservationImage.id).limit(size).all()
+
+            if not images:
+                break
+
+            for image in images:
+                last_id = image.id
+                try:
+                    content = base64.b64decode(image.image_data)
+                except Exception as e:
+                    logger.error("❌ 이미지 %s Base64 디코딩 실패, 건너뜀: %s", image.id, e)
+                    continue
+
+                image.storage_key = store.put(content)
+                image.file_size = len(content)
+                if not keep_base64:
+                    image.image_data = None
+                migrated += 1
+
+            db.commit()
+            logger.info("📦 이미지 이전 진행: 누적 %s건 (마지막 ID %s)", migrated, last_id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    logger.info("✅ 이미지 이전 완료: %s건", migrated)
+    return migrated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="예약 이미지를 Base64 컬럼에서 blob 저장소로 이전")
+    parser.add_argument("--batch-size", type=int, default=100, help="배치 크기")
+    parser.add_argument("--limit", type=int, default=None, help="최대 이전 건수")
+    parser.add_argument("--keep-base64", action="store_true", help="이전 후에도 Base64 컬럼 유지")
+    args = parser.parse_args()
+
+    # storage_key 컬럼 추가 등 스키마 변경 먼저 적용
+    create_tables()
+    migrate_images(batch_size=args.batch_size, limit=args.limit, keep_base64=args.keep_base64)
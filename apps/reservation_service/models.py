@@ -3,18 +3,31 @@ models.py - Reservation Service Database Models
 예약 관리 시스템의 데이터베이스 모델 정의
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Date, Time, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, DateTime, Date, Time, ForeignKey, Index, JSON, UniqueConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from datetime import datetime, date, time
+from sqlalchemy.orm import relationship, deferred, declared_attr
+from datetime import datetime, date, time, timezone
 from enum import Enum
 import pytz
 
 Base = declarative_base()
 
-# 한국 시간대 설정
+# 한국 시간대 설정 (서비스 기준 시간대, 타임존 없는 입력값 해석에 사용)
 KST = pytz.timezone('Asia/Seoul')
 
+def utc_now() -> datetime:
+    """저장용 현재 시각 (UTC, timezone-aware)"""
+    return datetime.now(timezone.utc)
+
+def as_utc(value: datetime) -> datetime:
+    """
+    datetime을 UTC aware 값으로 정규화
+    타임존이 없는 값은 서비스 기준 시간대(KST)로 간주한다
+    """
+    if value.tzinfo is None:
+        value = KST.localize(value)
+    return value.astimezone(timezone.utc)
+
 class ReservationStatus(str, Enum):
     """예약 상태"""
     PENDING = "PENDING"      # 대기
@@ -28,9 +41,12 @@ class InterpreterLanguage(str, Enum):
     JAPANESE = "일본어"
     ENGLISH = "영어"
 
-class Reservation(Base):
-    """예약 메인 테이블"""
-    __tablename__ = "reservations"
+# 활성 예약(대기/확정)의 시간대 중복을 막는 부분 유니크 인덱스 이름
+ACTIVE_SLOT_INDEX_NAME = "uq_reservations_active_slot"
+ACTIVE_SLOT_CONDITION = "status IN ('PENDING', 'CONFIRMED')"
+
+class ReservationColumns:
+    """예약 컬럼 정의 (운영 테이블과 보관 테이블 공통)"""
 
     reservation_id = Column(Integer, primary_key=True, index=True, comment="예약 ID")
     
@@ -59,21 +75,47 @@ class Reservation(Base):
     status = Column(String(20), default=ReservationStatus.PENDING, comment="예약 상태")
     
     # 메타 정보
-    created_at = Column(DateTime, default=lambda: datetime.now(KST), comment="예약 생성일시")
-    updated_at = Column(DateTime, default=lambda: datetime.now(KST), onupdate=lambda: datetime.now(KST), comment="수정일시")
-    
+    created_at = Column(DateTime(timezone=True), default=utc_now, comment="예약 생성일시 (UTC)")
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, comment="수정일시 (UTC)")
+
+class Reservation(ReservationColumns, Base):
+    """예약 메인 테이블 (진행 중/최근 예약, 오래된 완료/취소 예약은 reservations_archive로 이동)"""
+    __tablename__ = "reservations"
+    __table_args__ = (
+        # 동시 요청에서도 같은 병원/날짜/시간의 활성 예약은 하나만 허용 (DB 레벨 보장)
+        Index(
+            ACTIVE_SLOT_INDEX_NAME,
+            "hospital_id", "reservation_date", "reservation_time",
+            unique=True,
+            postgresql_where=text(ACTIVE_SLOT_CONDITION),
+            sqlite_where=text(ACTIVE_SLOT_CONDITION)
+        ),
+        # 목록 조회 (필터 + created_at 역순 정렬, reservation_id는 키셋 커서 동률 처리용)
+        Index("ix_reservations_created", "created_at", "reservation_id"),
+        Index("ix_reservations_hospital_created", "hospital_id", "created_at", "reservation_id"),
+        Index("ix_reservations_user_created", "user_id", "created_at", "reservation_id"),
+        Index("ix_reservations_doctor_created", "doctor_id", "created_at", "reservation_id"),
+        # 병원 대시보드 (상태 + 예약 날짜 범위 필터)
+        Index("ix_reservations_hospital_status_date", "hospital_id", "status", "reservation_date"),
+    )
+
     # 관계 설정
     images = relationship("ReservationImage", back_populates="reservation", cascade="all, delete-orphan")
 
-class ReservationImage(Base):
-    """예약 첨부 이미지 (Base64 저장 방식)"""
-    __tablename__ = "reservation_images"
+class ReservationImageColumns:
+    """예약 이미지 컬럼 정의 (운영 테이블과 보관 테이블 공통, reservation_id는 테이블별 외래키)"""
 
     id = Column(Integer, primary_key=True, index=True, comment="이미지 ID")
-    reservation_id = Column(Integer, ForeignKey("reservations.reservation_id", ondelete="CASCADE"), nullable=False, comment="예약 ID")
     
-    # 이미지 정보 (Base64 저장 방식 - review-service와 동일)
-    image_data = Column(Text, nullable=False, comment="Base64 인코딩된 이미지 데이터")
+    # 이미지 본문 위치: blob 저장소 콘텐츠 해시 (SHA-256)
+    storage_key = Column(String(64), nullable=True, index=True, comment="blob 저장소 키 (SHA-256)")
+    
+    # 기존 Base64 저장 데이터 (blob 저장소 이전 전 데이터만 존재)
+    # 대용량 컬럼이므로 명시적으로 요청(undefer)할 때만 로딩
+    @declared_attr
+    def image_data(cls):
+        return deferred(Column(Text, nullable=True, comment="Base64 인코딩된 이미지 데이터 (레거시)"))
+    
     image_type = Column(String(10), nullable=False, comment="이미지 타입 (jpg, png, webp)")
     original_filename = Column(String(255), nullable=True, comment="원본 파일명")
     file_size = Column(Integer, nullable=False, comment="파일 크기 (bytes)")
@@ -83,7 +125,131 @@ class ReservationImage(Base):
     alt_text = Column(String(200), nullable=True, comment="이미지 설명")
     
     # 메타 정보
-    created_at = Column(DateTime, default=lambda: datetime.now(KST), comment="생성일시")
+    created_at = Column(DateTime(timezone=True), default=utc_now, comment="생성일시 (UTC)")
+    
+    @property
+    def content_url(self) -> str:
+        """이미지 다운로드 경로"""
+        return f"/reservations/{self.reservation_id}/images/{self.id}/content"
+
+class ReservationImage(ReservationImageColumns, Base):
+    """예약 첨부 이미지 (이미지 본문은 blob 저장소, 기존 데이터는 Base64 컬럼)"""
+    __tablename__ = "reservation_images"
+
+    reservation_id = Column(Integer, ForeignKey("reservations.reservation_id", ondelete="CASCADE"), nullable=False, index=True, comment="예약 ID")
+    
+    # 관계 설정
+    reservation = relationship("Reservation", back_populates="images")
+
+# 보관 대상 상태 (더 이상 변경되지 않는 예약)
+ARCHIVABLE_STATUSES = [ReservationStatus.COMPLETED, ReservationStatus.CANCELLED]
+
+class ArchivedReservation(ReservationColumns, Base):
+    """
+    보관 예약 테이블 (예약 날짜가 오래된 완료/취소 예약)
+    운영 테이블과 같은 reservation_id를 유지하며 조회 경로에서 운영 테이블과 함께 조회된다
+    """
+    __tablename__ = "reservations_archive"
+    __table_args__ = (
+        # 목록 조회 (운영 테이블과 같은 정렬 인덱스)
+        Index("ix_reservations_archive_created", "created_at", "reservation_id"),
+        Index("ix_reservations_archive_hospital_created", "hospital_id", "created_at", "reservation_id"),
+        Index("ix_reservations_archive_user_created", "user_id", "created_at", "reservation_id"),
+        Index("ix_reservations_archive_doctor_created", "doctor_id", "created_at", "reservation_id"),
+    )
+
+    archived_at = Column(DateTime(timezone=True), default=utc_now, comment="보관일시 (UTC)")
     
     # 관계 설정
-    reservation = relationship("Reservation", back_populates="images")
\ No newline at end of file
+    images = relationship("ArchivedReservationImage", back_populates="reservation", cascade="all, delete-orphan")
+
+class ArchivedReservationImage(ReservationImageColumns, Base):
+    """보관 예약의 첨부 이미지 (이미지 본문은 blob 저장소에 그대로 유지)"""
+    __tablename__ = "reservation_images_archive"
+
+    reservation_id = Column(Integer, ForeignKey("reservations_archive.reservation_id", ondelete="CASCADE"), nullable=False, index=True, comment="예약 ID")
+    
+    # 관계 설정
+    reservation = relationship("ArchivedReservation", back_populates="images")
+
+class ReservationEvent(Base):
+    """
+    예약 도메인 이벤트 아웃박스 (예약 변경과 같은 트랜잭션에 기록)
+    event_id는 INSERT 순서이고 커밋 순서와 다를 수 있으므로, 소비자 순서는 디스패처가 커밋된 이벤트에 부여하는 sequence를 따른다
+    """
+    __tablename__ = "reservation_events"
+    __table_args__ = (
+        # 이벤트 피드 증분 조회 (sequence 순서)
+        Index("uq_reservation_events_sequence", "sequence", unique=True),
+        # 디스패처가 순서 미부여 이벤트를 INSERT 순서대로 조회
+        Index(
+            "ix_reservation_events_unsequenced", "event_id",
+            postgresql_where=text("sequence IS NULL"),
+            sqlite_where=text("sequence IS NULL")
+        ),
+        # 디스패처가 미발행 이벤트만 순서대로 조회
+        Index(
+            "ix_reservation_events_unpublished_sequence", "sequence",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL")
+        ),
+    )
+
+    event_id = Column(Integer, primary_key=True, index=True, comment="이벤트 ID (INSERT 순서)")
+    sequence = Column(BigInteger, nullable=True, comment="피드/발행 순서 (커밋 후 디스패처가 부여, 커밋 순서와 일치)")
+    reservation_id = Column(Integer, nullable=False, index=True, comment="예약 ID")
+    hospital_id = Column(Integer, nullable=False, comment="병원 ID")
+    event_type = Column(String(50), nullable=False, comment="이벤트 타입 (reservation.created 등)")
+    payload = Column(JSON, nullable=False, comment="이벤트 데이터")
+    
+    # 발행 정보
+    claimed_until = Column(DateTime(timezone=True), nullable=True, comment="디스패처 전달 점유 만료일시 (UTC)")
+    attempts = Column(Integer, default=0, nullable=False, comment="전달 시도 횟수")
+    last_error = Column(Text, nullable=True, comment="마지막 전달 오류")
+    published_at = Column(DateTime(timezone=True), nullable=True, comment="발행 완료일시 (UTC)")
+    
+    # 메타 정보
+    created_at = Column(DateTime(timezone=True), default=utc_now, comment="발생일시 (UTC)")
+
+class ReservationDailyStat(Base):
+    """병원/날짜/상태/통역 언어별 예약 수 일별 집계 (예약 변경 시 증분 유지)"""
+    __tablename__ = "reservation_daily_stats"
+    __table_args__ = (
+        # 병원 + 날짜 범위 조회와 upsert 충돌 대상
+        UniqueConstraint(
+            "hospital_id", "stat_date", "status", "interpreter_language",
+            name="uq_reservation_daily_stats_key"
+        ),
+        # 전체 병원 날짜 범위 조회
+        Index("ix_reservation_daily_stats_date", "stat_date"),
+    )
+
+    id = Column(Integer, primary_key=True, comment="집계 ID")
+    hospital_id = Column(Integer, nullable=False, comment="병원 ID")
+    stat_date = Column(Date, nullable=False, comment="예약 날짜")
+    status = Column(String(20), nullable=False, comment="예약 상태")
+    interpreter_language = Column(String(20), nullable=False, comment="통역 언어")
+    reservation_count = Column(Integer, nullable=False, default=0, comment="예약 수")
+
+class ReservationHold(Base):
+    """
+    예약 시간대 임시 점유 (예약 정보 입력 중 다른 사용자의 예약 방지)
+    만료된 행은 조회에서 제외되며 스위퍼가 만료 시각 인덱스 범위로 정리한다
+    """
+    __tablename__ = "reservation_holds"
+    __table_args__ = (
+        # 시간대당 홀드는 하나만 허용 (만료된 홀드는 새 홀드 생성 시 교체)
+        UniqueConstraint("hospital_id", "reservation_date", "reservation_time", name="uq_reservation_holds_slot"),
+        # 스위퍼가 만료된 홀드만 범위 조회
+        Index("ix_reservation_holds_expires", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, comment="홀드 ID")
+    hold_token = Column(String(32), nullable=False, unique=True, comment="홀드 토큰 (예약 생성 시 전달)")
+    user_id = Column(Integer, nullable=False, comment="사용자 ID")
+    hospital_id = Column(Integer, nullable=False, comment="병원 ID")
+    doctor_id = Column(Integer, nullable=True, comment="의사 ID")
+    reservation_date = Column(Date, nullable=False, comment="예약 날짜")
+    reservation_time = Column(Time, nullable=False, comment="예약 시간")
+    expires_at = Column(DateTime(timezone=True), nullable=False, comment="만료일시 (UTC)")
+    created_at = Column(DateTime(timezone=True), default=utc_now, comment="생성일시 (UTC)")
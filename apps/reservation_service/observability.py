@@ -0,0 +1,210 @@
+"""
+observability.py - Reservation Service Logging & Metrics
+요청 상관 ID, 레벨별 샘플링 구조화 로깅, 엔드포인트별 응답 시간 히스토그램
+"""
+
+import bisect
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# 환경 변수 설정
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+# 레벨별 샘플링 비율 (0.0 ~ 1.0), WARNING 이상은 기본적으로 모두 기록
+LOG_SAMPLE_RATES = {
+    logging.DEBUG: float(os.getenv("LOG_SAMPLE_RATE_DEBUG", "0.01")),
+    logging.INFO: float(os.getenv("LOG_SAMPLE_RATE_INFO", "1.0")),
+    logging.WARNING: float(os.getenv("LOG_SAMPLE_RATE_WARNING", "1.0")),
+}
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# 현재 요청의 상관 ID (요청 밖에서는 "-")
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# === Logging ===
+
+class RequestContextFilter(logging.Filter):
+    """로그 레코드에 현재 요청 ID 추가"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    레벨별 비율로 로그 샘플링
+    - 메시지 포맷팅 전에 버리므로 샘플링된 로그는 문자열 생성 비용이 없다 (lazy %-format 사용 시)
+    - 요청 ID 기준으로 결정하여 같은 요청의 로그는 함께 남거나 함께 버려진다
+    """
+
+    def __init__(self, rates: Dict[int, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate(self, levelno: int) -> float:
+        rate = 1.0
+        for level, level_rate in self.rates.items():
+            if levelno >= level:
+                rate = level_rate
+        return rate if levelno < logging.ERROR else 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self._rate(record.levelno)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id != "-":
+            return (zlib.crc32(request_id.encode()) % 10000) < rate * 10000
+        return random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 포맷"""
+
+    # 표준 LogRecord 속성 (extra 필드 구분용)
+    RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging():
+    """루트 로거를 요청 ID/샘플링 필터가 적용된 단일 핸들러로 구성"""
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+        ))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+    # 외부 서비스 호출마다 남는 httpx 요청 로그 억제
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# === Metrics ===
+
+# 응답 시간 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class LatencyHistogram:
+    """엔드포인트(메서드, 경로 템플릿, 상태 코드 계열)별 누적 응답 시간 히스토그램"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # key -> [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float):
+        key = (method, route, f"{status_code // 100}xx")
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += seconds
+
+    def snapshot(self) -> Dict[tuple, Tuple[List[int], float]]:
+        with self._lock:
+            return {key: (list(counts), self._sums[key]) for key, counts in self._counts.items()}
+
+    def render_prometheus(self, name: str = "reservation_http_request_duration_seconds") -> str:
+        """Prometheus 텍스트 형식으로 출력 (누적 버킷)"""
+        lines = [
+            f"# HELP {name} HTTP request latency by endpoint",
+            f"# TYPE {name} histogram",
+        ]
+        for (method, route, status), (counts, total) in sorted(self.snapshot().items()):
+            labels = f'method="{method}",route="{route}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+latency_histogram = LatencyHistogram()
+
+class ObservabilityMiddleware:
+    """
+    요청 ID 설정(X-Request-ID 전달 또는 생성) 및 응답 헤더 추가, 엔드포인트별 응답 시간 기록
+    경로는 매칭된 라우트 템플릿(/reservations/{reservation_id})으로 집계하여 라벨 수를 제한한다
+    """
+
+    def __init__(self, app, histogram: LatencyHistogram = latency_histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, REQUEST_ID_HEADER.lower().encode()) or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode(), request_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            route = scope.get("route")
+            self.histogram.observe(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status_code,
+                time.perf_counter() - started
+            )
+            request_id_var.reset(token)
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")[:64]
+    return None
@@ -0,0 +1,59 @@
+"""
+pagination.py - Reservation Service Pagination Helpers
+키셋(커서) 페이지네이션 및 목록 총 개수 캐시
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Tuple
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """마지막 행의 (created_at, id)를 URL-safe 커서 문자열로 인코딩"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 문자열을 (created_at, id)로 디코딩, 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {e}")
+
+class CountCache:
+    """
+    필터 조합별 총 개수 TTL 캐시
+    깊은 페이지를 넘길 때마다 COUNT(*)를 반복 실행하지 않도록 근사값(최대 ttl초 지연)을 제공
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        value = compute()
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # 만료된 항목 정리 후에도 가득 차 있으면 전체 초기화
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -3,30 +3,99 @@ routes.py - Reservation Service API Routes
 예약 관리 시스템의 API 엔드포인트 정의
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func, text
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Header, File, Form, UploadFile
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, desc, func, literal, text, tuple_, union_all
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
 import logging
 import json
 import base64
 import io
 import requests
+import httpx
 import asyncio
 from datetime import datetime, date, time, timedelta
-from PIL import Image
+import os
+from PIL import Image, ImageFile
 
 from database import get_database
-from models import Reservation, ReservationImage
+from models import (
+    Reservation, ReservationImage, ReservationEvent, ReservationDailyStat, ReservationHold, ACTIVE_SLOT_INDEX_NAME,
+    ArchivedReservation, ArchivedReservationImage, utc_now, as_utc
+)
 from schemas import (
-    ReservationCreate, ReservationUpdate, ReservationResponse, ReservationListResponse,
+    ReservationCreate, ReservationImageCreate, ReservationUpdate, ReservationResponse, ReservationListResponse,
     PaginatedResponse, ApiResponse, ReservationSearchParams, AvailableTimesResponse,
-    TimeSlotResponse, ReservationStatus, InterpreterLanguage
+    TimeSlotResponse, ReservationStatus, InterpreterLanguage,
+    AvailabilityResponse, HospitalAvailabilityResponse, DayAvailabilityResponse,
+    DoctorsAvailabilityResponse, DoctorAvailabilityResponse,
+    BulkReservationCreate, BulkStatusUpdate, BulkItemResult, BulkOperationResponse,
+    ReservationEventListResponse,
+    ReservationStatsResponse, DailyReservationStats,
+    ReservationHoldCreate, ReservationHoldResponse
+)
+from stats import track_stat_change
+from events import (
+    record_reservation_event, serialize_reservation,
+    RESERVATION_CREATED, RESERVATION_UPDATED, RESERVATION_STATUS_CHANGED
+)
+from blob_store import get_blob_store, content_key, BlobNotFoundError, BlobWriter
+from pagination import encode_cursor, decode_cursor, CountCache
+from availability import (
+    SLOT_INTERVAL_MINUTES, ACTIVE_STATUSES, find_day_schedule, build_time_slots, check_operating_hours,
+    encode_slot_bitmap, daterange, group_reserved_times,
+    check_doctor_schedule, apply_doctor_schedule, compute_doctor_slot_matrix, encode_mask_bitmap
+)
+from cache import AsyncTTLCache
+from observability import latency_histogram
+from holds import (
+    HOLD_DEFAULT_MINUTES, HOLD_MAX_MINUTES, create_hold, release_hold, release_slot_hold, find_slot_hold, find_hold_by_token,
+    hold_blocks_slot, hold_now, get_held_times, get_held_slots
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# 예약 목록 총 개수 캐시 (total_mode=cached)
+reservation_count_cache = CountCache(ttl_seconds=30.0)
+
+# 이미지 타입별 Content-Type
+IMAGE_MEDIA_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
+
+# 허용되는 예약 상태 전이
+ALLOWED_STATUS_TRANSITIONS = {
+    ReservationStatus.PENDING: {ReservationStatus.CONFIRMED, ReservationStatus.CANCELLED},
+    ReservationStatus.CONFIRMED: {ReservationStatus.COMPLETED, ReservationStatus.CANCELLED},
+    ReservationStatus.COMPLETED: set(),
+    ReservationStatus.CANCELLED: set(),
+}
+
+# 이미지 업로드 제한
+MAX_IMAGES_PER_RESERVATION = 10
+MAX_IMAGE_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# 통계 조회 최대 기간
+MAX_STATS_DAYS = 366
+
+# 다중 조회 제한
+MAX_AVAILABILITY_HOSPITALS = 20
+MAX_AVAILABILITY_DAYS = 31
+MAX_AVAILABILITY_DOCTORS = 50
+
+# 병원 운영시간 / 의사 근무일정 로컬 캐시 (초)
+SCHEDULE_CACHE_TTL = float(os.getenv("SCHEDULE_CACHE_TTL", "300"))
+operating_hours_cache = AsyncTTLCache(ttl_seconds=SCHEDULE_CACHE_TTL)
+doctor_schedule_cache = AsyncTTLCache(ttl_seconds=SCHEDULE_CACHE_TTL)
+
 # Service URLs 설정 (프로덕션 환경)
 HOSPITAL_SERVICE_URL = "https://wellness-meditrip-backend.eastus2.cloudapp.azure.com:8015"
 DOCTOR_SERVICE_URL = "https://wellness-meditrip-backend.eastus2.cloudapp.azure.com:8011"
@@ -38,11 +107,12 @@ async def create_reservation(
     reservation_data: ReservationCreate,
     db: Session = Depends(get_database)
 ):
-    print(f"🚀 RESERVATION CREATE CALLED: {reservation_data.hospital_id}")
-    logger.error(f"🚀 RESERVATION CREATE CALLED: {reservation_data.hospital_id}")
     """새 예약 생성"""
     try:
-        logger.info(f"🎯 예약 생성 요청: 병원 {reservation_data.hospital_id}, 날짜 {reservation_data.reservation_date}, 시간 {reservation_data.reservation_time}")
+        logger.debug(
+            "🎯 예약 생성 요청: 병원 %s, 날짜 %s, 시간 %s",
+            reservation_data.hospital_id, reservation_data.reservation_date, reservation_data.reservation_time
+        )
         
         # 병원 운영시간 검증
         is_valid = await validate_hospital_operating_hours(
@@ -51,14 +121,27 @@ async def create_reservation(
             reservation_data.reservation_time
         )
         
-        logger.info(f"🔍 운영시간 검증 결과: {is_valid}")
-        
         if not is_valid:
             raise HTTPException(
                 status_code=400,
                 detail="선택한 날짜와 시간이 병원 운영시간에 포함되지 않습니다."
             )
         
+        # 의사 근무시간 검증
+        if reservation_data.doctor_id:
+            await validate_doctor_schedule(
+                reservation_data.doctor_id,
+                reservation_data.reservation_date,
+                reservation_data.reservation_time
+            )
+        
+        # 다른 사용자의 시간대 홀드 확인 (본인 홀드 토큰이면 통과)
+        slot_hold = find_slot_hold(
+            db, reservation_data.hospital_id, reservation_data.reservation_date, reservation_data.reservation_time
+        )
+        if hold_blocks_slot(slot_hold, reservation_data.hold_token):
+            raise HTTPException(status_code=409, detail="다른 사용자가 예약 진행 중인 시간입니다.")
+        
         # 중복 예약 확인
         existing_reservation = db.query(Reservation).filter(
             and_(
@@ -76,48 +159,32 @@ async def create_reservation(
             )
         
         # 새 예약 생성
-        new_reservation = Reservation(
-            user_id=reservation_data.user_id,
-            hospital_id=reservation_data.hospital_id,
-            doctor_id=reservation_data.doctor_id,
-            symptoms=reservation_data.symptoms,
-            current_medications=reservation_data.current_medications,
-            reservation_date=reservation_data.reservation_date,
-            reservation_time=reservation_data.reservation_time,
-            contact_email=reservation_data.contact_email,
-            contact_phone=reservation_data.contact_phone,
-            interpreter_language=reservation_data.interpreter_language,
-            additional_notes=reservation_data.additional_notes,
-            status=ReservationStatus.PENDING
-        )
+        new_reservation = build_reservation(reservation_data)
         
         db.add(new_reservation)
-        db.flush()  # reservation_id 생성을 위해 flush
+        try:
+            db.flush()  # reservation_id 생성을 위해 flush (동시 예약 시 유니크 인덱스 위반 발생)
+        except IntegrityError as e:
+            db.rollback()
+            if is_slot_conflict(e):
+                raise HTTPException(status_code=409, detail="해당 시간에 이미 예약이 존재합니다.")
+            raise
         
-        # 이미지 추가 (Base64 처리)
+        # 이미지 추가 (blob 저장소에 저장)
         for image_data in reservation_data.images:
-            # Base64 이미지 처리
-            processed_image = process_base64_image(
-                image_data.image_data,
-                image_data.image_type
-            )
-            
-            image = ReservationImage(
-                reservation_id=new_reservation.reservation_id,
-                image_data=processed_image["processed_data"],
-                image_type=processed_image["image_type"],
-                original_filename=image_data.original_filename,
-                file_size=processed_image["file_size"],
-                width=processed_image["width"],
-                height=processed_image["height"],
-                image_order=image_data.image_order,
-                alt_text=image_data.alt_text
+            db.add(build_reservation_image(new_reservation.reservation_id, image_data))
+        
+        # 홀드를 예약으로 전환 (같은 트랜잭션에서 예약한 시간대의 홀드만 해제)
+        if reservation_data.hold_token:
+            release_slot_hold(
+                db, reservation_data.hold_token, reservation_data.hospital_id,
+                reservation_data.reservation_date, reservation_data.reservation_time
             )
-            db.add(image)
         
+        track_reservation_change(db, RESERVATION_CREATED, new_reservation)
         db.commit()
         
-        logger.info(f"✅ 새 예약 생성 완료: {new_reservation.reservation_id}")
+        logger.info("✅ 새 예약 생성 완료: %s", new_reservation.reservation_id)
         
         return ApiResponse(
             success=True,
@@ -129,26 +196,248 @@ async def create_reservation(
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ 예약 생성 실패: {e}")
-        import traceback
-        logger.error(f"상세 오류: {traceback.format_exc()}")
+        logger.exception("❌ 예약 생성 실패: %s", e)
         raise HTTPException(status_code=500, detail="예약 생성 중 오류가 발생했습니다.")
 
+@router.get("/reservations/stats", response_model=ReservationStatsResponse)
+async def get_reservation_stats(
+    date_from: date = Query(..., description="시작 날짜 (예약 날짜 기준)"),
+    date_to: date = Query(..., description="종료 날짜 (예약 날짜 기준)"),
+    hospital_id: Optional[int] = Query(None, description="병원 ID (없으면 전체 병원)"),
+    db: Session = Depends(get_database)
+):
+    """
+    기간별 예약 통계 (병원별 일별 예약 수, 상태별/통역 언어별 분포, 취소율)
+    - 예약 변경 시 증분 유지되는 일별 집계 테이블에서 인덱스 범위 조회 한 번으로 계산
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="종료 날짜는 시작 날짜 이후여야 합니다.")
+    if (date_to - date_from).days + 1 > MAX_STATS_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {MAX_STATS_DAYS}일입니다.")
+    
+    try:
+        query = db.query(
+            ReservationDailyStat.stat_date,
+            ReservationDailyStat.hospital_id,
+            ReservationDailyStat.status,
+            ReservationDailyStat.interpreter_language,
+            ReservationDailyStat.reservation_count
+        ).filter(
+            and_(
+                ReservationDailyStat.stat_date >= date_from,
+                ReservationDailyStat.stat_date <= date_to,
+                ReservationDailyStat.reservation_count != 0
+            )
+        )
+        if hospital_id:
+            query = query.filter(ReservationDailyStat.hospital_id == hospital_id)
+        
+        by_status = {status.value: 0 for status in ReservationStatus}
+        by_language = {}
+        daily = {}
+        total = 0
+        
+        for stat_date, row_hospital_id, status, language, count in query.all():
+            total += count
+            by_status[status] = by_status.get(status, 0) + count
+            by_language[language] = by_language.get(language, 0) + count
+            
+            day = daily.setdefault((stat_date, row_hospital_id), {"total": 0, "by_status": {}})
+            day["total"] += count
+            day["by_status"][status] = day["by_status"].get(status, 0) + count
+        
+        return ReservationStatsResponse(
+            date_from=date_from,
+            date_to=date_to,
+            hospital_id=hospital_id,
+            total=total,
+            by_status=by_status,
+            by_interpreter_language=by_language,
+            cancellation_rate=round(by_status.get(ReservationStatus.CANCELLED.value, 0) / total, 4) if total else 0.0,
+            daily=[
+                DailyReservationStats(date=stat_date, hospital_id=row_hospital_id, **values)
+                for (stat_date, row_hospital_id), values in sorted(daily.items())
+            ]
+        )
+        
+    except Exception as e:
+        logger.error("❌ 예약 통계 조회 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 통계 조회 중 오류가 발생했습니다.")
+
 @router.get("/reservations/{reservation_id}", response_model=ReservationResponse)
 async def get_reservation(
     reservation_id: int = Path(..., description="예약 ID"),
     db: Session = Depends(get_database)
 ):
     """예약 상세 조회"""
-    reservation = db.query(Reservation).filter(
+    # 이미지는 이미지 데이터까지 한 번의 추가 쿼리로 로딩
+    reservation = db.query(Reservation).options(
+        selectinload(Reservation.images).undefer(ReservationImage.image_data)
+    ).filter(
         Reservation.reservation_id == reservation_id
     ).first()
     
+    if not reservation:
+        # 운영 테이블에 없으면 보관된 예약 조회
+        reservation = db.query(ArchivedReservation).options(
+            selectinload(ArchivedReservation.images).undefer(ArchivedReservationImage.image_data)
+        ).filter(
+            ArchivedReservation.reservation_id == reservation_id
+        ).first()
+    
     if not reservation:
         raise HTTPException(status_code=404, detail="예약을 찾을 수 없습니다.")
     
     return reservation
 
+@router.post("/reservations/{reservation_id}/images", response_model=ApiResponse, status_code=201)
+async def upload_reservation_images(
+    reservation_id: int = Path(..., description="예약 ID"),
+    files: List[UploadFile] = File(..., description="첨부 이미지 파일 (multipart/form-data)"),
+    alt_text: Optional[str] = Form(None, max_length=200, description="이미지 설명 (모든 파일에 공통 적용)"),
+    db: Session = Depends(get_database)
+):
+    """
+    예약 이미지 업로드 (multipart 스트리밍)
+    - 파일을 청크 단위로 저장소에 쓰면서 해시와 크기를 계산하므로 요청 메모리 사용량은 이미지 크기와 무관
+    - 이미지 크기(너비/높이)는 헤더만 파싱해서 확인
+    """
+    reservation = db.query(Reservation.reservation_id).filter(
+        Reservation.reservation_id == reservation_id
+    ).first()
+    if not reservation:
+        raise HTTPException(status_code=404, detail="예약을 찾을 수 없습니다.")
+    
+    existing_count, max_order = db.query(
+        func.count(ReservationImage.id), func.max(ReservationImage.image_order)
+    ).filter(ReservationImage.reservation_id == reservation_id).one()
+    
+    if existing_count + len(files) > MAX_IMAGES_PER_RESERVATION:
+        raise HTTPException(status_code=400, detail=f"최대 {MAX_IMAGES_PER_RESERVATION}장까지만 업로드 가능합니다.")
+    
+    stored_images = []
+    try:
+        for index, upload in enumerate(files, start=1):
+            stored = await stream_upload_to_store(upload)
+            image = ReservationImage(
+                reservation_id=reservation_id,
+                storage_key=stored["storage_key"],
+                image_type=stored["image_type"],
+                original_filename=(upload.filename or "")[:255] or None,
+                file_size=stored["file_size"],
+                width=stored["width"],
+                height=stored["height"],
+                image_order=(max_order or 0) + index,
+                alt_text=alt_text
+            )
+            db.add(image)
+            stored_images.append(image)
+        
+        db.commit()
+        
+        logger.info("✅ 예약 %s 이미지 %s장 업로드 완료", reservation_id, len(stored_images))
+        
+        return ApiResponse(
+            success=True,
+            message="이미지가 성공적으로 업로드되었습니다.",
+            data={
+                "images": [
+                    {
+                        "id": image.id,
+                        "content_url": image.content_url,
+                        "file_size": image.file_size,
+                        "width": image.width,
+                        "height": image.height,
+                        "image_type": image.image_type
+                    }
+                    for image in stored_images
+                ]
+            }
+        )
+        
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ 예약 %s 이미지 업로드 실패: %s", reservation_id, e)
+        raise HTTPException(status_code=500, detail="이미지 업로드 중 오류가 발생했습니다.")
+    finally:
+        for upload in files:
+            await upload.close()
+
+@router.get("/reservations/{reservation_id}/images/{image_id}/content")
+async def download_reservation_image(
+    reservation_id: int = Path(..., description="예약 ID"),
+    image_id: int = Path(..., description="이미지 ID"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_database)
+):
+    """예약 첨부 이미지 다운로드 (스트리밍, Range 요청 지원)"""
+    image = db.query(ReservationImage).filter(
+        and_(
+            ReservationImage.id == image_id,
+            ReservationImage.reservation_id == reservation_id
+        )
+    ).first()
+    
+    if not image:
+        image = db.query(ArchivedReservationImage).filter(
+            and_(
+                ArchivedReservationImage.id == image_id,
+                ArchivedReservationImage.reservation_id == reservation_id
+            )
+        ).first()
+    
+    if not image:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+    
+    if image.storage_key:
+        store = get_blob_store()
+        storage_key = image.storage_key
+        try:
+            total_size = store.size(storage_key)
+        except BlobNotFoundError:
+            logger.error("❌ 저장소에 이미지 없음: image_id=%s, key=%s", image_id, storage_key)
+            raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+        etag = f'"{storage_key}"'
+        read_range = lambda start, end: store.iter_range(storage_key, start, end)
+    else:
+        # blob 저장소 이전 전 Base64 데이터
+        if not image.image_data:
+            raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+        content = base64.b64decode(image.image_data)
+        total_size = len(content)
+        etag = f'"legacy-{image.id}"'
+        read_range = lambda start, end: iter([content[start:end + 1]])
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Cache-Control": "private, max-age=86400"
+    }
+    
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        byte_range = parse_byte_range(range_header, total_size)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{total_size}"
+        raise HTTPException(status_code=416, detail="요청한 범위가 올바르지 않습니다.", headers=headers)
+    
+    media_type = IMAGE_MEDIA_TYPES.get((image.image_type or "").lower(), "application/octet-stream")
+    
+    if byte_range is None:
+        headers["Content-Length"] = str(total_size)
+        return StreamingResponse(read_range(0, total_size - 1), media_type=media_type, headers=headers)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{total_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(read_range(start, end), status_code=206, media_type=media_type, headers=headers)
+
 @router.put("/reservations/{reservation_id}", response_model=ApiResponse)
 async def update_reservation(
     reservation_id: int = Path(..., description="예약 ID"),
@@ -162,6 +451,8 @@ async def update_reservation(
         ).first()
         
         if not reservation:
+            if is_archived_reservation(db, reservation_id):
+                raise HTTPException(status_code=409, detail="보관된 예약은 수정할 수 없습니다.")
             raise HTTPException(status_code=404, detail="예약을 찾을 수 없습니다.")
         
         # 예약 날짜/시간이 변경되는 경우 운영시간 검증
@@ -179,15 +470,54 @@ async def update_reservation(
                     detail="선택한 날짜와 시간이 병원 운영시간에 포함되지 않습니다."
                 )
         
+        # 예약 날짜/시간이 변경되는 경우 담당 의사 근무시간 검증 (담당 의사는 수정 항목이 아님)
+        if reservation_data.reservation_date or reservation_data.reservation_time:
+            if reservation.doctor_id:
+                await validate_doctor_schedule(
+                    reservation.doctor_id,
+                    reservation_data.reservation_date or reservation.reservation_date,
+                    reservation_data.reservation_time or reservation.reservation_time
+                )
+        
+        # 변경할 시간대를 다른 사용자가 홀드 중인지 확인 (본인 홀드 토큰이면 통과)
+        slot_changed = bool(reservation_data.reservation_date or reservation_data.reservation_time)
+        if slot_changed:
+            slot_hold = find_slot_hold(
+                db,
+                reservation.hospital_id,
+                reservation_data.reservation_date or reservation.reservation_date,
+                reservation_data.reservation_time or reservation.reservation_time
+            )
+            if hold_blocks_slot(slot_hold, reservation_data.hold_token):
+                raise HTTPException(status_code=409, detail="다른 사용자가 예약 진행 중인 시간입니다.")
+        
         # 수정할 필드들 업데이트
-        update_data = reservation_data.dict(exclude_unset=True)
+        previous = serialize_reservation(reservation)
+        update_data = reservation_data.dict(exclude_unset=True, exclude={"hold_token"})
         for field, value in update_data.items():
             setattr(reservation, field, value)
         
-        reservation.updated_at = datetime.now()
-        db.commit()
+        # 변경한 시간대의 본인 홀드를 같은 트랜잭션에서 해제
+        if slot_changed and reservation_data.hold_token:
+            release_slot_hold(
+                db, reservation_data.hold_token, reservation.hospital_id,
+                reservation.reservation_date, reservation.reservation_time
+            )
         
-        logger.info(f"✅ 예약 수정 완료: {reservation_id}")
+        reservation.updated_at = utc_now()
+        status_changed = previous["status"] != serialize_reservation(reservation)["status"]
+        track_reservation_change(
+            db, RESERVATION_STATUS_CHANGED if status_changed else RESERVATION_UPDATED, reservation, previous
+        )
+        try:
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if is_slot_conflict(e):
+                raise HTTPException(status_code=409, detail="해당 시간에 이미 예약이 존재합니다.")
+            raise
+        
+        logger.info("✅ 예약 수정 완료: %s", reservation_id)
         
         return ApiResponse(
             success=True,
@@ -198,7 +528,7 @@ async def update_reservation(
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ 예약 수정 실패: {e}")
+        logger.error("❌ 예약 수정 실패: %s", e)
         raise HTTPException(status_code=500, detail="예약 수정 중 오류가 발생했습니다.")
 
 @router.delete("/reservations/{reservation_id}", response_model=ApiResponse)
@@ -213,6 +543,8 @@ async def cancel_reservation(
         ).first()
         
         if not reservation:
+            if is_archived_reservation(db, reservation_id):
+                raise HTTPException(status_code=409, detail="보관된 예약은 수정할 수 없습니다.")
             raise HTTPException(status_code=404, detail="예약을 찾을 수 없습니다.")
         
         if reservation.status == ReservationStatus.CANCELLED:
@@ -221,11 +553,13 @@ async def cancel_reservation(
         if reservation.status == ReservationStatus.COMPLETED:
             raise HTTPException(status_code=400, detail="완료된 예약은 취소할 수 없습니다.")
         
+        previous = serialize_reservation(reservation)
         reservation.status = ReservationStatus.CANCELLED
-        reservation.updated_at = datetime.now()
+        reservation.updated_at = utc_now()
+        track_reservation_change(db, RESERVATION_STATUS_CHANGED, reservation, previous)
         db.commit()
         
-        logger.info(f"✅ 예약 취소 완료: {reservation_id}")
+        logger.info("✅ 예약 취소 완료: %s", reservation_id)
         
         return ApiResponse(
             success=True,
@@ -236,9 +570,369 @@ async def cancel_reservation(
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ 예약 취소 실패: {e}")
+        logger.error("❌ 예약 취소 실패: %s", e)
         raise HTTPException(status_code=500, detail="예약 취소 중 오류가 발생했습니다.")
 
+# === Slot Holds ===
+
+@router.post("/holds", response_model=ReservationHoldResponse, status_code=201)
+async def create_reservation_hold(
+    hold_data: ReservationHoldCreate,
+    db: Session = Depends(get_database)
+):
+    """
+    예약 시간대 임시 점유 (예약 정보 입력 중 다른 사용자의 예약 방지)
+    - 반환된 hold_token을 예약 생성 요청에 포함하면 홀드가 예약으로 전환된다
+    - 만료된 홀드는 자동으로 무시되며 백그라운드 스위퍼가 정리한다
+    """
+    hold_minutes = hold_data.hold_minutes or HOLD_DEFAULT_MINUTES
+    if hold_minutes > HOLD_MAX_MINUTES:
+        raise HTTPException(status_code=400, detail=f"홀드 시간은 최대 {HOLD_MAX_MINUTES}분입니다.")
+    
+    try:
+        operating_hours = await get_hospital_operating_hours(hold_data.hospital_id)
+        reason = check_operating_hours(operating_hours, hold_data.reservation_date, hold_data.reservation_time)
+        if reason:
+            raise HTTPException(status_code=400, detail=f"병원 운영시간에 포함되지 않습니다: {reason}")
+        if hold_data.doctor_id:
+            await validate_doctor_schedule(hold_data.doctor_id, hold_data.reservation_date, hold_data.reservation_time)
+        
+        existing_reservation = db.query(Reservation.reservation_id).filter(
+            and_(
+                Reservation.hospital_id == hold_data.hospital_id,
+                Reservation.reservation_date == hold_data.reservation_date,
+                Reservation.reservation_time == hold_data.reservation_time,
+                Reservation.status.in_(ACTIVE_STATUSES)
+            )
+        ).first()
+        if existing_reservation:
+            raise HTTPException(status_code=409, detail="해당 시간에 이미 예약이 존재합니다.")
+        
+        try:
+            hold = create_hold(
+                db,
+                user_id=hold_data.user_id,
+                hospital_id=hold_data.hospital_id,
+                doctor_id=hold_data.doctor_id,
+                reservation_date=hold_data.reservation_date,
+                reservation_time=hold_data.reservation_time,
+                hold_minutes=hold_minutes
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="다른 사용자가 예약 진행 중인 시간입니다.")
+        
+        return hold
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ 예약 홀드 생성 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 홀드 생성 중 오류가 발생했습니다.")
+
+@router.get("/holds/{hold_token}", response_model=ReservationHoldResponse)
+async def get_reservation_hold(
+    hold_token: str = Path(..., description="홀드 토큰"),
+    db: Session = Depends(get_database)
+):
+    """유효한 시간대 홀드 조회 (만료되었으면 404)"""
+    hold = find_hold_by_token(db, hold_token)
+    if not hold:
+        raise HTTPException(status_code=404, detail="홀드를 찾을 수 없거나 만료되었습니다.")
+    return hold
+
+@router.delete("/holds/{hold_token}", response_model=ApiResponse)
+async def release_reservation_hold(
+    hold_token: str = Path(..., description="홀드 토큰"),
+    db: Session = Depends(get_database)
+):
+    """시간대 홀드 해제 (예약을 진행하지 않는 경우)"""
+    try:
+        released = release_hold(db, hold_token)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ 예약 홀드 해제 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 홀드 해제 중 오류가 발생했습니다.")
+    
+    if not released:
+        raise HTTPException(status_code=404, detail="홀드를 찾을 수 없습니다.")
+    return ApiResponse(success=True, message="홀드가 해제되었습니다.")
+
+# === Bulk Operations ===
+
+@router.post("/reservations/bulk", response_model=BulkOperationResponse)
+async def create_reservations_bulk(
+    bulk_data: BulkReservationCreate,
+    db: Session = Depends(get_database)
+):
+    """
+    예약 일괄 생성 (단체 예약)
+    - 병원당 운영시간 1회 조회, 기존 예약 충돌은 단일 쿼리로 확인
+    - 유효한 예약은 한 트랜잭션에서 일괄 INSERT, 항목별 결과 반환
+    """
+    items = bulk_data.reservations
+    results = {}
+    
+    def fail(index: int, status_code: int, message: str):
+        results[index] = BulkItemResult(index=index, success=False, status_code=status_code, message=message)
+    
+    try:
+        # 1. 병원별 운영시간 조회 (병원당 1회, 병렬)
+        hospital_ids = list(dict.fromkeys(item.hospital_id for item in items))
+        operating_hours_list = await asyncio.gather(
+            *[get_hospital_operating_hours(hospital_id) for hospital_id in hospital_ids]
+        )
+        operating_hours_map = dict(zip(hospital_ids, operating_hours_list))
+        
+        # 의사별 근무일정 조회 (의사당 1회, 병렬)
+        doctor_ids = list(dict.fromkeys(item.doctor_id for item in items if item.doctor_id))
+        doctor_schedules_list = await asyncio.gather(
+            *[get_doctor_schedules(doctor_id) for doctor_id in doctor_ids]
+        )
+        doctor_schedules_map = dict(zip(doctor_ids, doctor_schedules_list))
+        
+        # 2. 기존 활성 예약 시간대 단일 쿼리 조회
+        reserved_slots = set(
+            db.query(
+                Reservation.hospital_id,
+                Reservation.reservation_date,
+                Reservation.reservation_time
+            ).filter(
+                and_(
+                    Reservation.hospital_id.in_(hospital_ids),
+                    Reservation.reservation_date.in_({item.reservation_date for item in items}),
+                    Reservation.status.in_(ACTIVE_STATUSES)
+                )
+            ).all()
+        )
+        
+        # 유효한 시간대 홀드 단일 쿼리 조회 (시간대 → 홀드 토큰)
+        held_slots = {
+            (row.hospital_id, row.reservation_date, row.reservation_time): row.hold_token
+            for row in db.query(
+                ReservationHold.hospital_id,
+                ReservationHold.reservation_date,
+                ReservationHold.reservation_time,
+                ReservationHold.hold_token
+            ).filter(
+                and_(
+                    ReservationHold.hospital_id.in_(hospital_ids),
+                    ReservationHold.reservation_date.in_({item.reservation_date for item in items}),
+                    ReservationHold.expires_at > hold_now()
+                )
+            ).all()
+        }
+        
+        # 3. 항목별 검증 (운영시간, 의사 근무시간, 기존 예약, 홀드, 요청 내 중복, 이미지)
+        valid_items = []
+        image_contents = {}
+        for index, item in enumerate(items):
+            slot = (item.hospital_id, item.reservation_date, item.reservation_time)
+            
+            reason = check_operating_hours(operating_hours_map.get(item.hospital_id), item.reservation_date, item.reservation_time)
+            if reason:
+                fail(index, 400, f"병원 운영시간에 포함되지 않습니다: {reason}")
+                continue
+            if item.doctor_id:
+                reason = check_doctor_schedule(doctor_schedules_map.get(item.doctor_id), item.reservation_date, item.reservation_time)
+                if reason:
+                    fail(index, 400, reason)
+                    continue
+            if slot in reserved_slots:
+                fail(index, 409, "해당 시간에 이미 예약이 존재합니다.")
+                continue
+            if slot in held_slots and held_slots[slot] != item.hold_token:
+                fail(index, 409, "다른 사용자가 예약 진행 중인 시간입니다.")
+                continue
+            
+            # 이미지는 디코딩/검증만 하고 blob 저장은 INSERT가 확정된 항목만 수행 (거부/충돌 항목의 고아 blob 방지)
+            try:
+                prepared_images = [prepare_base64_image(image) for image in item.images]
+            except ValueError as e:
+                fail(index, 400, str(e))
+                continue
+            
+            reserved_slots.add(slot)
+            image_contents[index] = [content for _, content in prepared_images]
+            valid_items.append((index, item, [fields for fields, _ in prepared_images]))
+        
+        if bulk_data.atomic and results:
+            for index, _, _ in valid_items:
+                fail(index, 424, "다른 항목의 실패로 처리되지 않았습니다.")
+            valid_items = []
+        
+        # 4. 일괄 INSERT (동시 요청과 충돌하면 항목별 SAVEPOINT로 재시도)
+        if valid_items:
+            created = insert_reservations(db, valid_items, per_item=False)
+            if created is None:
+                db.rollback()
+                if bulk_data.atomic:
+                    for index, _, _ in valid_items:
+                        fail(index, 409, "동시 예약과 충돌하여 전체 처리가 취소되었습니다.")
+                    created = {}
+                else:
+                    created = insert_reservations(db, valid_items, per_item=True)
+            
+            for index, reservation in created.items():
+                if items[index].hold_token:
+                    release_slot_hold(
+                        db, items[index].hold_token, reservation.hospital_id,
+                        reservation.reservation_date, reservation.reservation_time
+                    )
+                track_reservation_change(db, RESERVATION_CREATED, reservation)
+            
+            # 생성된 예약의 이미지만 커밋 전에 저장 (행이 가리키는 blob이 항상 존재하도록)
+            store = get_blob_store()
+            for index in created:
+                for content in image_contents[index]:
+                    store.put(content)
+            db.commit()
+            
+            for index, _, _ in valid_items:
+                if index in created:
+                    results[index] = BulkItemResult(
+                        index=index,
+                        reservation_id=created[index].reservation_id,
+                        success=True,
+                        status_code=201
+                    )
+                elif index not in results:
+                    fail(index, 409, "해당 시간에 이미 예약이 존재합니다.")
+        
+        ordered_results = [results[index] for index in range(len(items))]
+        succeeded = sum(1 for result in ordered_results if result.success)
+        
+        logger.info("✅ 예약 일괄 생성: 요청 %s건, 성공 %s건", len(items), succeeded)
+        
+        return BulkOperationResponse(
+            success=succeeded == len(items),
+            total=len(items),
+            succeeded=succeeded,
+            failed=len(items) - succeeded,
+            results=ordered_results
+        )
+        
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ 예약 일괄 생성 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 일괄 생성 중 오류가 발생했습니다.")
+
+@router.patch("/reservations/bulk/status", response_model=BulkOperationResponse)
+async def update_reservation_status_bulk(
+    bulk_data: BulkStatusUpdate,
+    db: Session = Depends(get_database)
+):
+    """
+    예약 상태 일괄 변경 (예: PENDING → CONFIRMED)
+    - 대상 예약을 단일 쿼리로 잠금 조회 후 한 번에 커밋, 항목별 결과 반환
+    """
+    reservation_ids = bulk_data.reservation_ids
+    target_status = bulk_data.status
+    
+    try:
+        reservations = {
+            reservation.reservation_id: reservation
+            for reservation in db.query(Reservation).filter(
+                Reservation.reservation_id.in_(set(reservation_ids))
+            ).with_for_update().all()
+        }
+        missing_ids = set(reservation_ids) - set(reservations)
+        archived_ids = {
+            row.reservation_id
+            for row in db.query(ArchivedReservation.reservation_id).filter(
+                ArchivedReservation.reservation_id.in_(missing_ids)
+            ).all()
+        } if missing_ids else set()
+        
+        results = []
+        to_update = []
+        seen = set()
+        for index, reservation_id in enumerate(reservation_ids):
+            reservation = reservations.get(reservation_id)
+            if reservation is None:
+                if reservation_id in archived_ids:
+                    results.append(BulkItemResult(index=index, reservation_id=reservation_id, success=False, status_code=409, message="보관된 예약은 수정할 수 없습니다."))
+                    continue
+                results.append(BulkItemResult(index=index, reservation_id=reservation_id, success=False, status_code=404, message="예약을 찾을 수 없습니다."))
+                continue
+            if reservation_id in seen:
+                results.append(BulkItemResult(index=index, reservation_id=reservation_id, success=False, status_code=400, message="중복된 예약 ID입니다."))
+                continue
+            
+            current_status = ReservationStatus(reservation.status)
+            if target_status not in ALLOWED_STATUS_TRANSITIONS[current_status]:
+                results.append(BulkItemResult(
+                    index=index, reservation_id=reservation_id, success=False, status_code=400,
+                    message=f"{current_status.value} 상태에서 {target_status.value} 상태로 변경할 수 없습니다."
+                ))
+                continue
+            
+            seen.add(reservation_id)
+            to_update.append((index, reservation))
+            results.append(BulkItemResult(index=index, reservation_id=reservation_id, success=True, status_code=200))
+        
+        if bulk_data.atomic and len(to_update) < len(reservation_ids):
+            db.rollback()
+            for result in results:
+                if result.success:
+                    result.success = False
+                    result.status_code = 424
+                    result.message = "다른 항목의 실패로 처리되지 않았습니다."
+        else:
+            now = utc_now()
+            for _, reservation in to_update:
+                previous = serialize_reservation(reservation)
+                reservation.status = target_status
+                reservation.updated_at = now
+                track_reservation_change(db, RESERVATION_STATUS_CHANGED, reservation, previous)
+            db.commit()
+        
+        succeeded = sum(1 for result in results if result.success)
+        
+        logger.info("✅ 예약 상태 일괄 변경 (%s): 요청 %s건, 성공 %s건", target_status.value, len(reservation_ids), succeeded)
+        
+        return BulkOperationResponse(
+            success=succeeded == len(reservation_ids),
+            total=len(reservation_ids),
+            succeeded=succeeded,
+            failed=len(reservation_ids) - succeeded,
+            results=results
+        )
+        
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ 예약 상태 일괄 변경 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 상태 일괄 변경 중 오류가 발생했습니다.")
+
+# === Reservation Events ===
+
+@router.get("/events", response_model=ReservationEventListResponse)
+async def list_reservation_events(
+    after_sequence: int = Query(0, ge=0, description="이 순서 번호 이후의 이벤트만 조회"),
+    hospital_id: Optional[int] = Query(None, description="병원 ID"),
+    limit: int = Query(100, ge=1, le=500, description="최대 개수"),
+    db: Session = Depends(get_database)
+):
+    """
+    예약 변경 이벤트 증분 조회
+    - 대시보드/분석 소비자는 예약 목록 전체를 폴링하는 대신 마지막으로 받은 sequence 이후만 조회
+    - sequence는 디스패처가 커밋된 이벤트에 커밋 순서대로 부여하므로, 이미 읽은 위치 앞에 나중에 이벤트가 끼어들지 않는다
+      (event_id는 INSERT 순서라 늦게 커밋된 낮은 ID를 건너뛸 수 있음, 순서 부여 전 이벤트는 디스패처 주기만큼 늦게 보인다)
+    """
+    query = db.query(ReservationEvent).filter(ReservationEvent.sequence > after_sequence)
+    if hospital_id:
+        query = query.filter(ReservationEvent.hospital_id == hospital_id)
+    
+    events = query.order_by(ReservationEvent.sequence).limit(limit).all()
+    
+    return ReservationEventListResponse(
+        items=events,
+        last_sequence=events[-1].sequence if events else after_sequence
+    )
+
 # === Reservation Search and List ===
 
 @router.get("/reservations", response_model=PaginatedResponse)
@@ -249,37 +943,126 @@ async def search_reservations(
     status: Optional[ReservationStatus] = Query(None, description="예약 상태"),
     date_from: Optional[date] = Query(None, description="시작 날짜"),
     date_to: Optional[date] = Query(None, description="종료 날짜"),
+    created_from: Optional[datetime] = Query(None, description="생성일시 시작 (ISO 8601, 타임존이 없으면 KST)"),
+    created_to: Optional[datetime] = Query(None, description="생성일시 종료 (ISO 8601, 타임존이 없으면 KST, 미포함)"),
     interpreter_language: Optional[InterpreterLanguage] = Query(None, description="통역 언어"),
     limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
-    offset: int = Query(0, ge=0, description="페이지 오프셋"),
+    offset: int = Query(0, ge=0, description="페이지 오프셋 (cursor 사용 시 무시)"),
+    cursor: Optional[str] = Query(None, description="키셋 페이지네이션 커서 (이전 응답의 next_cursor)"),
+    total_mode: str = Query("exact", pattern="^(exact|cached|none)$", description="총 개수 계산 방식 (exact: 매번 계산, cached: 30초 캐시, none: 생략)"),
     db: Session = Depends(get_database)
 ):
-    """예약 검색 및 목록 조회"""
+    """
+    예약 검색 및 목록 조회
+    - cursor를 사용하면 OFFSET 없이 (created_at, reservation_id) 인덱스를 따라 조회하므로 깊은 페이지도 첫 페이지와 같은 비용
+    - total_mode로 페이지마다 실행되는 COUNT 쿼리를 캐시하거나 생략 가능
+    - created_from/created_to는 정렬 컬럼(created_at, UTC)과 같은 인덱스 범위로 조회
+    """
+    created_from = as_utc(created_from) if created_from else None
+    created_to = as_utc(created_to) if created_to else None
+    
+    cursor_position = None
+    if cursor:
+        try:
+            cursor_position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    
     try:
-        # 기본 쿼리
-        query = db.query(Reservation)
+        # 진행 중 상태만 조회하면 운영 테이블만, 그 외에는 보관 테이블도 함께 조회
+        models = [Reservation] if status in ACTIVE_STATUSES else [Reservation, ArchivedReservation]
+        queries = []
+        for model in models:
+            query = db.query(model)
+            
+            # 필터 조건 적용
+            if hospital_id:
+                query = query.filter(model.hospital_id == hospital_id)
+            if user_id:
+                query = query.filter(model.user_id == user_id)
+            if doctor_id:
+                query = query.filter(model.doctor_id == doctor_id)
+            if status:
+                query = query.filter(model.status == status)
+            if date_from:
+                query = query.filter(model.reservation_date >= date_from)
+            if date_to:
+                query = query.filter(model.reservation_date <= date_to)
+            if created_from:
+                query = query.filter(model.created_at >= created_from)
+            if created_to:
+                query = query.filter(model.created_at < created_to)
+            if interpreter_language:
+                query = query.filter(model.interpreter_language == interpreter_language)
+            queries.append((model, query))
         
-        # 필터 조건 적용
-        if hospital_id:
-            query = query.filter(Reservation.hospital_id == hospital_id)
-        if user_id:
-            query = query.filter(Reservation.user_id == user_id)
-        if doctor_id:
-            query = query.filter(Reservation.doctor_id == doctor_id)
-        if status:
-            query = query.filter(Reservation.status == status)
-        if date_from:
-            query = query.filter(Reservation.reservation_date >= date_from)
-        if date_to:
-            query = query.filter(Reservation.reservation_date <= date_to)
-        if interpreter_language:
-            query = query.filter(Reservation.interpreter_language == interpreter_language)
+        def count_all() -> int:
+            return sum(query.count() for _, query in queries)
         
         # 총 개수 조회
-        total = query.count()
+        if total_mode == "exact":
+            total = count_all()
+        elif total_mode == "cached":
+            count_key = (hospital_id, user_id, doctor_id, status, date_from, date_to, created_from, created_to, interpreter_language)
+            total = reservation_count_cache.get_or_compute(count_key, count_all)
+        else:
+            total = None
         
-        # 페이지네이션 적용
-        reservations = query.order_by(desc(Reservation.created_at)).offset(offset).limit(limit).all()
+        # 페이지네이션 적용 (키셋 또는 오프셋), 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        if cursor_position:
+            queries = [
+                (model, query.filter(tuple_(model.created_at, model.reservation_id) < tuple_(*cursor_position)))
+                for model, query in queries
+            ]
+        page_offset = 0 if cursor_position else offset
+        
+        if len(queries) == 1:
+            model, query = queries[0]
+            reservations = query.order_by(
+                desc(model.created_at), desc(model.reservation_id)
+            ).offset(page_offset).limit(limit + 1).all()
+        else:
+            # 운영/보관 테이블의 정렬 키만 UNION ALL로 병합하여 DB에서 정렬/OFFSET/LIMIT 적용
+            # (깊은 OFFSET에서도 전체 행을 읽지 않음), 페이지에 해당하는 행만 테이블별로 조회 (예약 ID는 두 테이블에 걸쳐 유일)
+            merged = union_all(*[
+                query.with_entities(
+                    literal(source).label("source"),
+                    model.created_at.label("created_at"),
+                    model.reservation_id.label("reservation_id")
+                ).statement
+                for source, (model, query) in enumerate(queries)
+            ]).subquery()
+            page_keys = db.query(merged.c.source, merged.c.reservation_id).order_by(
+                desc(merged.c.created_at), desc(merged.c.reservation_id)
+            ).offset(page_offset).limit(limit + 1).all()
+            
+            rows = {}
+            for source, (model, query) in enumerate(queries):
+                reservation_ids = [reservation_id for key_source, reservation_id in page_keys if key_source == source]
+                if reservation_ids:
+                    rows.update(
+                        ((source, row.reservation_id), row)
+                        for row in db.query(model).filter(model.reservation_id.in_(reservation_ids)).all()
+                    )
+            reservations = [rows[key] for key in map(tuple, page_keys) if key in rows]
+        
+        has_more = len(reservations) > limit
+        reservations = reservations[:limit]
+        
+        last = reservations[-1] if reservations else None
+        next_cursor = encode_cursor(last.created_at, last.reservation_id) if has_more and last.created_at else None
+        
+        # 이미지 개수는 이미지 행을 로딩하지 않고 테이블별 집계 쿼리로 조회
+        image_counts = {}
+        for model, image_model in ((Reservation, ReservationImage), (ArchivedReservation, ArchivedReservationImage)):
+            reservation_ids = [r.reservation_id for r in reservations if isinstance(r, model)]
+            if reservation_ids:
+                image_counts.update(
+                    db.query(image_model.reservation_id, func.count(image_model.id))
+                    .filter(image_model.reservation_id.in_(reservation_ids))
+                    .group_by(image_model.reservation_id)
+                    .all()
+                )
         
         # 병원명과 의사명 조회를 위한 ID 수집
         hospital_ids = list(set([r.hospital_id for r in reservations if r.hospital_id]))
@@ -292,7 +1075,7 @@ async def search_reservations(
         # 응답 데이터 구성
         items = []
         for reservation in reservations:
-            image_count = len(reservation.images)
+            image_count = image_counts.get(reservation.reservation_id, 0)
             hospital_name = hospital_names.get(reservation.hospital_id, f"병원_{reservation.hospital_id}")
             doctor_name = doctor_names.get(reservation.doctor_id, f"의사_{reservation.doctor_id}") if reservation.doctor_id else None
             
@@ -318,13 +1101,14 @@ async def search_reservations(
             items=items,
             total=total,
             limit=limit,
-            offset=offset,
-            has_next=offset + limit < total,
-            has_prev=offset > 0
+            offset=0 if cursor_position else offset,
+            has_next=has_more,
+            has_prev=bool(cursor_position) or offset > 0,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
-        logger.error(f"❌ 예약 검색 실패: {e}")
+        logger.error("❌ 예약 검색 실패: %s", e)
         raise HTTPException(status_code=500, detail="예약 검색 중 오류가 발생했습니다.")
 
 # === Available Times API ===
@@ -333,83 +1117,47 @@ async def search_reservations(
 async def get_available_times(
     hospital_id: int = Path(..., description="병원 ID"),
     date: date = Query(..., description="조회할 날짜 (YYYY-MM-DD)"),
+    doctor_id: Optional[int] = Query(None, description="의사 ID (지정 시 의사 근무시간 반영)"),
     db: Session = Depends(get_database)
 ):
     """특정 병원의 특정 날짜 가능한 시간대 조회"""
     try:
-        # 병원 운영시간 조회
-        operating_hours = await get_hospital_operating_hours(hospital_id)
+        # 병원 운영시간 (및 의사 근무일정) 병렬 조회
+        if doctor_id:
+            operating_hours, doctor_schedules = await asyncio.gather(
+                get_hospital_operating_hours(hospital_id),
+                get_doctor_schedules(doctor_id)
+            )
+        else:
+            operating_hours = await get_hospital_operating_hours(hospital_id)
         
         if not operating_hours:
             raise HTTPException(status_code=404, detail="병원 정보를 찾을 수 없습니다.")
         
-        # 해당 날짜의 기존 예약 조회
-        existing_reservations = db.query(Reservation).filter(
+        # 해당 날짜의 기존 예약 조회 (시간 컬럼만)
+        existing_reservations = db.query(Reservation.reservation_time).filter(
             and_(
                 Reservation.hospital_id == hospital_id,
                 Reservation.reservation_date == date,
-                Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED])
+                Reservation.status.in_(ACTIVE_STATUSES)
             )
         ).all()
         
-        reserved_times = [res.reservation_time for res in existing_reservations]
-        
-        # 시간대 생성 (30분 간격)
-        time_slots = []
+        reserved_times = [row.reservation_time for row in existing_reservations]
         
         if not isinstance(operating_hours, list):
             operating_hours = []
         
-        # 요일 변환: 0=월요일, 1=화요일, ..., 6=일요일
-        weekday_num = date.weekday()
-        
-        # 해당 요일의 운영시간 찾기
-        day_schedule = None
-        for schedule in operating_hours:
-            if schedule.get('day_of_week') == weekday_num:
-                day_schedule = schedule
-                break
-        
-        if day_schedule and not day_schedule.get('is_closed', True):
-            open_time = datetime.strptime(day_schedule['open_time'], '%H:%M').time()
-            close_time = datetime.strptime(day_schedule['close_time'], '%H:%M').time()
-            
-            # 점심시간 정보
-            lunch_start = day_schedule.get('lunch_start')
-            lunch_end = day_schedule.get('lunch_end')
-            lunch_start_time = None
-            lunch_end_time = None
-            
-            if lunch_start and lunch_end:
-                lunch_start_time = datetime.strptime(lunch_start, '%H:%M').time()
-                lunch_end_time = datetime.strptime(lunch_end, '%H:%M').time()
-            
-            current_time = open_time
-            
-            while current_time < close_time:
-                # 예약 가능 여부 확인
-                is_available = current_time not in reserved_times
-                reason = None
-                
-                if not is_available:
-                    reason = "이미 예약됨"
-                elif lunch_start_time and lunch_end_time and lunch_start_time <= current_time <= lunch_end_time:
-                    is_available = False
-                    reason = "점심시간"
-                
-                time_slots.append(TimeSlotResponse(
-                    time=current_time.strftime('%H:%M'),
-                    available=is_available,
-                    reason=reason
-                ))
-                
-                # 30분 추가
-                current_datetime = datetime.combine(date.today(), current_time)
-                current_datetime += timedelta(minutes=30)
-                current_time = current_datetime.time()
+        # 시간대 생성 (30분 간격, 다른 사용자가 홀드 중인 시간 제외)
+        day_schedule = find_day_schedule(operating_hours, date)
+        slots = build_time_slots(day_schedule, reserved_times, get_held_times(db, hospital_id, date))
+        if doctor_id:
+            slots = apply_doctor_schedule(slots, doctor_schedules, date)
+        time_slots = [TimeSlotResponse(**slot) for slot in slots]
         
         return AvailableTimesResponse(
             hospital_id=hospital_id,
+            doctor_id=doctor_id,
             date=date,
             time_slots=time_slots,
             operating_hours=operating_hours
@@ -418,110 +1166,231 @@ async def get_available_times(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ 가능한 시간대 조회 실패: {e}")
+        logger.error("❌ 가능한 시간대 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail="가능한 시간대 조회 중 오류가 발생했습니다.")
 
-# === Helper Functions ===
-
-async def get_hospital_operating_hours(hospital_id: int):
-    """hospital-service에서 병원 운영시간 조회"""
+@router.get("/available-times/{hospital_id}/doctors", response_model=DoctorsAvailabilityResponse)
+async def get_doctors_available_times(
+    hospital_id: int = Path(..., description="병원 ID"),
+    date: date = Query(..., description="조회할 날짜 (YYYY-MM-DD)"),
+    doctor_ids: List[int] = Query(..., description="의사 ID 목록 (예: ?doctor_ids=1&doctor_ids=2)"),
+    db: Session = Depends(get_database)
+):
+    """
+    병원의 특정 날짜 의사별 예약 가능 시간대 조회
+    - 병원 운영시간, 기존 예약, 의사 근무시간(DoctorSchedule)을 교차하여 의사별 비트맵으로 반환
+    - 근무일정을 조회하지 못한 의사는 병원 운영시간 기준으로 계산 (schedule_found=false)
+    """
+    unique_doctor_ids = list(dict.fromkeys(doctor_ids))
+    if len(unique_doctor_ids) > MAX_AVAILABILITY_DOCTORS:
+        raise HTTPException(status_code=400, detail=f"의사는 최대 {MAX_AVAILABILITY_DOCTORS}명까지 조회할 수 있습니다.")
+    
     try:
-        logger.info(f"🏥 병원 {hospital_id} 정보 조회 시작: {HOSPITAL_SERVICE_URL}/hospitals/{hospital_id}")
-        response = requests.get(
-            f"{HOSPITAL_SERVICE_URL}/hospitals/{hospital_id}",
-            timeout=10.0
+        operating_hours, *doctor_schedules_list = await asyncio.gather(
+            get_hospital_operating_hours(hospital_id),
+            *[get_doctor_schedules(doctor_id) for doctor_id in unique_doctor_ids]
         )
-        logger.info(f"🔄 Hospital-service 응답 상태: {response.status_code}")
+        if not operating_hours or not isinstance(operating_hours, list):
+            raise HTTPException(status_code=404, detail="병원 정보를 찾을 수 없습니다.")
+        doctor_schedules_map = dict(zip(unique_doctor_ids, doctor_schedules_list))
         
-        if response.status_code == 200:
-            hospital_data = response.json()
-            logger.info(f"📋 병원 데이터 수신: hospital_details 길이 = {len(hospital_data.get('hospital_details', []))}")
-            
-            # hospital_details에서 operating_hours 추출
-            if hospital_data.get("hospital_details") and hospital_data["hospital_details"]:
-                operating_hours = hospital_data["hospital_details"][0].get("operating_hours")
-                logger.info(f"📊 운영시간 원본 데이터: {operating_hours} (타입: {type(operating_hours)})")
-                
-                if operating_hours and isinstance(operating_hours, str):
-                    parsed_hours = json.loads(operating_hours)
-                    logger.info(f"📅 파싱된 운영시간: {parsed_hours}")
-                    return parsed_hours
-                elif operating_hours and isinstance(operating_hours, list):
-                    logger.info(f"📅 이미 리스트인 운영시간: {operating_hours}")
-                    return operating_hours
-        else:
-            logger.error(f"❌ Hospital-service 응답 오류: {response.status_code}")
-        return None
+        reserved_times = [
+            row.reservation_time for row in db.query(Reservation.reservation_time).filter(
+                and_(
+                    Reservation.hospital_id == hospital_id,
+                    Reservation.reservation_date == date,
+                    Reservation.status.in_(ACTIVE_STATUSES)
+                )
+            ).all()
+        ]
+        
+        slots = build_time_slots(
+            find_day_schedule(operating_hours, date), reserved_times, get_held_times(db, hospital_id, date)
+        )
+        masks = compute_doctor_slot_matrix(slots, doctor_schedules_map, date)
+        
+        return DoctorsAvailabilityResponse(
+            hospital_id=hospital_id,
+            date=date,
+            slot_start=slots[0]["time"] if slots else None,
+            slot_interval_minutes=SLOT_INTERVAL_MINUTES,
+            doctors=[
+                DoctorAvailabilityResponse(
+                    doctor_id=doctor_id,
+                    schedule_found=doctor_schedules_map[doctor_id] is not None,
+                    bitmap=encode_mask_bitmap(masks[doctor_id])
+                )
+                for doctor_id in unique_doctor_ids
+            ]
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"병원 {hospital_id} 운영시간 조회 중 오류: {e}")
-        import traceback
-        logger.error(f"상세 오류: {traceback.format_exc()}")
-        return None
+        logger.error("❌ 의사별 예약 가능 시간대 조회 실패: %s", e)
+        raise HTTPException(status_code=500, detail="의사별 예약 가능 시간대 조회 중 오류가 발생했습니다.")
 
-async def validate_hospital_operating_hours(hospital_id: int, reservation_date: date, reservation_time: time) -> bool:
-    """병원 운영시간 검증"""
+@router.get("/availability", response_model=AvailabilityResponse)
+async def get_availability(
+    hospital_ids: List[int] = Query(..., description="병원 ID 목록 (예: ?hospital_ids=1&hospital_ids=2)"),
+    date_from: date = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="종료 날짜 (YYYY-MM-DD, 기본값: 시작 날짜)"),
+    db: Session = Depends(get_database)
+):
+    """
+    여러 병원의 기간별 예약 가능 시간대 일괄 조회
+    - 병원당 운영시간 1회 조회, 기존 예약은 단일 쿼리로 조회
+    - 날짜별 시간대는 첫 시간대(slot_start)와 비트맵('1'=가능, '0'=불가)으로 인코딩
+    """
+    date_to = date_to or date_from
+    unique_hospital_ids = list(dict.fromkeys(hospital_ids))
+    
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="종료 날짜는 시작 날짜 이후여야 합니다.")
+    if (date_to - date_from).days + 1 > MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {MAX_AVAILABILITY_DAYS}일입니다.")
+    if len(unique_hospital_ids) > MAX_AVAILABILITY_HOSPITALS:
+        raise HTTPException(status_code=400, detail=f"병원은 최대 {MAX_AVAILABILITY_HOSPITALS}개까지 조회할 수 있습니다.")
+    
     try:
-        operating_hours = await get_hospital_operating_hours(hospital_id)
-        logger.info(f"🔍 병원 {hospital_id} 운영시간 조회 결과: {operating_hours}")
-        
-        if not operating_hours or not isinstance(operating_hours, list):
-            logger.error(f"❌ 운영시간 정보가 없거나 잘못된 형식: {operating_hours}")
-            return False
-        
-        # 요일 변환: 0=월요일, 1=화요일, ..., 6=일요일
-        weekday_num = reservation_date.weekday()
-        logger.info(f"🗓️ 예약 날짜 {reservation_date}의 요일: {weekday_num} (0=월요일)")
+        # 병원별 운영시간 병렬 조회 (병원당 1회)
+        results = await asyncio.gather(
+            *[get_hospital_operating_hours(hospital_id) for hospital_id in unique_hospital_ids]
+        )
+        operating_hours_map = dict(zip(unique_hospital_ids, results))
         
-        # 해당 요일의 운영시간 찾기
-        day_schedule = None
-        for schedule in operating_hours:
-            if schedule.get('day_of_week') == weekday_num:
-                day_schedule = schedule
-                break
+        # 전체 병원/기간의 기존 예약을 단일 쿼리로 조회
+        rows = db.query(
+            Reservation.hospital_id,
+            Reservation.reservation_date,
+            Reservation.reservation_time
+        ).filter(
+            and_(
+                Reservation.hospital_id.in_(unique_hospital_ids),
+                Reservation.reservation_date >= date_from,
+                Reservation.reservation_date <= date_to,
+                Reservation.status.in_(ACTIVE_STATUSES)
+            )
+        ).all()
+        reserved_map = group_reserved_times(rows)
+        held_map = get_held_slots(db, unique_hospital_ids, date_from, date_to)
         
-        logger.info(f"📅 해당 요일 운영시간: {day_schedule}")
+        days = daterange(date_from, date_to)
+        hospitals = []
+        for hospital_id in unique_hospital_ids:
+            operating_hours = operating_hours_map.get(hospital_id)
+            if not operating_hours or not isinstance(operating_hours, list):
+                hospitals.append(HospitalAvailabilityResponse(hospital_id=hospital_id, found=False))
+                continue
+            
+            day_items = []
+            for target_date in days:
+                slots = build_time_slots(
+                    find_day_schedule(operating_hours, target_date),
+                    reserved_map.get((hospital_id, target_date), ()),
+                    held_map.get((hospital_id, target_date), ())
+                )
+                day_items.append(DayAvailabilityResponse(
+                    date=target_date,
+                    slot_start=slots[0]["time"] if slots else None,
+                    bitmap=encode_slot_bitmap(slots)
+                ))
+            
+            hospitals.append(HospitalAvailabilityResponse(hospital_id=hospital_id, days=day_items))
         
-        if not day_schedule:
-            logger.error("❌ 해당 요일의 운영시간 정보가 없음")
-            return False
+        return AvailabilityResponse(
+            date_from=date_from,
+            date_to=date_to,
+            slot_interval_minutes=SLOT_INTERVAL_MINUTES,
+            hospitals=hospitals
+        )
         
-        # 휴무일인지 확인
-        if day_schedule.get('is_closed', True):
-            logger.error("❌ 해당 요일은 휴무일")
-            return False
+    except Exception as e:
+        logger.error("❌ 다중 예약 가능 시간대 조회 실패: %s", e)
+        raise HTTPException(status_code=500, detail="예약 가능 시간대 조회 중 오류가 발생했습니다.")
+
+# === Helper Functions ===
+
+async def get_hospital_operating_hours(hospital_id: int):
+    """병원 운영시간 조회 (SCHEDULE_CACHE_TTL 동안 로컬 캐시, 조회 실패는 캐시하지 않음)"""
+    return await operating_hours_cache.get_or_load(
+        hospital_id, lambda: fetch_hospital_operating_hours(hospital_id)
+    )
+
+async def fetch_hospital_operating_hours(hospital_id: int):
+    """hospital-service에서 병원 운영시간 조회"""
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{HOSPITAL_SERVICE_URL}/hospitals/{hospital_id}")
         
-        # 운영시간 확인
-        open_time = datetime.strptime(day_schedule['open_time'], '%H:%M').time()
-        close_time = datetime.strptime(day_schedule['close_time'], '%H:%M').time()
-        logger.info(f"⏰ 운영시간: {open_time} ~ {close_time}, 예약시간: {reservation_time}")
+        if response.status_code != 200:
+            logger.warning("⚠️ Hospital-service 응답 오류: 병원 %s, 상태 %s", hospital_id, response.status_code)
+            return None
         
-        # 점심시간 확인 (선택사항)
-        lunch_start = day_schedule.get('lunch_start')
-        lunch_end = day_schedule.get('lunch_end')
+        # hospital_details에서 operating_hours 추출
+        hospital_details = response.json().get("hospital_details")
+        if not hospital_details:
+            return None
         
-        # 기본 운영시간 내인지 확인
-        if not (open_time <= reservation_time <= close_time):
-            logger.error(f"❌ 예약시간 {reservation_time}이 운영시간 {open_time}~{close_time} 범위를 벗어남")
+        operating_hours = hospital_details[0].get("operating_hours")
+        if operating_hours and isinstance(operating_hours, str):
+            operating_hours = json.loads(operating_hours)
+        logger.debug("📅 병원 %s 운영시간: %s", hospital_id, operating_hours)
+        return operating_hours if operating_hours and isinstance(operating_hours, list) else None
+    except Exception as e:
+        logger.warning("⚠️ 병원 %s 운영시간 조회 중 오류: %s", hospital_id, e)
+        return None
+
+async def validate_hospital_operating_hours(hospital_id: int, reservation_date: date, reservation_time: time) -> bool:
+    """병원 운영시간 검증"""
+    try:
+        operating_hours = await get_hospital_operating_hours(hospital_id)
+        reason = check_operating_hours(operating_hours, reservation_date, reservation_time)
+        if reason:
+            logger.info(
+                "❌ 운영시간 검증 실패: 병원 %s, %s %s - %s",
+                hospital_id, reservation_date, reservation_time, reason
+            )
             return False
-        
-        # 점심시간 제외 확인
-        if lunch_start and lunch_end:
-            lunch_start_time = datetime.strptime(lunch_start, '%H:%M').time()
-            lunch_end_time = datetime.strptime(lunch_end, '%H:%M').time()
-            logger.info(f"🍽️ 점심시간: {lunch_start_time} ~ {lunch_end_time}")
-            
-            # 점심시간 중이면 예약 불가
-            if lunch_start_time <= reservation_time <= lunch_end_time:
-                logger.error(f"❌ 예약시간 {reservation_time}이 점심시간 {lunch_start_time}~{lunch_end_time} 중")
-                return False
-        
-        logger.info("✅ 운영시간 검증 통과")
         return True
         
     except Exception as e:
-        logger.error(f"운영시간 검증 중 오류: {e}")
+        logger.error("운영시간 검증 중 오류: %s", e)
         return False
 
+async def get_doctor_schedules(doctor_id: int) -> Optional[list]:
+    """의사 근무일정 조회 (SCHEDULE_CACHE_TTL 동안 로컬 캐시, 조회 실패 시 None)"""
+    return await doctor_schedule_cache.get_or_load(
+        doctor_id, lambda: fetch_doctor_schedules(doctor_id)
+    )
+
+async def fetch_doctor_schedules(doctor_id: int) -> Optional[list]:
+    """doctor-service에서 의사 근무일정(DoctorSchedule) 목록 조회"""
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{DOCTOR_SERVICE_URL}/doctors/{doctor_id}/schedules")
+        if response.status_code == 200:
+            schedules = response.json()
+            if isinstance(schedules, list):
+                return schedules
+        logger.warning("⚠️ 의사 %s 근무일정 조회 실패: %s", doctor_id, response.status_code)
+        return None
+    except Exception as e:
+        logger.warning("⚠️ 의사 %s 근무일정 조회 중 오류: %s", doctor_id, e)
+        return None
+
+async def validate_doctor_schedule(doctor_id: int, reservation_date: date, reservation_time: time):
+    """
+    의사 근무시간 검증 (근무시간이 아니면 400)
+    근무일정을 조회하지 못하거나 등록된 일정이 없으면 병원 운영시간 검증만 적용
+    """
+    doctor_schedules = await get_doctor_schedules(doctor_id)
+    if doctor_schedules is None:
+        logger.warning("⚠️ 의사 %s 근무일정 없이 예약 처리", doctor_id)
+    reason = check_doctor_schedule(doctor_schedules, reservation_date, reservation_time)
+    if reason:
+        raise HTTPException(status_code=400, detail=reason)
+
 async def get_hospital_name(hospital_id: int) -> str:
     """hospital-service에서 병원명 조회"""
     try:
@@ -535,7 +1404,7 @@ async def get_hospital_name(hospital_id: int) -> str:
         else:
             return f"병원_{hospital_id}"
     except Exception as e:
-        logger.error(f"병원 {hospital_id} 이름 조회 중 오류: {e}")
+        logger.error("병원 %s 이름 조회 중 오류: %s", hospital_id, e)
         return f"병원_{hospital_id}"
 
 async def get_doctor_name(doctor_id: int) -> str:
@@ -551,7 +1420,7 @@ async def get_doctor_name(doctor_id: int) -> str:
         else:
             return f"의사_{doctor_id}"
     except Exception as e:
-        logger.error(f"의사 {doctor_id} 이름 조회 중 오류: {e}")
+        logger.error("의사 %s 이름 조회 중 오류: %s", doctor_id, e)
         return f"의사_{doctor_id}"
 
 async def get_multiple_hospital_names(hospital_ids: List[int]) -> dict:
@@ -574,8 +1443,19 @@ async def get_multiple_doctor_names(doctor_ids: List[int]) -> dict:
     
     return dict(zip(doctor_ids, results))
 
+def is_slot_conflict(error: IntegrityError) -> bool:
+    """활성 예약 시간대 유니크 인덱스 위반 여부 확인 (PostgreSQL: 인덱스명, SQLite: 컬럼명 포함)"""
+    message = str(error.orig)
+    return ACTIVE_SLOT_INDEX_NAME in message or "reservations.hospital_id" in message
+
+def is_archived_reservation(db: Session, reservation_id: int) -> bool:
+    """보관 테이블로 이동된 예약인지 확인"""
+    return db.query(ArchivedReservation.reservation_id).filter(
+        ArchivedReservation.reservation_id == reservation_id
+    ).first() is not None
+
 def process_base64_image(image_data: str, image_type: str) -> dict:
-    """Base64 이미지 처리 및 메타데이터 추출"""
+    """Base64 이미지 디코딩 및 메타데이터 추출 (이미지 크기는 헤더만 읽어서 확인)"""
     try:
         # Data URL 형식 처리
         if image_data.startswith('data:image'):
@@ -586,7 +1466,7 @@ def process_base64_image(image_data: str, image_type: str) -> dict:
         decoded_image = base64.b64decode(image_data)
         file_size = len(decoded_image)
         
-        # PIL로 이미지 정보 추출
+        # PIL로 이미지 정보 추출 (Image.open은 헤더만 파싱하고 픽셀은 디코딩하지 않음)
         image_io = io.BytesIO(decoded_image)
         with Image.open(image_io) as img:
             width, height = img.size
@@ -597,14 +1477,202 @@ def process_base64_image(image_data: str, image_type: str) -> dict:
             "width": width,
             "height": height,
             "image_type": format_type,
-            "processed_data": image_data
+            "content": decoded_image
         }
         
     except Exception as e:
         raise ValueError(f"이미지 처리 중 오류: {str(e)}")
 
+def track_reservation_change(db: Session, event_type: str, reservation: Reservation, previous: Optional[dict] = None):
+    """예약 변경을 같은 트랜잭션에 기록 (아웃박스 이벤트 + 일별 집계 변경분)"""
+    event = record_reservation_event(db, event_type, reservation, previous)
+    track_stat_change(db, event.payload["reservation"], previous)
+    return event
+
+def build_reservation(reservation_data: ReservationCreate) -> Reservation:
+    """예약 생성 요청으로 대기 상태의 예약 행 생성"""
+    return Reservation(
+        user_id=reservation_data.user_id,
+        hospital_id=reservation_data.hospital_id,
+        doctor_id=reservation_data.doctor_id,
+        symptoms=reservation_data.symptoms,
+        current_medications=reservation_data.current_medications,
+        reservation_date=reservation_data.reservation_date,
+        reservation_time=reservation_data.reservation_time,
+        contact_email=reservation_data.contact_email,
+        contact_phone=reservation_data.contact_phone,
+        interpreter_language=reservation_data.interpreter_language,
+        additional_notes=reservation_data.additional_notes,
+        status=ReservationStatus.PENDING
+    )
+
+def insert_reservations(db: Session, valid_items: list, per_item: bool) -> Optional[dict]:
+    """
+    검증된 예약 일괄 INSERT
+    - per_item=False: 한 번의 flush로 일괄 INSERT, 유니크 인덱스 충돌 시 None 반환 (호출자가 롤백)
+    - per_item=True: 항목별 SAVEPOINT로 INSERT, 충돌한 항목만 제외
+    반환: {요청 index: 생성된 Reservation}
+    """
+    created = {}
+    
+    if not per_item:
+        for index, item, image_fields in valid_items:
+            reservation = build_reservation(item)
+            reservation.images = [ReservationImage(**fields) for fields in image_fields]
+            created[index] = reservation
+        db.add_all(list(created.values()))
+        try:
+            db.flush()
+        except IntegrityError as e:
+            if is_slot_conflict(e):
+                return None
+            raise
+        return created
+    
+    for index, item, image_fields in valid_items:
+        reservation = build_reservation(item)
+        reservation.images = [ReservationImage(**fields) for fields in image_fields]
+        try:
+            with db.begin_nested():
+                db.add(reservation)
+                db.flush()
+            created[index] = reservation
+        except IntegrityError as e:
+            if not is_slot_conflict(e):
+                raise
+    return created
+
+def prepare_base64_image(image_data: ReservationImageCreate) -> Tuple[dict, bytes]:
+    """
+    Base64 이미지를 디코딩/검증하여 (예약 이미지 행 필드, 이미지 본문) 반환 (blob 저장소에는 쓰지 않음)
+    저장 키는 콘텐츠 해시이므로 저장 전에 결정된다
+    """
+    processed_image = process_base64_image(image_data.image_data, image_data.image_type)
+    
+    fields = {
+        "storage_key": content_key(processed_image["content"]),
+        "image_type": processed_image["image_type"],
+        "original_filename": image_data.original_filename,
+        "file_size": processed_image["file_size"],
+        "width": processed_image["width"],
+        "height": processed_image["height"],
+        "image_order": image_data.image_order,
+        "alt_text": image_data.alt_text
+    }
+    return fields, processed_image["content"]
+
+def store_base64_image(image_data: ReservationImageCreate) -> dict:
+    """Base64 이미지를 blob 저장소에 저장하고 예약 이미지 행 필드 반환"""
+    fields, content = prepare_base64_image(image_data)
+    get_blob_store().put(content)
+    return fields
+
+def build_reservation_image(reservation_id: int, image_data: ReservationImageCreate) -> ReservationImage:
+    """Base64 이미지를 blob 저장소에 저장하고 예약 이미지 행 생성"""
+    return ReservationImage(reservation_id=reservation_id, **store_base64_image(image_data))
+
+class ImageHeaderProbe:
+    """
+    업로드 청크를 받아 이미지 헤더만 파싱 (픽셀 디코딩 없음)
+    헤더가 확인되면 이후 청크는 무시한다
+    """
+    
+    # 헤더 탐색 최대 크기 (EXIF가 큰 JPEG 대비)
+    MAX_HEADER_BYTES = 512 * 1024
+    
+    def __init__(self):
+        self._parser = ImageFile.Parser()
+        self._consumed = 0
+        self.image_type = None
+        self.width = None
+        self.height = None
+    
+    @property
+    def done(self) -> bool:
+        return self.image_type is not None or self._consumed >= self.MAX_HEADER_BYTES
+    
+    def feed(self, chunk: bytes):
+        if self.done:
+            return
+        self._consumed += len(chunk)
+        try:
+            self._parser.feed(chunk)
+        except Exception:
+            # 이미지로 인식할 수 없는 데이터
+            self._consumed = self.MAX_HEADER_BYTES
+            return
+        image = self._parser.image
+        if image is not None:
+            self.width, self.height = image.size
+            self.image_type = (image.format or "").lower() or None
+
+async def stream_upload_to_store(upload: UploadFile) -> dict:
+    """업로드 파일을 청크 단위로 저장소에 기록하고 메타데이터 반환"""
+    writer: BlobWriter = get_blob_store().open_writer()
+    probe = ImageHeaderProbe()
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+            probe.feed(chunk)
+            if writer.size > MAX_IMAGE_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="이미지 파일이 너무 큽니다.")
+        
+        if probe.image_type is None:
+            raise HTTPException(status_code=400, detail=f"이미지 파일이 아닙니다: {upload.filename}")
+        
+        storage_key, file_size = writer.commit()
+    except Exception:
+        writer.abort()
+        raise
+    
+    return {
+        "storage_key": storage_key,
+        "file_size": file_size,
+        "width": probe.width,
+        "height": probe.height,
+        "image_type": probe.image_type
+    }
+
+def parse_byte_range(range_header: Optional[str], total_size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 Range 헤더 파싱 (예: 'bytes=0-1023', 'bytes=1024-', 'bytes=-500')
+    반환: (start, end) 포함 범위, 헤더가 없거나 다중 범위면 None (전체 응답), 잘못된 범위면 ValueError
+    """
+    if not range_header:
+        return None
+    
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        raise ValueError("지원하지 않는 범위 단위")
+    if ',' in spec:
+        return None
+    
+    start_text, _, end_text = spec.strip().partition('-')
+    if start_text == '':
+        # 끝에서부터 N바이트
+        suffix_length = int(end_text)
+        if suffix_length <= 0:
+            raise ValueError("잘못된 범위")
+        start = max(total_size - suffix_length, 0)
+        end = total_size - 1
+    else:
+        start = int(start_text)
+        end = min(int(end_text), total_size - 1) if end_text else total_size - 1
+    
+    if start > end or start >= total_size:
+        raise ValueError("잘못된 범위")
+    return start, end
+
 # === Health Check ===
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """엔드포인트별 응답 시간 히스토그램 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(latency_histogram.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @router.get("/health", response_model=ApiResponse)
 async def health_check(db: Session = Depends(get_database)):
     """헬스 체크"""
@@ -618,5 +1686,5 @@ async def health_check(db: Session = Depends(get_database)):
         )
         
     except Exception as e:
-        logger.error(f"❌ 헬스 체크 실패: {e}")
+        logger.error("❌ 헬스 체크 실패: %s", e)
         raise HTTPException(status_code=503, detail="Service unavailable")
\ No newline at end of file
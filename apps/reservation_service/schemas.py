@@ -39,6 +39,8 @@ class ReservationImageResponse(ReservationImageBase):
     """예약 이미지 응답 스키마"""
     id: int
     reservation_id: int
+    image_data: Optional[str] = Field(None, description="Base64 이미지 데이터 (blob 저장소 이전 전 데이터만)")
+    content_url: str = Field(..., description="이미지 다운로드 경로 (Range 요청 지원)")
     file_size: int
     width: Optional[int]
     height: Optional[int]
@@ -114,19 +116,20 @@ class ReservationBase(BaseModel):
                         raise ValueError('올바른 시간 형식이 아닙니다. (HH:MM 또는 ISO 형식)')
         return v
 
+class ReservationCreate(ReservationBase):
+    """예약 생성 스키마"""
+    user_id: int = Field(..., description="사용자 ID")
+    images: List[ReservationImageCreate] = Field(default=[], description="첨부 이미지")
+    hold_token: Optional[str] = Field(None, max_length=32, description="시간대 홀드 토큰 (POST /holds 결과, 예약 생성 시 홀드 해제)")
+
     @validator('reservation_date')
     def validate_future_date(cls, v):
-        """예약 날짜가 미래인지 검증"""
+        """예약 날짜가 미래인지 검증 (생성 시에만, 응답에는 지난 예약과 보관된 예약도 포함)"""
         from datetime import date
         if v <= date.today():
             raise ValueError('예약 날짜는 오늘 이후여야 합니다.')
         return v
 
-class ReservationCreate(ReservationBase):
-    """예약 생성 스키마"""
-    user_id: int = Field(..., description="사용자 ID")
-    images: List[ReservationImageCreate] = Field(default=[], description="첨부 이미지")
-
     @validator('images')
     def validate_image_count(cls, v):
         """이미지 개수 검증"""
@@ -145,6 +148,7 @@ class ReservationUpdate(BaseModel):
     interpreter_language: Optional[InterpreterLanguage] = None
     additional_notes: Optional[str] = None
     status: Optional[ReservationStatus] = None
+    hold_token: Optional[str] = Field(None, max_length=32, description="변경할 시간대의 홀드 토큰 (본인 홀드면 통과, 수정 시 홀드 해제)")
 
     @validator('contact_email')
     def validate_email(cls, v):
@@ -203,6 +207,106 @@ class ReservationListResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# === Hold Schemas ===
+
+class ReservationHoldCreate(BaseModel):
+    """예약 시간대 홀드 생성 스키마"""
+    user_id: int = Field(..., description="사용자 ID")
+    hospital_id: int = Field(..., description="병원 ID")
+    doctor_id: Optional[int] = Field(None, description="의사 ID (선택사항)")
+    reservation_date: date = Field(..., description="예약 날짜")
+    reservation_time: time = Field(..., description="예약 시간")
+    hold_minutes: Optional[int] = Field(None, ge=1, description="홀드 유지 시간 (분, 기본값: 서버 설정)")
+
+    @validator('reservation_date')
+    def validate_future_date(cls, v):
+        """예약 날짜가 미래인지 검증"""
+        if v <= date.today():
+            raise ValueError('예약 날짜는 오늘 이후여야 합니다.')
+        return v
+
+class ReservationHoldResponse(BaseModel):
+    """예약 시간대 홀드 응답 스키마"""
+    hold_token: str
+    user_id: int
+    hospital_id: int
+    doctor_id: Optional[int]
+    reservation_date: date
+    reservation_time: time
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# === Bulk Operation Schemas ===
+
+class BulkReservationCreate(BaseModel):
+    """예약 일괄 생성 스키마"""
+    reservations: List[ReservationCreate] = Field(..., min_length=1, max_length=100, description="생성할 예약 목록")
+    atomic: bool = Field(False, description="True면 하나라도 실패할 경우 전체를 생성하지 않음")
+
+class BulkStatusUpdate(BaseModel):
+    """예약 상태 일괄 변경 스키마"""
+    reservation_ids: List[int] = Field(..., min_length=1, max_length=500, description="변경할 예약 ID 목록")
+    status: ReservationStatus = Field(..., description="변경할 상태")
+    atomic: bool = Field(False, description="True면 하나라도 실패할 경우 전체를 변경하지 않음")
+
+class BulkItemResult(BaseModel):
+    """일괄 처리 항목별 결과"""
+    index: int = Field(..., description="요청 목록에서의 위치")
+    reservation_id: Optional[int] = None
+    success: bool
+    status_code: int = Field(..., description="항목 처리 결과 HTTP 상태 코드")
+    message: Optional[str] = None
+
+class BulkOperationResponse(BaseModel):
+    """일괄 처리 응답 스키마"""
+    success: bool = Field(..., description="전체 항목 성공 여부")
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+# === Stats Schemas ===
+
+class DailyReservationStats(BaseModel):
+    """병원별 일별 예약 집계"""
+    date: date
+    hospital_id: int
+    total: int
+    by_status: Dict[str, int]
+
+class ReservationStatsResponse(BaseModel):
+    """기간별 예약 통계 응답 스키마"""
+    date_from: date
+    date_to: date
+    hospital_id: Optional[int] = None
+    total: int
+    by_status: Dict[str, int]
+    by_interpreter_language: Dict[str, int]
+    cancellation_rate: float = Field(..., description="취소 비율 (취소 / 전체)")
+    daily: List[DailyReservationStats]
+
+# === Event Schemas ===
+
+class ReservationEventResponse(BaseModel):
+    """예약 도메인 이벤트 응답 스키마"""
+    event_id: int
+    sequence: int
+    event_type: str
+    reservation_id: int
+    hospital_id: int
+    payload: Dict[str, Any]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ReservationEventListResponse(BaseModel):
+    """예약 이벤트 목록 (after_sequence 이후)"""
+    items: List[ReservationEventResponse]
+    last_sequence: Optional[int] = Field(None, description="다음 조회 시 after_sequence로 사용")
+
 # === Available Time Schemas ===
 
 class TimeSlotResponse(BaseModel):
@@ -214,20 +318,55 @@ class TimeSlotResponse(BaseModel):
 class AvailableTimesResponse(BaseModel):
     """가능한 시간대 응답 스키마"""
     hospital_id: int
+    doctor_id: Optional[int] = Field(None, description="의사 ID (지정 시 의사 근무시간 반영)")
     date: date
     time_slots: List[TimeSlotResponse]
-    operating_hours: Optional[Dict[str, Any]] = Field(None, description="병원 운영시간")
+    operating_hours: Optional[List[Dict[str, Any]]] = Field(None, description="병원 운영시간")
+
+class DayAvailabilityResponse(BaseModel):
+    """일별 예약 가능 시간대 (비트맵 인코딩)"""
+    date: date
+    slot_start: Optional[str] = Field(None, description="첫 시간대 (HH:MM 형식), 휴무일이면 null")
+    bitmap: str = Field("", description="시간대별 예약 가능 여부 ('1'=가능, '0'=불가)")
+
+class HospitalAvailabilityResponse(BaseModel):
+    """병원별 기간 예약 가능 시간대"""
+    hospital_id: int
+    found: bool = Field(True, description="병원 운영시간 조회 성공 여부")
+    days: List[DayAvailabilityResponse] = []
+
+class AvailabilityResponse(BaseModel):
+    """다중 병원/다중 날짜 예약 가능 시간대 응답 스키마"""
+    date_from: date
+    date_to: date
+    slot_interval_minutes: int
+    hospitals: List[HospitalAvailabilityResponse]
+
+class DoctorAvailabilityResponse(BaseModel):
+    """의사별 예약 가능 시간대 (비트맵 인코딩)"""
+    doctor_id: int
+    schedule_found: bool = Field(True, description="의사 근무일정 조회 성공 여부 (실패 시 병원 운영시간만 반영)")
+    bitmap: str = Field("", description="시간대별 예약 가능 여부 ('1'=가능, '0'=불가)")
+
+class DoctorsAvailabilityResponse(BaseModel):
+    """병원 소속 의사별 예약 가능 시간대 응답 스키마"""
+    hospital_id: int
+    date: date
+    slot_start: Optional[str] = Field(None, description="첫 시간대 (HH:MM 형식), 휴무일이면 null")
+    slot_interval_minutes: int
+    doctors: List[DoctorAvailabilityResponse]
 
 # === API Response Schemas ===
 
 class PaginatedResponse(BaseModel):
     """페이지네이션 응답 스키마"""
     items: List[Any]
-    total: int
+    total: Optional[int] = Field(None, description="총 개수 (total_mode=none이면 null)")
     limit: int
     offset: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (키셋 페이지네이션)")
 
 class ApiResponse(BaseModel):
     """API 응답 스키마"""
@@ -245,6 +384,9 @@ class ReservationSearchParams(BaseModel):
     status: Optional[ReservationStatus] = None
     date_from: Optional[date] = None
     date_to: Optional[date] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
     interpreter_language: Optional[InterpreterLanguage] = None
     limit: int = Field(default=20, ge=1, le=100)
-    offset: int = Field(default=0, ge=0)
\ No newline at end of file
+    offset: int = Field(default=0, ge=0)
+    cursor: Optional[str] = None
\ No newline at end of file
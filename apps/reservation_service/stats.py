@@ -0,0 +1,170 @@
+"""
+stats.py - Reservation Daily Rollup Statistics
+병원/날짜/상태/통역 언어별 예약 수 일별 집계 (증분 유지)
+
+전체 재계산:
+    python stats.py rebuild
+"""
+
+import logging
+from collections import Counter
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import event, func, and_
+from sqlalchemy.orm import Session
+
+from models import Reservation, ArchivedReservation, ReservationDailyStat
+
+logger = logging.getLogger(__name__)
+
+# 세션에 누적된 집계 변경분 키
+PENDING_DELTAS_KEY = "reservation_stat_deltas"
+
+def _stat_key(snapshot: Optional[dict]) -> Optional[tuple]:
+    """serialize_reservation 결과에서 집계 키 (hospital_id, 날짜, 상태, 통역 언어) 추출"""
+    if not snapshot or not snapshot.get("reservation_date"):
+        return None
+    return (
+        snapshot["hospital_id"],
+        date.fromisoformat(snapshot["reservation_date"]),
+        snapshot["status"],
+        snapshot["interpreter_language"],
+    )
+
+def track_stat_change(db: Session, current: Optional[dict], previous: Optional[dict] = None):
+    """
+    예약 변경에 따른 집계 변경분을 세션에 누적
+    실제 반영은 커밋 직전에 키별로 합쳐서 한 번씩 수행된다 (같은 트랜잭션)
+    """
+    current_key = _stat_key(current)
+    previous_key = _stat_key(previous)
+    if current_key == previous_key:
+        return
+
+    deltas = db.info.setdefault(PENDING_DELTAS_KEY, Counter())
+    if previous_key:
+        deltas[previous_key] -= 1
+    if current_key:
+        deltas[current_key] += 1
+
+def _upsert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+def apply_stat_deltas(db: Session, deltas: Counter):
+    """누적된 변경분을 집계 테이블에 반영 (INSERT ... ON CONFLICT DO UPDATE)"""
+    insert = _upsert_statement(db.bind.dialect.name)
+
+    for (hospital_id, stat_date, status, language), delta in deltas.items():
+        if delta == 0:
+            continue
+
+        if insert is not None:
+            statement = insert(ReservationDailyStat).values(
+                hospital_id=hospital_id,
+                stat_date=stat_date,
+                status=status,
+                interpreter_language=language,
+                reservation_count=delta
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["hospital_id", "stat_date", "status", "interpreter_language"],
+                set_={"reservation_count": ReservationDailyStat.reservation_count + delta}
+            )
+            db.execute(statement)
+            continue
+
+        row = db.query(ReservationDailyStat).filter(
+            and_(
+                ReservationDailyStat.hospital_id == hospital_id,
+                ReservationDailyStat.stat_date == stat_date,
+                ReservationDailyStat.status == status,
+                ReservationDailyStat.interpreter_language == language
+            )
+        ).with_for_update().first()
+        if row:
+            row.reservation_count += delta
+        else:
+            db.add(ReservationDailyStat(
+                hospital_id=hospital_id,
+                stat_date=stat_date,
+                status=status,
+                interpreter_language=language,
+                reservation_count=delta
+            ))
+    db.flush()
+
+@event.listens_for(Session, "before_commit")
+def _flush_stat_deltas(session: Session):
+    deltas = session.info.pop(PENDING_DELTAS_KEY, None)
+    if deltas:
+        apply_stat_deltas(session, deltas)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_stat_deltas(session: Session, previous_transaction):
+    # SAVEPOINT 롤백은 바깥 트랜잭션의 변경분에 영향을 주지 않음
+    if not previous_transaction.nested:
+        session.info.pop(PENDING_DELTAS_KEY, None)
+
+def rebuild_daily_stats(db: Session):
+    """예약 테이블과 보관 테이블 기준으로 집계 테이블 전체 재계산 (복구용)"""
+    db.query(ReservationDailyStat).delete(synchronize_session=False)
+
+    counts = {}
+    for model in (Reservation, ArchivedReservation):
+        rows = db.query(
+            model.hospital_id,
+            model.reservation_date,
+            model.status,
+            model.interpreter_language,
+            func.count(model.reservation_id)
+        ).group_by(
+            model.hospital_id,
+            model.reservation_date,
+            model.status,
+            model.interpreter_language
+        ).all()
+        for hospital_id, stat_date, status, language, count in rows:
+            key = (hospital_id, stat_date, status, language)
+            counts[key] = counts.get(key, 0) + count
+
+    db.bulk_insert_mappings(ReservationDailyStat, [
+        {
+            "hospital_id": hospital_id,
+            "stat_date": stat_date,
+            "status": status,
+            "interpreter_language": language,
+            "reservation_count": count
+        }
+        for (hospital_id, stat_date, status, language), count in counts.items()
+    ])
+    db.commit()
+    logger.info("✅ 예약 일별 집계 재계산 완료: %s행", len(counts))
+
+def ensure_daily_stats(db: Session):
+    """집계 테이블이 비어 있고 예약이 존재하면 최초 1회 재계산"""
+    if db.query(ReservationDailyStat.id).first() is None and db.query(Reservation.reservation_id).first() is not None:
+        rebuild_daily_stats(db)
+
+if __name__ == "__main__":
+    import sys
+    from database import SessionLocal, create_tables
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("사용법: python stats.py rebuild")
+        sys.exit(1)
+
+    create_tables()
+    session = SessionLocal()
+    try:
+        rebuild_daily_stats(session)
+    finally:
+        session.close()
@@ -0,0 +1,113 @@
+"""
+test_reservation_listing.py - Reservation Service Listing Query Count Test
+예약 목록 한 페이지의 SQL 문 수가 페이지 크기와 무관하게 일정한지 검사 (N+1 회귀 방지)
+
+    cd apps/reservation_service && python -m pytest -q test_reservation_listing.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, date, time, timedelta, timezone
+
+# 서비스 모듈은 서비스 디렉터리 기준으로 import (컨테이너 실행 환경과 동일)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# database.py가 import 시점에 엔진을 만들므로 모듈 import 전에 임시 SQLite DB 지정
+_DATA_DIR = tempfile.mkdtemp(prefix="reservation-listing-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'reservations.db')}"
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import routes
+from database import engine, SessionLocal, create_tables
+from models import Reservation, ReservationImage, ArchivedReservation, ArchivedReservationImage
+
+HOSPITAL_ID = 1
+SEED_RESERVATIONS = 120
+SEED_ARCHIVED = 120
+
+# hospital-service / doctor-service는 연결 거부되는 주소로 지정 (병원명/의사명은 대체 이름으로 응답)
+routes.HOSPITAL_SERVICE_URL = "http://127.0.0.1:9"
+routes.DOCTOR_SERVICE_URL = "http://127.0.0.1:9"
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수 집계"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+def seed_reservation(model, image_model, index: int, status: str, created_at: datetime, **columns):
+    reservation = model(
+        hospital_id=HOSPITAL_ID,
+        doctor_id=index % 4 + 1,
+        user_id=index % 7 + 1,
+        symptoms="정기 검진 및 상담 요청",
+        reservation_date=date.today() + timedelta(days=index // 16 + 1),
+        reservation_time=time(9 + index % 16 // 2, 30 * (index % 2)),
+        contact_email="test@example.com",
+        contact_phone="010-1234-5678",
+        interpreter_language="영어",
+        status=status,
+        created_at=created_at - timedelta(minutes=index),
+        **columns
+    )
+    reservation.images = [
+        image_model(image_data="aW1hZ2U=", image_type="jpeg", file_size=5, image_order=order)
+        for order in range(1, index % 3 + 2)
+    ]
+    return reservation
+
+@pytest.fixture(scope="module")
+def client():
+    create_tables()
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        for index in range(SEED_RESERVATIONS):
+            db.add(seed_reservation(Reservation, ReservationImage, index, "PENDING", now))
+        # 보관 예약은 운영 예약보다 오래된 예약, 예약 ID는 운영 테이블과 겹치지 않음 (보관 작업이 원래 ID를 그대로 옮김)
+        for index in range(SEED_ARCHIVED):
+            db.add(seed_reservation(
+                ArchivedReservation, ArchivedReservationImage, index, "COMPLETED", now - timedelta(days=30),
+                reservation_id=100000 + index
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+def page_queries(client, query_counter, params: str, limit: int) -> int:
+    """목록 한 페이지 요청의 SQL 문 수"""
+    before = query_counter.count
+    response = client.get(f"/reservations?{params}&limit={limit}")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == limit
+    return query_counter.count - before
+
+# 운영/보관 병합 조회는 페이지에 포함된 테이블마다 행/이미지 개수 쿼리를 실행하므로
+# 같은 테이블 구성의 페이지끼리 비교 (offset=110: 운영 10건 + 보관 나머지)
+@pytest.mark.parametrize("params,small_limit", [
+    (f"hospital_id={HOSPITAL_ID}&status=PENDING", 1),
+    (f"hospital_id={HOSPITAL_ID}", 1),
+    (f"hospital_id={HOSPITAL_ID}&offset=110", 20),
+], ids=["active", "with_archive", "across_tables"])
+def test_page_query_count_independent_of_limit(client, query_counter, params, small_limit):
+    assert page_queries(client, query_counter, params, small_limit) == page_queries(client, query_counter, params, 100)
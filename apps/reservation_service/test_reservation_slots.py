@@ -0,0 +1,102 @@
+"""
+test_reservation_slots.py - Reservation Service Active Slot Index Test
+같은 시간대 활성 예약을 여러 연결이 동시에 커밋해도 uq_reservations_active_slot 인덱스로 한 건만 저장되는지 검사
+
+    cd apps/reservation_service && python -m pytest -q test_reservation_slots.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from datetime import date, time, timedelta
+
+# 서비스 모듈은 서비스 디렉터리 기준으로 import (컨테이너 실행 환경과 동일)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# database.py가 import 시점에 엔진을 만들므로 모듈 import 전에 임시 SQLite DB 지정
+_DATA_DIR = tempfile.mkdtemp(prefix="reservation-slots-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'reservations.db')}"
+
+import pytest
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+
+from database import engine, SessionLocal, create_tables
+from models import Reservation
+from routes import is_slot_conflict
+
+WRITERS = 8
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(connection, _):
+    # 동시 커밋이 "database is locked"로 실패하지 않고 순서대로 대기하도록 설정
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+@pytest.fixture(scope="module", autouse=True)
+def tables():
+    create_tables()
+
+def concurrent_insert(slot: dict, status: str = "PENDING") -> Counter:
+    """사전 확인 없이 같은 시간대 예약을 스레드별 연결에서 동시에 커밋하고 결과 집계"""
+    barrier = threading.Barrier(WRITERS)
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+
+    def write(user_id: int):
+        db = SessionLocal()
+        try:
+            db.add(Reservation(
+                user_id=user_id,
+                symptoms="동시 삽입 확인용 예약입니다",
+                contact_email="test@example.com",
+                contact_phone="010-1234-5678",
+                interpreter_language="영어",
+                status=status,
+                **slot
+            ))
+            barrier.wait()
+            db.commit()
+            outcome = "created"
+        except IntegrityError as e:
+            db.rollback()
+            outcome = "conflict" if is_slot_conflict(e) else "integrity_error"
+        finally:
+            db.close()
+        with lock:
+            outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=write, args=(index + 1,)) for index in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+def slot_rows(slot: dict) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.count(Reservation.reservation_id)).filter(
+            Reservation.hospital_id == slot["hospital_id"],
+            Reservation.reservation_date == slot["reservation_date"],
+            Reservation.reservation_time == slot["reservation_time"]
+        ).scalar()
+    finally:
+        db.close()
+
+def test_concurrent_active_inserts_keep_one_row():
+    slot = {"hospital_id": 901, "reservation_date": date.today() + timedelta(days=3), "reservation_time": time(11, 0)}
+    outcomes = concurrent_insert(slot)
+    assert outcomes == Counter({"created": 1, "conflict": WRITERS - 1})
+    assert slot_rows(slot) == 1
+
+def test_inactive_reservations_do_not_take_slot():
+    # 부분 인덱스: 완료/취소 예약은 같은 시간대에 여러 건 저장 가능
+    slot = {"hospital_id": 902, "reservation_date": date.today() + timedelta(days=3), "reservation_time": time(11, 0)}
+    outcomes = concurrent_insert(slot, status="CANCELLED")
+    assert outcomes == Counter({"created": WRITERS})
+    assert slot_rows(slot) == WRITERS
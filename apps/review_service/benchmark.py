@@ -0,0 +1,727 @@
+"""
+benchmark.py - Review Service List Payload Benchmark
+리뷰 목록 응답 크기/지연 시간 측정 (이미지 Base64 포함 응답과 이미지 정보만 포함한 응답 비교)
+
+- 로컬 SQLite(기본값) 또는 PostgreSQL에 이미지가 첨부된 리뷰를 시드
+- auth-service는 로컬 스텁 서버로 대체 (사용자 이름 조회 호출 수 집계)
+- 앱은 프로세스 내부(ASGI)에서 구동하여 엔진 이벤트로 요청당 쿼리 수를 측정
+- legacy: 목록에 image_data(Base64)를 포함하던 이전 응답 형식을 같은 앱에 재현하여 비교
+- 쿼리 수 회귀 검사: 목록 페이지 크기와 무관하게 요청당 SQL 문 수가 일정해야 함 (N+1 방지, 실패 시 종료 코드 1)
+- 사용자 이름 조회 검사: 캐시가 빈 목록 페이지는 auth-service 호출 1회, 캐시된 페이지는 0회여야 함
+- 대용량 목록 (--bulk-reviews N): 이미지 없는 리뷰 N건을 별도 병원들에 시드하여 첫 페이지, 깊은 OFFSET 페이지,
+  같은 위치의 커서 페이지, 키워드 필터, 총 개수 캐시 미스를 측정 (--without-indexes로 목록 인덱스 없이 비교)
+- 대용량 검색: 같은 시드 전체를 대상으로 긴 검색어(트라이그램)와 3글자 미만 한국어/일본어 검색어(바이그램) 검색 시간 측정
+  검색 요청이 실행한 목록/총 개수 쿼리의 실행 계획도 기록 (PostgreSQL: EXPLAIN ANALYZE 실행 시간, SQLite: EXPLAIN QUERY PLAN)
+
+사용법:
+    python benchmark.py [--database-url URL] [--reviews 60] [--images-per-review 2]
+                        [--image-size 1024x768] [--requests 30] [--limit 20] [--output 결과.json]
+    python benchmark.py --check-only    # 쿼리 수 회귀 검사만 실행
+    python benchmark.py --bulk-reviews 200000 [--without-indexes]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from models import API_PREFIX
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark_data/benchmark.db"
+BENCHMARK_HOSPITAL_ID = 1
+
+# 대용량 목록 시드: 절반은 BULK_HOSPITAL_ID, 나머지는 BULK_OTHER_HOSPITALS개 병원에 분산
+BULK_HOSPITAL_ID = 2
+BULK_OTHER_HOSPITALS = 100
+BULK_INSERT_CHUNK = 5000
+
+# 대용량 시드 리뷰 내용 (리뷰마다 2문장 무작위 조합, 검색어마다 일치 비율이 다르도록 구성)
+BULK_CONTENT_PHRASES = [
+    "진료가 친절하고 시설이 깨끗했습니다.",
+    "대기 시간이 길었지만 설명은 자세했습니다.",
+    "시술 후 통증 관리가 잘 되어 회복이 빨랐어요.",
+    "주차가 불편했고 예약 변경이 어려웠습니다.",
+    "英語対応のスタッフがいて安心でした。",
+    "通訳サービスが丁寧で助かりました。",
+    "Staff spoke English and the clinic was clean.",
+    "The follow-up call after the procedure was helpful.",
+]
+
+# 대용량 검색 케이스 (케이스 이름 -> 검색어), 3글자 미만 검색어는 pg_trgm 인덱스를 쓸 수 없음
+BULK_SEARCH_CASES = {
+    "search_long": "깨끗했습니다",
+    "search_short_ko": "통증",
+    "search_short_jp": "英語",
+    "search_two_terms": "통증 회복이",
+}
+
+logger = logging.getLogger("benchmark")
+
+# === Stub Services ===
+
+# 스텁 auth-service 엔드포인트별 호출 수
+AUTH_STUB_CALLS = {"profile": 0, "batch": 0}
+
+def start_auth_stub() -> str:
+    """auth-service 사용자 프로필 스텁을 별도 스레드에서 실행하고 기본 URL 반환"""
+    import uvicorn
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/profile/user/{user_id}")
+    async def profile(user_id: int):
+        AUTH_STUB_CALLS["profile"] += 1
+        return {"username": f"user{user_id}", "nickname": f"닉네임{user_id}"}
+
+    @app.post("/profile/users/batch")
+    async def profile_batch(lookup: dict):
+        AUTH_STUB_CALLS["batch"] += 1
+        return {"users": {
+            user_id: {"user_id": user_id, "username": f"user{user_id}", "nickname": f"닉네임{user_id}"}
+            for user_id in lookup["user_ids"]
+        }}
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+# === Seed Data ===
+
+def generate_photo(width: int, height: int, seed: int) -> bytes:
+    """사진과 비슷한 압축률의 JPEG 생성 (그라디언트 + 노이즈)"""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize((width, height)).rotate(rng.randint(0, 359))
+    noise = Image.effect_noise((width, height), 48)
+    image = Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+def seed_keyword_templates(SessionLocal) -> int:
+    """시드 리뷰가 사용하는 키워드 템플릿 (CARE_0 ~ CARE_9), 없는 코드만 추가"""
+    from models import ReviewKeywordTemplate
+
+    db = SessionLocal()
+    try:
+        existing = {row.keyword_code for row in db.query(ReviewKeywordTemplate.keyword_code).all()}
+        for code in range(10):
+            if f"CARE_{code}" not in existing:
+                db.add(ReviewKeywordTemplate(
+                    category="CARE", keyword_code=f"CARE_{code}", keyword_name=f"진료{code}", is_positive=True,
+                    keyword_name_en=f"Care {code}", keyword_name_jp=f"診療{code}"
+                ))
+        db.commit()
+        return db.query(ReviewKeywordTemplate).count()
+    finally:
+        db.close()
+
+def seed_reviews(SessionLocal, reviews: int, images_per_review: int, width: int, height: int, seed: int) -> int:
+    """벤치마크 병원에 리뷰가 없으면 이미지가 첨부된 리뷰 시드, 리뷰 수 반환"""
+    import hashlib
+    from models import Review, ReviewKeyword, ReviewImage
+
+    db = SessionLocal()
+    try:
+        existing = db.query(Review).filter(Review.hospital_id == BENCHMARK_HOSPITAL_ID).count()
+        if existing:
+            logger.info(f"♻️ 기존 시드 데이터 사용: 리뷰 {existing}건")
+            return existing
+
+        photos = [generate_photo(width, height, seed + index) for index in range(8)]
+        rng = random.Random(seed)
+        for index in range(reviews):
+            review = Review(
+                hospital_id=BENCHMARK_HOSPITAL_ID,
+                user_id=rng.randint(1, 50),
+                title=f"리뷰 {index}",
+                content="진료가 친절하고 시설이 깨끗했습니다. " * 3,
+                rating=round(rng.uniform(1, 5), 1),
+                is_active=True
+            )
+            review.keywords = [
+                ReviewKeyword(category="CARE", keyword_code=f"CARE_{code}", keyword_name=f"진료{code}", is_positive=True)
+                for code in rng.sample(range(10), 3)
+            ]
+            for order in range(images_per_review):
+                photo = photos[(index + order) % len(photos)]
+                review.images.append(ReviewImage(
+                    image_data=base64.b64encode(photo).decode(),
+                    content_hash=hashlib.sha256(photo).hexdigest(),
+                    image_type="jpeg",
+                    file_size=len(photo),
+                    width=width,
+                    height=height,
+                    image_order=order + 1
+                ))
+            db.add(review)
+            if index % 20 == 19:
+                db.commit()
+        db.commit()
+        logger.info(f"🌱 리뷰 {reviews}건, 이미지 {reviews * images_per_review}장 시드 완료")
+        return reviews
+    finally:
+        db.close()
+
+def seed_bulk_reviews(engine, reviews: int, seed: int) -> int:
+    """
+    대용량 목록 측정용 리뷰 시드 (이미지 없음, 리뷰당 키워드 2개, 10%는 비활성)
+    ORM 객체 대신 Core INSERT executemany로 빠르게 적재, 이미 있으면 기존 데이터 사용
+    """
+    from datetime import datetime, timedelta
+    from sqlalchemy import func, insert, select
+    from models import Review, ReviewKeyword
+
+    with engine.begin() as connection:
+        existing = connection.execute(
+            select(func.count()).select_from(Review).where(Review.hospital_id >= BULK_HOSPITAL_ID)
+        ).scalar()
+        if existing:
+            logger.info(f"♻️ 기존 대용량 시드 데이터 사용: 리뷰 {existing}건")
+            return existing
+
+        rng = random.Random(seed)
+        started = datetime(2024, 1, 1)
+        next_id = (connection.execute(select(func.max(Review.review_id))).scalar() or 0) + 1
+        for chunk_start in range(0, reviews, BULK_INSERT_CHUNK):
+            review_rows, keyword_rows = [], []
+            for index in range(chunk_start, min(reviews, chunk_start + BULK_INSERT_CHUNK)):
+                review_id = next_id + index
+                hospital_id = BULK_HOSPITAL_ID if index % 2 == 0 else BULK_HOSPITAL_ID + 1 + rng.randrange(BULK_OTHER_HOSPITALS)
+                created_at = started + timedelta(seconds=index * 60)
+                review_rows.append({
+                    "review_id": review_id,
+                    "hospital_id": hospital_id,
+                    "user_id": rng.randint(1, 5000),
+                    "doctor_id": rng.randint(1, 300),
+                    "title": f"리뷰 {index}",
+                    "content": " ".join(rng.sample(BULK_CONTENT_PHRASES, 2)),
+                    "rating": round(rng.uniform(1, 5), 1),
+                    "is_active": rng.random() >= 0.1,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                for code in rng.sample(range(10), 2):
+                    keyword_rows.append({
+                        "review_id": review_id,
+                        "category": "CARE",
+                        "keyword_code": f"CARE_{code}",
+                        "keyword_name": f"진료{code}",
+                        "is_positive": True,
+                        "created_at": created_at,
+                    })
+            connection.execute(insert(Review), review_rows)
+            connection.execute(insert(ReviewKeyword), keyword_rows)
+
+    logger.info(f"🌱 대용량 목록 리뷰 {reviews}건 시드 완료")
+    return reviews
+
+def drop_listing_indexes(engine):
+    """비교용: 목록/키워드/이미지 인덱스 삭제 (기본 키와 유니크 제약은 유지)"""
+    from models import Base
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name and index.name.startswith(("ix_reviews_", "ix_review_keywords_", "ix_review_images_")):
+                index.drop(bind=engine, checkfirst=True)
+    logger.info("🧪 목록 인덱스 삭제 후 측정")
+
+# === Legacy Response ===
+
+async def legacy_user_names(auth_service_url: str, user_ids: List[int]) -> dict:
+    """사용자마다 동기 requests.get을 호출하던 이전 이름 조회 재현 (gather해도 순차 실행됨)"""
+    import requests
+
+    async def get_user_name(user_id: int) -> str:
+        response = requests.get(f"{auth_service_url}/profile/user/{user_id}", timeout=10.0)
+        user_data = response.json()
+        return user_data.get("nickname") or user_data.get("username", f"User_{user_id}")
+
+    unique_user_ids = list(set(user_ids))
+    results = await asyncio.gather(*[get_user_name(user_id) for user_id in unique_user_ids])
+    return dict(zip(unique_user_ids, results))
+
+def add_legacy_route(app, get_database):
+    """목록에 image_data(Base64)를 포함하던 이전 응답 형식 재현 (비교 기준)"""
+    from fastapi import Depends, Query
+    from sqlalchemy import desc
+    from sqlalchemy.orm import Session, undefer
+    import users
+    from models import Review, ReviewImage
+    from schemas import PaginatedResponse
+
+    @app.get("/legacy/reviews", response_model=PaginatedResponse)
+    async def legacy_search_reviews(
+        hospital_id: int = Query(...),
+        limit: int = Query(20),
+        offset: int = Query(0),
+        db: Session = Depends(get_database)
+    ):
+        query = db.query(Review).filter(Review.is_active == True, Review.hospital_id == hospital_id)
+        total = query.count()
+        reviews = query.order_by(desc(Review.created_at)).offset(offset).limit(limit).all()
+        user_names = await legacy_user_names(users.AUTH_SERVICE_URL, [review.user_id for review in reviews])
+        items = []
+        for review in reviews:
+            images = [
+                {
+                    "id": image.id,
+                    "image_data": image.image_data,
+                    "image_type": image.image_type,
+                    "original_filename": image.original_filename,
+                    "file_size": image.file_size,
+                    "width": image.width,
+                    "height": image.height,
+                    "image_order": image.image_order,
+                    "alt_text": image.alt_text,
+                    "created_at": image.created_at
+                }
+                for image in db.query(ReviewImage).options(undefer(ReviewImage.image_data)).filter(
+                    ReviewImage.review_id == review.review_id
+                ).all()
+            ]
+            items.append({
+                "review_id": review.review_id,
+                "hospital_id": review.hospital_id,
+                "user_id": review.user_id,
+                "user_name": user_names.get(review.user_id),
+                "doctor_id": review.doctor_id,
+                "doctor_name": review.doctor_name,
+                "content": review.content,
+                "rating": review.rating,
+                "created_at": review.created_at,
+                "keyword_count": len(review.keywords),
+                "images": images
+            })
+        return PaginatedResponse(
+            items=items, total=total, limit=limit, offset=offset,
+            has_next=offset + limit < total, has_prev=offset > 0
+        )
+
+# === Measurement ===
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수 집계"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def measure(
+    client, path: str, requests: int, query_counter: QueryCounter,
+    headers: Optional[dict] = None, before_each=None
+) -> dict:
+    """같은 요청을 순차 반복하여 응답 크기, 지연 시간, 요청당 쿼리 수 측정"""
+    latencies = []
+    sizes = []
+    statuses = set()
+    queries_before = query_counter.count
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        sizes.append(len(response.content))
+        statuses.add(response.status_code)
+    latencies.sort()
+    return {
+        "requests": requests,
+        "status_codes": sorted(statuses),
+        "response_bytes": max(sizes) if sizes else 0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+        },
+        "db_queries_per_request": round((query_counter.count - queries_before) / requests, 1) if requests else None,
+    }
+
+async def check_page_queries(client, query_counter: QueryCounter, page_sizes=(1, 20, 100)) -> dict:
+    """목록 페이지 크기별 요청당 SQL 문 수 (필터 조합별로 페이지 크기와 무관하게 같아야 함, 총 개수 캐시 미스 기준)"""
+    from pagination import review_count_cache
+
+    cases = {
+        "hospital": f"hospital_id={BENCHMARK_HOSPITAL_ID}",
+        "keyword": f"hospital_id={BENCHMARK_HOSPITAL_ID}&keyword_category=CARE",
+    }
+    per_case = {}
+    constant = True
+    for name, params in cases.items():
+        counts = {}
+        for limit in page_sizes:
+            review_count_cache.clear()
+            before = query_counter.count
+            response = await client.get(f"{API_PREFIX}/reviews?{params}&limit={limit}")
+            response.raise_for_status()
+            counts[limit] = query_counter.count - before
+        per_case[name] = counts
+        constant = constant and len(set(counts.values())) == 1
+    return {"queries_per_page": per_case, "constant": constant}
+
+async def check_user_lookups(client, list_query: str) -> dict:
+    """목록 한 페이지의 auth-service 호출 수 (캐시가 비었을 때 1회, 캐시된 뒤 0회)"""
+    from users import get_user_directory
+
+    get_user_directory().cache.clear()
+    calls = {}
+    for name in ("cold", "warm"):
+        before = sum(AUTH_STUB_CALLS.values())
+        response = await client.get(f"{API_PREFIX}/reviews{list_query}")
+        response.raise_for_status()
+        calls[name] = sum(AUTH_STUB_CALLS.values()) - before
+    return {"auth_calls_per_page": calls, "passed": calls == {"cold": 1, "warm": 0}}
+
+async def check_keyword_bulk_sync(client, query_counter: QueryCounter, templates: int = 2000) -> dict:
+    """
+    키워드 템플릿 일괄 생성 -> 같은 요청 재전송 -> 번역 업서트
+    요청당 쿼리 수는 템플릿 1000개 단위로만 늘어야 한다 (IN 조회 청크 + INSERT RETURNING 배치 + UPDATE)
+    """
+    def payload(translation: str, update_translations: bool = False) -> dict:
+        return {
+            "keywords": [
+                {
+                    "category": "SERVICE", "keyword_code": f"SYNC_{code}", "keyword_name": f"동기화{code}",
+                    "is_positive": code % 2 == 0, "keyword_name_en": f"Sync {code} {translation}"
+                }
+                for code in range(templates)
+            ],
+            "update_translations": update_translations,
+        }
+
+    steps = {}
+    for name, body in (("create", payload("v1")), ("repeat", payload("v1")), ("upsert", payload("v2", True))):
+        queries_before = query_counter.count
+        started = time.perf_counter()
+        response = await client.post(f"{API_PREFIX}/keyword-templates/bulk", json=body)
+        elapsed = (time.perf_counter() - started) * 1000
+        response.raise_for_status()
+        steps[name] = {
+            **response.json()["data"],
+            "ms": round(elapsed, 1),
+            "queries": query_counter.count - queries_before,
+        }
+
+    expected = {
+        "create": (templates, 0, 0),
+        "repeat": (0, 0, templates),
+        "upsert": (0, templates, 0),
+    }
+    passed = all(
+        (steps[name]["created"], steps[name]["updated"], steps[name]["skipped"]) == counts
+        for name, counts in expected.items()
+    )
+    return {"templates": templates, "steps": steps, "passed": passed}
+
+async def measure_bulk_listing(
+    client, query_counter: QueryCounter, SessionLocal, requests: int, limit: int, with_indexes: bool = True
+) -> dict:
+    """
+    대용량 병원 목록: 첫 페이지 / 깊은 OFFSET / 같은 위치의 커서 / 키워드 필터 / 총 개수 캐시 미스
+    인덱스가 없으면 키워드 EXISTS가 리뷰마다 키워드 테이블 전체를 읽으므로(리뷰 수 x 키워드 수) 키워드 필터는 생략
+    """
+    from sqlalchemy import desc
+    from models import Review
+    from pagination import encode_cursor, review_count_cache
+
+    db = SessionLocal()
+    try:
+        active = db.query(Review).filter(Review.hospital_id == BULK_HOSPITAL_ID, Review.is_active == True)
+        deep_offset = active.count() // 2
+        anchor = active.order_by(desc(Review.created_at), desc(Review.review_id)).offset(deep_offset - 1).first()
+        cursor = encode_cursor(anchor)
+    finally:
+        db.close()
+
+    base = f"{API_PREFIX}/reviews?hospital_id={BULK_HOSPITAL_ID}&limit={limit}"
+    cases = {
+        "bulk_first_page": await measure(client, base, requests, query_counter),
+        f"bulk_offset_{deep_offset}": await measure(client, f"{base}&offset={deep_offset}", requests, query_counter),
+        "bulk_cursor_same_page": await measure(client, f"{base}&cursor={cursor}", requests, query_counter),
+        "bulk_first_page_count": await measure(
+            client, base, requests, query_counter, before_each=review_count_cache.clear
+        ),
+    }
+    if with_indexes:
+        cases["bulk_keyword"] = await measure(client, f"{base}&keyword_category=CARE&keyword_code=CARE_3", requests, query_counter)
+    return cases
+
+async def measure_bulk_search(client, query_counter: QueryCounter, requests: int, limit: int) -> dict:
+    """대용량 시드 전체 검색 (병원 필터 없음): 긴 검색어 / 3글자 미만 한국어, 일본어 검색어 / 검색어 2개"""
+    from urllib.parse import quote
+
+    return {
+        name: await measure(client, f"{API_PREFIX}/reviews?q={quote(q)}&limit={limit}", requests, query_counter)
+        for name, q in BULK_SEARCH_CASES.items()
+    }
+
+async def explain_bulk_search(client, engine, limit: int) -> dict:
+    """
+    검색 케이스별로 요청 한 번이 실행한 목록 쿼리와 총 개수 쿼리를 캡처하여 실행 계획 기록
+    PostgreSQL은 EXPLAIN (ANALYZE, BUFFERS)로 실제 실행 시간을, SQLite는 EXPLAIN QUERY PLAN을 남긴다
+    """
+    from urllib.parse import quote
+    from sqlalchemy import event
+    from pagination import review_count_cache
+
+    postgresql = engine.dialect.name == "postgresql"
+    plans = {}
+    for name, q in BULK_SEARCH_CASES.items():
+        captured = []
+
+        def capture(connection, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        review_count_cache.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = await client.get(f"{API_PREFIX}/reviews?q={quote(q)}&limit={limit}")
+            response.raise_for_status()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        statements = {
+            "count": next((item for item in captured if "count(" in item[0].lower()), None),
+            "page": next((item for item in captured if item[0].lstrip().startswith("SELECT reviews.")), None),
+        }
+        plans[name] = {}
+        for label, captured_statement in statements.items():
+            if captured_statement is None:
+                continue
+            statement, parameters = captured_statement
+            raw = engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                if postgresql:
+                    cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+                    lines = [row[0] for row in cursor.fetchall()]
+                    execution = next((line for line in lines if line.startswith("Execution Time")), "")
+                    plans[name][label] = {
+                        "execution_ms": float(execution.split(":")[1].split()[0]) if execution else None,
+                        "plan": lines,
+                    }
+                else:
+                    cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+                    plans[name][label] = {"execution_ms": None, "plan": [row[-1] for row in cursor.fetchall()]}
+                cursor.close()
+            finally:
+                raw.close()
+    return plans
+
+def search_index_status(engine) -> Optional[dict]:
+    """PostgreSQL 검색 인덱스 존재 여부 (트라이그램: pg_trgm, 바이그램: pg_bigm), SQLite는 None"""
+    if engine.dialect.name != "postgresql":
+        return None
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        names = {row[0] for row in connection.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'reviews' AND indexname LIKE 'ix_reviews_%'"
+        ))}
+    return {
+        "trigram": "ix_reviews_content_trgm" in names,
+        "bigram": "ix_reviews_content_bigm" in names,
+    }
+
+def print_report(results: dict):
+    config = results["config"]
+    bulk = f", 대용량 {config['bulk_reviews']}건{'' if config['indexes'] else ' 인덱스 없음'}" if config["bulk_reviews"] else ""
+    print(f"\n📊 Review Service 목록 응답 벤치마크 ({results['database']}, 리뷰 {config['reviews']}건{bulk}, limit {config['limit']})")
+    header = f"{'case':<22}{'bytes':>14}{'p50 ms':>10}{'p95 ms':>10}{'q/req':>8}  status"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results["cases"].items():
+        print(
+            f"{name:<22}{stats['response_bytes']:>14,}{stats['latency_ms']['p50']:>10.1f}"
+            f"{stats['latency_ms']['p95']:>10.1f}{stats['db_queries_per_request']:>8}  {stats['status_codes']}"
+        )
+    legacy, current = results["cases"].get("legacy_list"), results["cases"].get("list")
+    if legacy and current and current["response_bytes"]:
+        print(
+            f"\n목록 응답 크기 {legacy['response_bytes'] / current['response_bytes']:.0f}배 감소, "
+            f"p50 {legacy['latency_ms']['p50']:.1f}ms → {current['latency_ms']['p50']:.1f}ms"
+        )
+    search_indexes = config.get("search_indexes")
+    if search_indexes and config["bulk_reviews"]:
+        print(f"검색 인덱스: 트라이그램 {'있음' if search_indexes['trigram'] else '없음'}, "
+              f"바이그램(pg_bigm) {'있음' if search_indexes['bigram'] else '없음 (3글자 미만 검색어는 순차 검색)'}")
+    for name, plans in results.get("search_plans", {}).items():
+        summary = []
+        for label, plan in plans.items():
+            if plan["execution_ms"] is not None:
+                summary.append(f"{label} {plan['execution_ms']:.1f}ms")
+            else:
+                summary.append(f"{label} [{'; '.join(plan['plan'])}]")
+        print(f"검색 실행 계획 {name}: {', '.join(summary)}")
+
+    page_queries = results["checks"].get("page_queries")
+    if page_queries:
+        mark = "✔" if page_queries["constant"] else "❌"
+        print(f"{mark} 페이지 크기별 쿼리 수: {page_queries['queries_per_page']}")
+    user_lookups = results["checks"].get("user_lookups")
+    if user_lookups:
+        mark = "✔" if user_lookups["passed"] else "❌"
+        print(f"{mark} 페이지당 auth-service 호출 수: {user_lookups['auth_calls_per_page']}")
+    keyword_bulk = results["checks"].get("keyword_bulk")
+    if keyword_bulk:
+        mark = "✔" if keyword_bulk["passed"] else "❌"
+        steps = ", ".join(
+            f"{name} {step['ms']:.0f}ms/{step['queries']}q" for name, step in keyword_bulk["steps"].items()
+        )
+        print(f"{mark} 키워드 템플릿 {keyword_bulk['templates']}개 일괄 동기화: {steps}")
+
+# === Main ===
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Review Service 목록 응답 벤치마크")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="벤치마크 DB URL (기본: 로컬 SQLite 파일)")
+    parser.add_argument("--reviews", type=int, default=60, help="시드 리뷰 수")
+    parser.add_argument("--images-per-review", type=int, default=2, help="리뷰당 이미지 수")
+    parser.add_argument("--image-size", default="1024x768", help="시드 이미지 크기 (WxH)")
+    parser.add_argument("--requests", type=int, default=30, help="케이스별 요청 수")
+    parser.add_argument("--limit", type=int, default=20, help="목록 페이지 크기")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--check-only", action="store_true", help="쿼리 수 회귀 검사만 실행")
+    parser.add_argument("--bulk-reviews", type=int, default=0, help="대용량 목록 측정용 추가 리뷰 수 (0이면 생략)")
+    parser.add_argument("--without-indexes", action="store_true", help="목록 인덱스를 삭제하고 측정 (비교 기준)")
+    return parser.parse_args(argv)
+
+async def run(args) -> dict:
+    # 앱 모듈은 DATABASE_URL을 import 시점에 읽으므로 환경 변수 설정 후 import
+    os.environ["DATABASE_URL"] = args.database_url
+    if args.database_url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database_url[len("sqlite:///"):])), exist_ok=True)
+
+    import httpx
+    from fastapi import FastAPI
+    import routes
+    import users
+    from database import engine, SessionLocal, create_tables, get_database
+
+    width, height = (int(value) for value in args.image_size.lower().split("x"))
+    create_tables()
+    seed_keyword_templates(SessionLocal)
+    seeded = seed_reviews(SessionLocal, args.reviews, args.images_per_review, width, height, args.seed)
+    bulk_seeded = seed_bulk_reviews(engine, args.bulk_reviews, args.seed) if args.bulk_reviews else 0
+    if args.without_indexes:
+        drop_listing_indexes(engine)
+
+    users.AUTH_SERVICE_URL = start_auth_stub()
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix=API_PREFIX)
+    add_legacy_route(app, get_database)
+    query_counter = QueryCounter(engine)
+
+    results = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "database": engine.dialect.name,
+        "config": {
+            "reviews": seeded,
+            "images_per_review": args.images_per_review,
+            "image_size": args.image_size,
+            "requests": args.requests,
+            "limit": args.limit,
+            "bulk_reviews": bulk_seeded,
+            "indexes": not args.without_indexes,
+            "search_indexes": search_index_status(engine),
+        },
+        "cases": {},
+        "checks": {},
+    }
+
+    list_query = f"?hospital_id={BENCHMARK_HOSPITAL_ID}&limit={args.limit}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120.0) as client:
+        # 워밍업 (사용자 이름 조회 연결, SQLite 페이지 캐시)
+        await client.get(f"{API_PREFIX}/reviews{list_query}")
+        
+        results["checks"]["page_queries"] = await check_page_queries(client, query_counter)
+        results["checks"]["user_lookups"] = await check_user_lookups(client, list_query)
+        results["checks"]["keyword_bulk"] = await check_keyword_bulk_sync(client, query_counter)
+        if args.check_only:
+            return results
+        
+        await client.get(f"/legacy/reviews{list_query}")
+
+        results["cases"]["legacy_list"] = await measure(client, f"/legacy/reviews{list_query}", args.requests, query_counter)
+        results["cases"]["list"] = await measure(client, f"{API_PREFIX}/reviews{list_query}", args.requests, query_counter)
+        results["cases"]["list_cold_names"] = await measure(
+            client, f"{API_PREFIX}/reviews{list_query}", args.requests, query_counter,
+            before_each=users.get_user_directory().cache.clear
+        )
+        if bulk_seeded:
+            results["cases"].update(await measure_bulk_listing(
+                client, query_counter, SessionLocal, args.requests, args.limit, with_indexes=not args.without_indexes
+            ))
+            results["cases"].update(await measure_bulk_search(client, query_counter, args.requests, args.limit))
+            results["search_plans"] = await explain_bulk_search(client, engine, args.limit)
+
+        page = (await client.get(f"{API_PREFIX}/reviews{list_query}")).json()
+        image = next((image for item in page["items"] for image in item["images"]), None)
+        if image:
+            results["cases"]["image"] = await measure(client, image["content_url"], args.requests, query_counter)
+            etag = (await client.get(image["content_url"])).headers.get("etag")
+            results["cases"]["image_not_modified"] = await measure(
+                client, image["content_url"], args.requests, query_counter, headers={"If-None-Match": etag}
+            )
+
+        # 키워드 카탈로그: 캐시 미스(매 요청 무효화) / 캐시 / 304
+        from catalogue import keyword_catalogue
+
+        results["cases"]["keyword_templates_miss"] = await measure(
+            client, f"{API_PREFIX}/keyword-templates", args.requests, query_counter, before_each=keyword_catalogue.invalidate
+        )
+        results["cases"]["keyword_templates"] = await measure(client, f"{API_PREFIX}/keyword-templates", args.requests, query_counter)
+        etag = (await client.get(f"{API_PREFIX}/keyword-templates")).headers.get("etag")
+        results["cases"]["keyword_templates_304"] = await measure(
+            client, f"{API_PREFIX}/keyword-templates", args.requests, query_counter, headers={"If-None-Match": etag}
+        )
+
+    await users.close_user_directory()
+    return results
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+    args = parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    print_report(results)
+    passed = all(check.get("constant", True) and check.get("passed", True) for check in results["checks"].values())
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+catalogue.py - Review Keyword Catalogue
+리뷰 키워드 템플릿(마스터 데이터) 프로세스 내 캐시
+
+- 템플릿 전체를 한 번의 쿼리로 읽어 보관하고, 목록 응답과 리뷰 키워드 검증은 캐시에서 처리한다
+- 템플릿 생성/수정/일괄 생성 후 invalidate()로 이 프로세스의 캐시를 비우고, 다른 인스턴스는 TTL이 지나면 다시 읽는다
+- 캐시에 없는 코드도 TTL 또는 invalidate()까지 "없음"으로 취급하며, 요청마다 카탈로그를 다시 읽지 않는다
+  (다른 인스턴스에서 방금 추가된 템플릿은 최대 TTL 동안 등록되지 않은 코드로 보인다)
+- 리뷰 키워드 검증은 기본적으로 경고만 남기고 요청 값을 그대로 저장한다
+  KEYWORD_STRICT_VALIDATION=true이면 등록되지 않은 코드를 거부(422)하고 이름/긍정 여부를 템플릿 값으로 저장한다
+- 카탈로그 버전은 템플릿 내용의 해시이므로 인스턴스가 달라도 같은 내용이면 같은 ETag가 나온다
+- 일괄 생성/번역 동기화는 keyword_code IN 조회 한 번과 일괄 INSERT(ON CONFLICT DO NOTHING)/UPDATE로 처리한다
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from database import dialect_insert
+from models import ReviewKeywordTemplate, KST
+from schemas import ReviewKeywordTemplateResponse
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+KEYWORD_CATALOGUE_TTL = float(os.getenv("KEYWORD_CATALOGUE_TTL", "60"))
+KEYWORD_STRICT_VALIDATION = os.getenv("KEYWORD_STRICT_VALIDATION", "false").lower() == "true"
+
+# 일괄 생성 시 keyword_code IN 조회 한 번에 넣는 최대 코드 수 (SQLite 바인드 변수 제한)
+KEYWORD_BULK_LOOKUP_CHUNK = 1000
+
+# 업서트 모드에서 기존 템플릿에 반영하는 번역 필드
+KEYWORD_TRANSLATION_FIELDS = ("keyword_name_en", "keyword_name_jp")
+
+class KeywordCatalogue:
+    """키워드 템플릿 카탈로그 캐시 (필터 조합별 직렬화된 응답과 ETag 포함)"""
+
+    def __init__(self, ttl: float = KEYWORD_CATALOGUE_TTL):
+        self.ttl = ttl
+        self.version: Optional[str] = None
+        self._templates: List[dict] = []
+        self._by_code: Dict[str, dict] = {}
+        self._responses: Dict[tuple, Tuple[bytes, str]] = {}
+        self._expires_at = 0.0
+
+    def _ensure_loaded(self, db: Session):
+        if self.version is not None and time.monotonic() < self._expires_at:
+            return
+
+        rows = db.query(ReviewKeywordTemplate).order_by(
+            ReviewKeywordTemplate.category,
+            ReviewKeywordTemplate.keyword_code
+        ).all()
+        templates = [ReviewKeywordTemplateResponse.model_validate(row).model_dump(mode="json") for row in rows]
+        serialized = json.dumps(templates, ensure_ascii=False, sort_keys=True).encode()
+
+        self._templates = templates
+        self._by_code = {template["keyword_code"]: template for template in templates}
+        self._responses = {}
+        self.version = hashlib.sha256(serialized).hexdigest()[:16]
+        self._expires_at = time.monotonic() + self.ttl
+        logger.info(f"🏷️ 키워드 카탈로그 로딩: 템플릿 {len(templates)}개 (버전 {self.version})")
+
+    def get_response(
+        self,
+        db: Session,
+        category: Optional[str] = None,
+        is_positive: Optional[bool] = None,
+        is_active: bool = True
+    ) -> Tuple[bytes, str]:
+        """필터 조합의 JSON 응답 본문과 ETag (본문은 카탈로그 버전마다 한 번만 직렬화)"""
+        self._ensure_loaded(db)
+        key = (category, is_positive, is_active)
+        cached = self._responses.get(key)
+        if cached is not None:
+            return cached
+
+        templates = [
+            template for template in self._templates
+            if template["is_active"] == is_active
+            and (category is None or template["category"] == category)
+            and (is_positive is None or template["is_positive"] == is_positive)
+        ]
+        body = json.dumps(templates, ensure_ascii=False).encode()
+        filter_tag = hashlib.sha256(repr(key).encode()).hexdigest()[:8]
+        etag = f'"kw-{self.version}-{filter_tag}"'
+        self._responses[key] = (body, etag)
+        return body, etag
+
+    def get_template(self, db: Session, keyword_code: str) -> Optional[dict]:
+        """
+        키워드 코드로 템플릿 조회 (없으면 None)
+        카탈로그 전체를 캐시하므로 없는 코드도 다시 읽을 때까지(TTL, invalidate) 쿼리 없이 None을 반환한다
+        """
+        self._ensure_loaded(db)
+        return self._by_code.get(keyword_code)
+
+    def invalidate(self):
+        self.version = None
+        self._responses = {}
+
+# 프로세스 전역 키워드 카탈로그
+keyword_catalogue = KeywordCatalogue()
+
+def validate_review_keywords(db: Session, keywords: list, strict: bool = KEYWORD_STRICT_VALIDATION) -> List[dict]:
+    """
+    리뷰 키워드를 카탈로그로 검증하여 저장할 값 목록 반환
+    - strict: 등록되지 않았거나 비활성/카테고리 불일치면 ValueError, 키워드 이름과 긍정/부정 여부는 템플릿 값 사용
+    - 기본: 카탈로그와 맞지 않는 키워드는 경고만 남기고 요청 값을 그대로 사용 (기존 클라이언트 호환)
+    """
+    validated = []
+    for keyword in keywords:
+        category = getattr(keyword.category, "value", keyword.category)
+        template = keyword_catalogue.get_template(db, keyword.keyword_code)
+        if template is None or not template["is_active"]:
+            error = f"등록되지 않은 키워드 코드입니다: {keyword.keyword_code}"
+        elif template["category"] != category:
+            error = f"키워드 카테고리가 일치하지 않습니다: {keyword.keyword_code} ({category} != {template['category']})"
+        else:
+            error = None
+
+        if not strict:
+            if error:
+                logger.warning(f"⚠️ {error}")
+            validated.append({
+                "category": category,
+                "keyword_code": keyword.keyword_code,
+                "keyword_name": keyword.keyword_name,
+                "is_positive": keyword.is_positive,
+            })
+            continue
+
+        if error:
+            raise ValueError(error)
+        validated.append({
+            "category": template["category"],
+            "keyword_code": template["keyword_code"],
+            "keyword_name": template["keyword_name"],
+            "is_positive": template["is_positive"],
+        })
+    return validated
+
+def bulk_write_keyword_templates(db: Session, templates: list, update_translations: bool = False) -> Dict[str, int]:
+    """
+    키워드 템플릿 일괄 생성 (커밋은 호출자)
+    - 요청 코드의 기존 템플릿을 keyword_code IN 조회로 한 번에 읽고, 새 코드는 일괄 INSERT로 추가한다
+      동시에 같은 코드가 생성되어도 ON CONFLICT DO NOTHING으로 유니크 제약 오류 없이 건너뛴다
+      생성 개수는 실제로 INSERT된 행(RETURNING keyword_code, 미지원 시 rowcount) 기준이며 충돌한 행은 건너뜀으로 센다
+    - update_translations: 기존 템플릿의 번역(keyword_name_en/jp) 중 요청에 포함되고 값이 다른 것만 일괄 UPDATE
+    - 요청 안에서 코드가 중복되면 마지막 항목을 사용하고 나머지는 건너뜀으로 센다
+    반환: {"created", "updated", "skipped"} 개수
+    """
+    by_code = {}
+    for template in templates:
+        by_code[template.keyword_code] = template
+    skipped = len(templates) - len(by_code)
+
+    codes = list(by_code)
+    existing = {}
+    for start in range(0, len(codes), KEYWORD_BULK_LOOKUP_CHUNK):
+        rows = db.query(
+            ReviewKeywordTemplate.id,
+            ReviewKeywordTemplate.keyword_code,
+            ReviewKeywordTemplate.keyword_name_en,
+            ReviewKeywordTemplate.keyword_name_jp
+        ).filter(ReviewKeywordTemplate.keyword_code.in_(codes[start:start + KEYWORD_BULK_LOOKUP_CHUNK])).all()
+        existing.update({row.keyword_code: row for row in rows})
+
+    new_rows = []
+    updates = []
+    now = datetime.now(KST)
+    for code, template in by_code.items():
+        row = existing.get(code)
+        if row is None:
+            values = template.dict()
+            values["category"] = getattr(values["category"], "value", values["category"])
+            new_rows.append(values)
+            continue
+
+        changes = {}
+        if update_translations:
+            requested = template.dict(exclude_unset=True)
+            changes = {
+                field: requested[field] for field in KEYWORD_TRANSLATION_FIELDS
+                if field in requested and requested[field] != getattr(row, field)
+            }
+        if changes:
+            updates.append({"id": row.id, "updated_at": now, **changes})
+        else:
+            skipped += 1
+
+    created = 0
+    if new_rows:
+        insert_ignore = dialect_insert(db.bind.dialect.name)
+        if insert_ignore is None:
+            db.execute(insert(ReviewKeywordTemplate), new_rows)
+            created = len(new_rows)
+        else:
+            statement = insert_ignore(ReviewKeywordTemplate).on_conflict_do_nothing(index_elements=["keyword_code"])
+            if db.bind.dialect.insert_executemany_returning:
+                created = len(db.execute(statement.returning(ReviewKeywordTemplate.keyword_code), new_rows).all())
+            else:
+                created = db.execute(statement, new_rows).rowcount
+        skipped += len(new_rows) - created
+    if updates:
+        # 기본 키 기준 ORM 일괄 UPDATE (executemany 한 번)
+        db.execute(update(ReviewKeywordTemplate), updates)
+
+    return {"created": created, "updated": len(updates), "skipped": skipped}
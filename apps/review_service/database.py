@@ -4,7 +4,7 @@ database.py - Review Service Database Connection
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from models import Base
@@ -16,12 +16,15 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 # 환경변수 디버깅
-if DATABASE_URL:
+if DATABASE_URL and '@' in DATABASE_URL:
     # DATABASE_URL에서 비밀번호 마스킹해서 로그 출력
     masked_url = DATABASE_URL.split('@')[0].split(':')[:-1]
     masked_url.append('****@')
     masked_url.append(DATABASE_URL.split('@')[1])
     logger.info(f"🔗 Review Service DB 연결: {''.join(masked_url)}")
+elif DATABASE_URL:
+    # 인증 정보가 없는 URL (로컬 SQLite 벤치마크 등)
+    logger.info(f"🔗 Review Service DB 연결: {DATABASE_URL}")
 else:
     logger.error("❌ DATABASE_URL 환경변수가 설정되지 않았습니다.")
 
@@ -53,6 +56,41 @@ def get_database():
     finally:
         db.close()
 
+# 기존 테이블에 적용할 스키마 변경 (PostgreSQL, 멱등 DDL)
+SCHEMA_MIGRATIONS = [
+    # 리뷰 통계 평점 합계 (기존 행은 다음 재계산 시 채워짐)
+    "ALTER TABLE review_stats ADD COLUMN IF NOT EXISTS rating_sum DOUBLE PRECISION",
+    
+    # 리뷰 이미지 ETag (기존 행은 첫 다운로드 시 채워짐)
+    "ALTER TABLE review_images ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+]
+
+# 리뷰 자유 텍스트 검색용 트라이그램 인덱스 (PostgreSQL, search.py)
+# pg_trgm 확장 생성 권한이 없으면 검색은 인덱스 없이 동작하므로 실패해도 시작을 막지 않는다
+SEARCH_MIGRATIONS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_title_trgm ON reviews USING gin (title gin_trgm_ops) WHERE is_active = true",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_content_trgm ON reviews USING gin (content gin_trgm_ops) WHERE is_active = true",
+]
+
+# 3글자 미만 검색어용 바이그램 인덱스 (pg_bigm, search.py의 lower(컬럼) LIKE 조건과 같은 식)
+# pg_bigm은 별도 설치가 필요한 확장이므로 없으면 짧은 검색어만 인덱스 없이 동작한다
+SHORT_TERM_SEARCH_MIGRATIONS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_bigm",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_title_bigm ON reviews USING gin (lower(title) gin_bigm_ops) WHERE is_active = true",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_content_bigm ON reviews USING gin (lower(content) gin_bigm_ops) WHERE is_active = true",
+]
+
+def dialect_insert(dialect_name: str):
+    """ON CONFLICT(on_conflict_do_nothing/do_update)를 지원하는 방언별 insert (PostgreSQL/SQLite, 그 외 None)"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
 def create_tables():
     """
     데이터베이스 테이블 생성
@@ -61,11 +99,45 @@ def create_tables():
     try:
         logger.info("🏗️ Review Service 데이터베이스 테이블 생성 중...")
         Base.metadata.create_all(bind=engine)
+        apply_schema_migrations()
+        create_missing_indexes()
         logger.info("✅ Review Service 데이터베이스 테이블 생성 완료!")
     except Exception as e:
         logger.error(f"❌ 테이블 생성 실패: {e}")
         raise
 
+def apply_schema_migrations():
+    """기존 테이블에 컬럼 추가 등 스키마 변경 적용 (create_all은 기존 테이블을 변경하지 않음)"""
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as connection:
+        for statement in SCHEMA_MIGRATIONS:
+            connection.execute(text(statement))
+    
+    try:
+        with engine.begin() as connection:
+            for statement in SEARCH_MIGRATIONS:
+                connection.execute(text(statement))
+    except Exception as e:
+        logger.warning(f"⚠️ 리뷰 검색 인덱스 생성 실패 (인덱스 없이 검색): {e}")
+    
+    try:
+        with engine.begin() as connection:
+            for statement in SHORT_TERM_SEARCH_MIGRATIONS:
+                connection.execute(text(statement))
+    except Exception as e:
+        logger.warning(f"⚠️ 짧은 검색어 인덱스 생성 실패 (pg_bigm 미설치 시 3글자 미만 검색어는 인덱스 없이 검색): {e}")
+
+def create_missing_indexes():
+    """
+    모델에 정의된 인덱스 중 없는 인덱스 생성 (create_all은 이미 있는 테이블에 인덱스를 추가하지 않음)
+    대용량 테이블에서는 생성 중 쓰기가 잠기므로 배포 전에 CREATE INDEX CONCURRENTLY로 미리 만들어 두면 건너뛴다
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 def check_database_connection():
     """
     데이터베이스 연결 상태 확인
@@ -0,0 +1,239 @@
+"""
+images.py - Review Image Variants
+리뷰 이미지 썸네일/너비별 변형 생성 및 디스크 캐시
+
+- 변형 생성(PIL 디코딩/리사이즈/인코딩)은 스레드 또는 프로세스 풀에서 실행하여 이벤트 루프를 막지 않는다
+- 변형은 원본 내용 해시(content_hash) 기준으로 캐시되므로 같은 이미지는 리뷰가 달라도 한 번만 생성된다
+- 디스크 캐시는 전체 크기 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+IMAGE_CACHE_DIR = os.getenv("REVIEW_IMAGE_CACHE_DIR", "./image_cache")
+IMAGE_CACHE_MAX_BYTES = int(float(os.getenv("REVIEW_IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+IMAGE_WORKERS = int(os.getenv("REVIEW_IMAGE_WORKERS", "2"))
+IMAGE_EXECUTOR = os.getenv("REVIEW_IMAGE_EXECUTOR", "thread")  # thread | process
+
+# 변형 이름 -> 최대 (너비, 높이), 비율 유지 축소 (원본보다 크게 확대하지 않음)
+VARIANTS: Dict[str, Tuple[int, int]] = {
+    "thumbnail": (320, 320),
+    "w640": (640, 10000),
+    "w1280": (1280, 10000),
+}
+
+# 출력 형식 -> (PIL 형식, Content-Type, 저장 옵션)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Accept 헤더에 WebP가 있으면 webp, 아니면 jpeg"""
+    return "webp" if accept and "image/webp" in accept else "jpeg"
+
+def render_variant(content: bytes, variant: str, output_format: str) -> bytes:
+    """
+    원본 이미지에서 변형 생성 (프로세스 풀에서도 실행되도록 모듈 수준 순수 함수)
+    EXIF 회전을 적용하고 메타데이터는 제거
+    """
+    max_size = VARIANTS[variant]
+    pil_format, _, save_options = VARIANT_FORMATS[output_format]
+
+    with Image.open(io.BytesIO(content)) as source:
+        # JPEG는 디코딩 단계에서 축소하여 큰 원본의 메모리/시간 절약
+        source.draft("RGB", max_size)
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail(max_size, Image.LANCZOS)
+
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        if output_format == "jpeg" and has_alpha:
+            # JPEG는 투명도를 지원하지 않으므로 흰 배경에 합성
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        elif output_format == "jpeg":
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, **save_options)
+        return buffer.getvalue()
+
+class VariantCache:
+    """
+    콘텐츠 해시 기준 변형 디스크 캐시 (LRU, 전체 크기 상한)
+    파일은 임시 파일에 쓴 뒤 rename하여 동시 요청이 쓰다 만 파일을 읽지 않는다
+    """
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # 경로 -> 크기 (오래 사용하지 않은 순)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """기존 캐시 파일을 마지막 접근 시각 순으로 색인"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._total_bytes += size
+
+    def path_for(self, content_hash: str, variant: str, output_format: str) -> str:
+        return os.path.join(self.directory, content_hash[:2], f"{content_hash}_{variant}.{output_format}")
+
+    def get(self, content_hash: str, variant: str, output_format: str) -> Optional[bytes]:
+        path = self.path_for(content_hash, variant, output_format)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._remove_entry(path)
+            return None
+
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            # 재시작 후에도 LRU 순서를 유지하기 위해 접근 시각 기록
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, content_hash: str, variant: str, output_format: str, data: bytes):
+        path = self.path_for(content_hash, variant, output_format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._remove_entry(path)
+            self._entries[path] = len(data)
+            self._total_bytes += len(data)
+            evicted = self._evict()
+
+        for evicted_path in evicted:
+            try:
+                os.remove(evicted_path)
+            except FileNotFoundError:
+                pass
+
+    def _remove_entry(self, path: str):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """상한을 넘은 만큼 오래된 항목 제거 (삭제할 경로 반환, 잠금 안에서 호출)"""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(path)
+        return evicted
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+class VariantService:
+    """변형 조회/생성 (캐시 미스 시 풀에서 생성, 같은 변형의 동시 요청은 한 번만 생성)"""
+
+    def __init__(self, cache: VariantCache, executor: Executor):
+        self.cache = cache
+        self.executor = executor
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    async def get_variant(self, content_hash: str, variant: str, output_format: str, load_original) -> bytes:
+        """
+        변형 이미지 반환
+        load_original: 캐시 미스일 때만 호출되는 원본 바이트 로더 (DB에서 image_data 로딩)
+        """
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self.cache.get, content_hash, variant, output_format)
+        if data is not None:
+            return data
+
+        key = (content_hash, variant, output_format)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            original = load_original()
+            data = await loop.run_in_executor(self.executor, render_variant, original, variant, output_format)
+            await loop.run_in_executor(None, self.cache.put, content_hash, variant, output_format, data)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            # 생성 요청이 취소되어도 같은 변형을 기다리는 요청이 멈추지 않도록 결과 설정
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("변형 생성이 취소되었습니다."))
+            # 대기 중인 요청이 없으면 예외가 회수되지 않았다는 경고가 남지 않도록 처리
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def prewarm(self, content_hash: str, original: bytes, variant: str = "thumbnail"):
+        """업로드 직후 목록용 썸네일을 미리 생성 (실패해도 요청 시 다시 생성)"""
+        for output_format in VARIANT_FORMATS:
+            try:
+                await self.get_variant(content_hash, variant, output_format, lambda: original)
+            except Exception as e:
+                logger.warning(f"⚠️ 썸네일 미리 생성 실패 ({content_hash[:12]}, {output_format}): {e}")
+
+def create_executor() -> Executor:
+    if IMAGE_EXECUTOR == "process":
+        return ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="review-image")
+
+_variant_service: Optional[VariantService] = None
+
+def get_variant_service() -> VariantService:
+    """프로세스 전역 변형 서비스 (최초 호출 시 캐시 색인 및 풀 생성)"""
+    global _variant_service
+    if _variant_service is None:
+        _variant_service = VariantService(VariantCache(), create_executor())
+        logger.info(
+            f"🖼️ 리뷰 이미지 변형 캐시: {IMAGE_CACHE_DIR} "
+            f"({_variant_service.cache.total_bytes / 1024 / 1024:.1f}/{IMAGE_CACHE_MAX_BYTES / 1024 / 1024:.0f}MB, {IMAGE_EXECUTOR} x{IMAGE_WORKERS})"
+        )
+    return _variant_service
+
+def shutdown_variant_service():
+    global _variant_service
+    if _variant_service is not None:
+        _variant_service.executor.shutdown(wait=False, cancel_futures=True)
+        _variant_service = None
@@ -10,8 +10,12 @@ import logging
 import time
 import traceback
 
-from database import create_tables, check_database_connection
+from database import create_tables, check_database_connection, SessionLocal
+from stats import StatsWorker
+from images import shutdown_variant_service
+from users import close_user_directory
 from routes import router
+from models import API_PREFIX
 
 # 로깅 설정
 logging.basicConfig(
@@ -78,7 +82,7 @@ async def log_requests(request: Request, call_next):
         )
 
 # 라우터 등록
-app.include_router(router, prefix="/api/v1")
+app.include_router(router, prefix=API_PREFIX)
 
 # 전역 예외 처리
 @app.exception_handler(Exception)
@@ -109,6 +113,10 @@ async def startup_event():
         # 데이터베이스 테이블 생성
         create_tables()
         
+        # 병원 리뷰 통계 재계산 작업 시작
+        app.state.stats_worker = StatsWorker(SessionLocal)
+        app.state.stats_worker.start()
+        
         logger.info("✅ Review Service 시작 완료!")
         logger.info("📋 API 문서: http://localhost:8000/docs")
         
@@ -121,6 +129,13 @@ async def startup_event():
 async def shutdown_event():
     """애플리케이션 종료 시 정리"""
     logger.info("🔄 Review Service 종료 중...")
+    
+    stats_worker = getattr(app.state, "stats_worker", None)
+    if stats_worker:
+        await stats_worker.stop()
+    shutdown_variant_service()
+    await close_user_directory()
+    
     logger.info("👋 Review Service 종료 완료!")
 
 # 루트 엔드포인트
@@ -133,7 +148,7 @@ async def root():
         "status": "running",
         "description": "병원 리뷰 관리 시스템",
         "docs_url": "/docs",
-        "health_check": "/api/v1/health"
+        "health_check": f"{API_PREFIX}/health"
     }
 
 # 서비스 상태 확인
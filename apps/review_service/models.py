@@ -3,9 +3,9 @@ models.py - Review Service Database Models
 리뷰 관리 시스템의 데이터베이스 모델 정의
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import pytz
 
@@ -14,6 +14,9 @@ Base = declarative_base()
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
+# API 라우터 마운트 경로 (main.py) - 응답에 포함하는 이미지 경로도 같은 접두사 사용
+API_PREFIX = "/api/v1"
+
 class Review(Base):
     """리뷰 메인 테이블"""
     __tablename__ = "reviews"
@@ -40,6 +43,22 @@ class Review(Base):
     keywords = relationship("ReviewKeyword", back_populates="review", cascade="all, delete-orphan")
     images = relationship("ReviewImage", back_populates="review", cascade="all, delete-orphan")
 
+    # 목록 조회 인덱스 (활성 리뷰만 포함하는 부분 인덱스, 목록 정렬 순서와 같은 키 순서)
+    # 필터 컬럼 + (created_at, review_id) 내림차순으로 정렬 없이 인덱스 순서대로 읽고 커서 위치로 바로 이동
+    __table_args__ = (
+        Index("ix_reviews_active_created", created_at.desc(), review_id.desc(),
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+        Index("ix_reviews_hospital_active_created", hospital_id, created_at.desc(), review_id.desc(),
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+        Index("ix_reviews_user_active_created", user_id, created_at.desc(), review_id.desc(),
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+        Index("ix_reviews_doctor_active_created", doctor_id, created_at.desc(), review_id.desc(),
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+        # 병원별 평점 범위 필터 및 통계 재계산 집계 (stats.py, 인덱스만으로 집계)
+        Index("ix_reviews_hospital_active_rating", hospital_id, rating,
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
+
 
 class ReviewKeyword(Base):
     """리뷰 키워드 테이블"""
@@ -60,6 +79,13 @@ class ReviewKeyword(Base):
     # 관계 설정
     review = relationship("Review", back_populates="keywords")
 
+    __table_args__ = (
+        # 키워드 필터 EXISTS 서브쿼리 (카테고리만 또는 카테고리+코드)
+        Index("ix_review_keywords_category_code", category, keyword_code, review_id),
+        # 리뷰별 키워드 로딩/개수 집계
+        Index("ix_review_keywords_review_id", review_id),
+    )
+
 
 class ReviewImage(Base):
     """리뷰 이미지 테이블"""
@@ -69,7 +95,9 @@ class ReviewImage(Base):
     review_id = Column(Integer, ForeignKey("reviews.review_id", ondelete="CASCADE"), nullable=False, comment="리뷰 ID")
     
     # 이미지 정보 (Base64 저장 방식)
-    image_data = Column(Text, nullable=False, comment="Base64 인코딩된 이미지 데이터")
+    # 대용량 컬럼이므로 명시적으로 요청(undefer)할 때만 로딩
+    image_data = deferred(Column(Text, nullable=False, comment="Base64 인코딩된 이미지 데이터"))
+    content_hash = Column(String(64), nullable=True, comment="원본 이미지 SHA-256 (ETag)")
     image_type = Column(String(10), nullable=False, comment="이미지 타입 (jpg, png, webp)")
     original_filename = Column(String(255), nullable=True, comment="원본 파일명")
     file_size = Column(Integer, nullable=False, comment="파일 크기 (bytes)")
@@ -84,6 +112,29 @@ class ReviewImage(Base):
     # 관계 설정
     review = relationship("Review", back_populates="images")
 
+    __table_args__ = (
+        # 목록의 이미지 정보 일괄 로딩 (selectinload)
+        Index("ix_review_images_review_id", review_id),
+    )
+
+    @property
+    def content_url(self) -> str:
+        """이미지 원본 다운로드 경로"""
+        return f"{API_PREFIX}/reviews/{self.review_id}/images/{self.id}/content"
+
+    @property
+    def thumbnail_url(self) -> str:
+        """목록용 썸네일 경로 (Accept 헤더에 따라 WebP/JPEG)"""
+        return f"{self.content_url}?variant=thumbnail"
+
+    @property
+    def variant_urls(self) -> dict:
+        """너비별 변형 경로 (srcset 구성용)"""
+        return {
+            "w640": f"{self.content_url}?variant=w640",
+            "w1280": f"{self.content_url}?variant=w1280",
+        }
+
 
 class ReviewKeywordTemplate(Base):
     """리뷰 키워드 템플릿 (마스터 데이터)"""
@@ -117,6 +168,7 @@ class ReviewStats(Base):
     # 전체 통계
     total_reviews = Column(Integer, default=0, comment="총 리뷰 수")
     average_rating = Column(Float, default=0.0, comment="평균 평점")
+    rating_sum = Column(Float, default=0.0, nullable=True, comment="평점 합계")
     
     # 평점별 분포
     rating_5 = Column(Integer, default=0, comment="5점 리뷰 수")
@@ -131,4 +183,31 @@ class ReviewStats(Base):
     facility_keywords = Column(JSON, comment="시설 키워드 통계")
     
     # 메타 정보
-    last_updated = Column(DateTime, default=lambda: datetime.now(KST), onupdate=lambda: datetime.now(KST), comment="마지막 업데이트")
\ No newline at end of file
+    last_updated = Column(DateTime, default=lambda: datetime.now(KST), onupdate=lambda: datetime.now(KST), comment="마지막 업데이트")
+
+
+class ReviewStatsDelta(Base):
+    """
+    병원 리뷰 통계 변경분 대기열 (리뷰 변경과 같은 트랜잭션에 INSERT만 하므로 같은 병원의 쓰기끼리 잠금 경합이 없음)
+    백그라운드 작업이 병원별 변경분을 합산하여 통계 행에 한 번에 반영하고 삭제한다
+    """
+    __tablename__ = "review_stats_deltas"
+    __table_args__ = (
+        # 병원별 가장 오래된 변경분 조회 (병합 구간 판단)
+        Index("ix_review_stats_deltas_hospital_created", "hospital_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, comment="변경분 ID")
+    hospital_id = Column(Integer, nullable=False, comment="병원 ID")
+    
+    # 통계 컬럼별 증감
+    total_reviews = Column(Integer, nullable=False, default=0, comment="리뷰 수 증감")
+    rating_sum = Column(Float, nullable=False, default=0.0, comment="평점 합계 증감")
+    rating_5 = Column(Integer, nullable=False, default=0, comment="5점 리뷰 수 증감")
+    rating_4 = Column(Integer, nullable=False, default=0, comment="4점 리뷰 수 증감")
+    rating_3 = Column(Integer, nullable=False, default=0, comment="3점 리뷰 수 증감")
+    rating_2 = Column(Integer, nullable=False, default=0, comment="2점 리뷰 수 증감")
+    rating_1 = Column(Integer, nullable=False, default=0, comment="1점 리뷰 수 증감")
+    keyword_deltas = Column(JSON(none_as_null=True), nullable=True, comment="키워드 증감 [[카테고리, 코드, 이름, 긍정 여부, 증감], ...]")
+    
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(KST), comment="변경 일시")
@@ -0,0 +1,76 @@
+"""
+pagination.py - Review Listing Pagination
+리뷰 목록 커서(keyset) 페이지네이션 및 총 개수 캐시
+
+- 커서는 마지막 항목의 (created_at, review_id)를 담은 불투명 문자열로, 다음 페이지는 OFFSET 없이 인덱스에서 그 위치부터 읽는다
+- 총 개수는 필터 조합별로 짧은 시간 캐시하여 페이지를 넘길 때마다 COUNT를 다시 실행하지 않는다
+  리뷰 생성/수정/삭제 시 이 프로세스의 캐시는 비워지고, 다른 인스턴스의 캐시는 TTL이 지나면 갱신된다
+"""
+
+import base64
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Hashable, Tuple
+
+from sqlalchemy import tuple_
+
+from models import Review
+
+# 환경 변수 설정
+REVIEW_COUNT_CACHE_TTL = float(os.getenv("REVIEW_COUNT_CACHE_TTL", "30"))
+REVIEW_COUNT_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_COUNT_CACHE_MAX_ENTRIES", "1000"))
+
+def encode_cursor(review: Review) -> str:
+    """목록 마지막 리뷰 위치를 커서 문자열로 인코딩"""
+    payload = json.dumps([review.created_at.isoformat(), review.review_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 문자열을 (created_at, review_id)로 디코딩 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, review_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(review_id)
+    except Exception as e:
+        raise ValueError("잘못된 커서입니다.") from e
+
+def after_cursor(cursor: str):
+    """목록 정렬 순서(created_at, review_id 내림차순)에서 커서 다음 위치의 조건 (행 값 비교로 인덱스 범위 검색)"""
+    created_at, review_id = decode_cursor(cursor)
+    return tuple_(Review.created_at, Review.review_id) < tuple_(created_at, review_id)
+
+class CountCache:
+    """필터 조합 -> 총 개수 캐시 (TTL 만료, 최대 개수 초과 시 오래 사용하지 않은 항목부터 제거)"""
+
+    def __init__(self, ttl: float = REVIEW_COUNT_CACHE_TTL, max_entries: int = REVIEW_COUNT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # 필터 키 -> (개수, 만료 시각)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+
+    def get_or_count(self, key: Hashable, count: Callable[[], int]) -> int:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        total = count()
+        self._entries[key] = (total, now + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return total
+
+    def clear(self):
+        self._entries.clear()
+
+# 프로세스 전역 리뷰 목록 총 개수 캐시
+review_count_cache = CountCache()
+
+def invalidate_review_counts():
+    """리뷰 생성/수정/삭제 후 호출"""
+    review_count_cache.clear()
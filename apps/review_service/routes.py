@@ -3,41 +3,54 @@ routes.py - Review Service API Routes
 리뷰 관리 시스템의 API 엔드포인트 정의
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Header, BackgroundTasks
+from fastapi.responses import Response
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_, desc, func
 from typing import List, Optional
 import logging
 import json
 import base64
+import hashlib
 import io
 import httpx
-import asyncio
 import os
-import requests
 from datetime import datetime
 from PIL import Image
 
 from database import get_database
 from models import Review, ReviewKeyword, ReviewImage, ReviewKeywordTemplate, ReviewStats
+from stats import record_review_delta, review_contribution, rebuild_hospital_stats
+from images import VARIANTS, VARIANT_FORMATS, get_variant_service, negotiate_format
+from users import get_user_directory, fallback_user_name
+from search import SEARCH_MAX_QUERY_LENGTH, parse_search_terms, search_filter, search_candidates, search_rank, build_highlight
+from pagination import encode_cursor, decode_cursor, after_cursor, review_count_cache, invalidate_review_counts
+from catalogue import bulk_write_keyword_templates, keyword_catalogue, validate_review_keywords
 from schemas import (
     ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse,
     ReviewKeywordTemplateCreate, ReviewKeywordTemplateUpdate, ReviewKeywordTemplateResponse,
     ReviewStatsResponse, ReviewSearchParams, PaginatedResponse, ApiResponse,
-    KeywordCategory, BulkKeywordCreate, ReviewAnalytics
+    KeywordCategory, BulkKeywordCreate, ReviewAnalytics, UserCacheInvalidation
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Auth Service URL 설정 (프로덕션용)
-AUTH_SERVICE_URL = "https://wellness-meditrip-backend.eastus2.cloudapp.azure.com:8013"
+# 이미지 타입별 Content-Type
+IMAGE_MEDIA_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
 
 # === Review CRUD Operations ===
 
 @router.post("/reviews", response_model=ApiResponse, status_code=201)
 async def create_review(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_database)
 ):
     """새 리뷰 생성"""
@@ -54,6 +67,9 @@ async def create_review(
             logger.error(f"❌ Pydantic 검증 실패: {validation_error}")
             raise HTTPException(status_code=422, detail=f"데이터 검증 실패: {str(validation_error)}")
         
+        # 키워드를 카탈로그(캐시)로 검증 (KEYWORD_STRICT_VALIDATION이면 활성 템플릿만 허용)
+        keywords = validate_review_keywords(db, review_data.keywords)
+        
         # 새 리뷰 생성
         new_review = Review(
             hospital_id=review_data.hospital_id,
@@ -69,17 +85,11 @@ async def create_review(
         db.flush()  # review_id 생성을 위해 flush
         
         # 키워드 추가
-        for keyword_data in review_data.keywords:
-            keyword = ReviewKeyword(
-                review_id=new_review.review_id,
-                category=keyword_data.category,
-                keyword_code=keyword_data.keyword_code,
-                keyword_name=keyword_data.keyword_name,
-                is_positive=keyword_data.is_positive
-            )
-            db.add(keyword)
+        new_keywords = [ReviewKeyword(review_id=new_review.review_id, **keyword_data) for keyword_data in keywords]
+        db.add_all(new_keywords)
         
         # 이미지 추가 (Base64 처리)
+        uploaded_images = []
         for i, image_data in enumerate(review_data.images):
             logger.info(f"🖼️ 이미지 {i+1} 처리 중...")
             # Base64 이미지 처리
@@ -94,17 +104,24 @@ async def create_review(
                 image_type=processed_image["image_type"],
                 original_filename=image_data.original_filename,
                 file_size=processed_image["file_size"],
+                content_hash=processed_image["content_hash"],
                 width=processed_image["width"],
                 height=processed_image["height"],
                 image_order=image_data.image_order,
                 alt_text=image_data.alt_text
             )
             db.add(image)
+            uploaded_images.append((processed_image["content_hash"], processed_image["processed_data"]))
         
+        # 이 리뷰의 통계 변경분만 기록 (같은 트랜잭션, 반영은 백그라운드 작업이 병합하여 수행)
+        record_review_delta(db, review_data.hospital_id, None, review_contribution(new_review, new_keywords))
         db.commit()
+        invalidate_review_counts()
         
-        # 병원 통계 업데이트 (비동기로 처리 가능)
-        await update_hospital_stats(db, review_data.hospital_id)
+        # 목록용 썸네일은 응답 후 백그라운드에서 미리 생성
+        variant_service = get_variant_service()
+        for content_hash, encoded in uploaded_images:
+            background_tasks.add_task(variant_service.prewarm, content_hash, base64.b64decode(encoded))
         
         logger.info(f"✅ 새 리뷰 생성 완료: {new_review.review_id}")
         
@@ -132,7 +149,10 @@ async def get_review(
     db: Session = Depends(get_database)
 ):
     """리뷰 상세 조회"""
-    review = db.query(Review).filter(
+    # 이미지는 이미지 데이터까지 한 번의 추가 쿼리로 로딩
+    review = db.query(Review).options(
+        selectinload(Review.images).undefer(ReviewImage.image_data)
+    ).filter(
         and_(Review.review_id == review_id, Review.is_active == True)
     ).first()
     
@@ -142,6 +162,70 @@ async def get_review(
     return review
 
 
+@router.get("/reviews/{review_id}/images/{image_id}/content")
+async def get_review_image_content(
+    review_id: int = Path(..., description="리뷰 ID"),
+    image_id: int = Path(..., description="이미지 ID"),
+    variant: Optional[str] = Query(None, pattern=f"^({'|'.join(VARIANTS)})$", description="변형 (thumbnail, w640, w1280), 생략 시 원본"),
+    output_format: Optional[str] = Query(None, alias="format", pattern=f"^({'|'.join(VARIANT_FORMATS)})$", description="변형 형식 (생략 시 Accept 헤더 기준)"),
+    accept: Optional[str] = Header(None, alias="Accept"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_database)
+):
+    """
+    리뷰 이미지 원본 또는 변형(썸네일/너비별) 조회
+    ETag는 이미지 내용 해시 기준이므로 If-None-Match가 일치하면 이미지 데이터를 읽지 않고 304 응답
+    변형은 최초 요청 시 생성되어 디스크 캐시에 저장된다
+    """
+    image = db.query(ReviewImage).join(Review).filter(
+        and_(
+            ReviewImage.id == image_id,
+            ReviewImage.review_id == review_id,
+            Review.is_active == True
+        )
+    ).first()
+    
+    if not image:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+    
+    content = None
+    if not image.content_hash:
+        # content_hash 도입 이전 이미지는 첫 조회 시 해시 저장
+        content = base64.b64decode(image.image_data)
+        image.content_hash = hashlib.sha256(content).hexdigest()
+        db.commit()
+    
+    headers = {
+        "ETag": f'"{image.content_hash}"',
+        "Cache-Control": "public, max-age=86400"
+    }
+    if variant:
+        output_format = output_format or negotiate_format(accept)
+        headers["ETag"] = f'"{image.content_hash}-{variant}-{output_format}"'
+        headers["Vary"] = "Accept"
+    
+    if if_none_match and headers["ETag"] in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+    
+    if variant:
+        original = content
+        try:
+            content = await get_variant_service().get_variant(
+                image.content_hash, variant, output_format,
+                lambda: original if original is not None else base64.b64decode(image.image_data)
+            )
+        except Exception as e:
+            logger.error(f"❌ 이미지 변형 생성 실패: image_id={image_id}, variant={variant}: {e}")
+            raise HTTPException(status_code=500, detail="이미지 변형 생성 중 오류가 발생했습니다.")
+        return Response(content=content, media_type=VARIANT_FORMATS[output_format][1], headers=headers)
+    
+    if content is None:
+        content = base64.b64decode(image.image_data)
+    
+    media_type = IMAGE_MEDIA_TYPES.get((image.image_type or "").lower(), "application/octet-stream")
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
 @router.put("/reviews/{review_id}", response_model=ApiResponse)
 async def update_review(
     review_id: int = Path(..., description="리뷰 ID"),
@@ -150,24 +234,27 @@ async def update_review(
 ):
     """리뷰 수정"""
     try:
+        # 동시 수정 시 변경 전 평점을 정확히 읽도록 리뷰 행 잠금
         review = db.query(Review).filter(
             and_(Review.review_id == review_id, Review.is_active == True)
-        ).first()
+        ).with_for_update().first()
         
         if not review:
             raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
         
+        previous = review_contribution(review)
+        
         # 수정할 필드들 업데이트
         update_data = review_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(review, field, value)
         
         review.updated_at = datetime.now()
-        db.commit()
         
-        # 평점이 변경된 경우 통계 업데이트
-        if review_data.rating is not None:
-            await update_hospital_stats(db, review.hospital_id)
+        # 평점이 변경된 경우에만 변경분 기록 (같으면 기록하지 않음)
+        record_review_delta(db, review.hospital_id, previous, review_contribution(review))
+        db.commit()
+        invalidate_review_counts()
         
         logger.info(f"✅ 리뷰 수정 완료: {review_id}")
         
@@ -189,17 +276,19 @@ async def delete_review(
 ):
     """리뷰 삭제 (소프트 삭제)"""
     try:
-        review = db.query(Review).filter(Review.review_id == review_id).first()
+        review = db.query(Review).filter(Review.review_id == review_id).with_for_update().first()
         
         if not review:
             raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
         
+        # 이미 삭제된 리뷰는 기여값이 None이므로 변경분이 기록되지 않음
+        previous = review_contribution(review, review.keywords)
         review.is_active = False
         review.updated_at = datetime.now()
-        db.commit()
         
-        # 통계 업데이트
-        await update_hospital_stats(db, review.hospital_id)
+        record_review_delta(db, review.hospital_id, previous, None)
+        db.commit()
+        invalidate_review_counts()
         
         logger.info(f"✅ 리뷰 삭제 완료: {review_id}")
         
@@ -218,6 +307,7 @@ async def delete_review(
 
 @router.get("/reviews", response_model=PaginatedResponse)
 async def search_reviews(
+    q: Optional[str] = Query(None, max_length=SEARCH_MAX_QUERY_LENGTH, description="제목/내용 검색어 (공백으로 구분, 모두 포함)"),
     hospital_id: Optional[int] = Query(None, description="병원 ID"),
     user_id: Optional[int] = Query(None, description="사용자 ID"),
     doctor_id: Optional[int] = Query(None, description="의사 ID"),
@@ -227,9 +317,24 @@ async def search_reviews(
     keyword_code: Optional[str] = Query(None, description="키워드 코드"),
     limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
     offset: int = Query(0, ge=0, description="페이지 오프셋"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, offset 대신 사용)"),
     db: Session = Depends(get_database)
 ):
-    """리뷰 검색 및 목록 조회"""
+    """
+    리뷰 검색 및 목록 조회
+    검색어(q)가 있으면 최신 일치 리뷰 SEARCH_MAX_CANDIDATES건 안에서 관련도 순으로 정렬하고 항목마다 하이라이트(제목, 내용 발췌)를 포함
+    검색어가 없으면 next_cursor로 다음 페이지를 OFFSET 없이 조회할 수 있다 (깊은 페이지도 첫 페이지와 같은 비용)
+    total은 필터 조합별로 짧은 시간 캐시된 값이다
+    """
+    search_terms = parse_search_terms(q) if q else []
+    if cursor:
+        if search_terms:
+            raise HTTPException(status_code=400, detail="검색어(q) 검색은 커서 페이지네이션을 지원하지 않습니다. offset을 사용하세요.")
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         # 기본 쿼리
         query = db.query(Review).filter(Review.is_active == True)
@@ -246,47 +351,77 @@ async def search_reviews(
         if rating_max:
             query = query.filter(Review.rating <= rating_max)
         
-        # 키워드 필터
+        # 키워드 필터 (EXISTS 서브쿼리, 조건에 맞는 키워드가 여러 개여도 리뷰는 한 번만 조회)
         if keyword_category or keyword_code:
-            query = query.join(ReviewKeyword)
+            keyword_conditions = []
             if keyword_category:
-                query = query.filter(ReviewKeyword.category == keyword_category)
+                keyword_conditions.append(ReviewKeyword.category == keyword_category)
             if keyword_code:
-                query = query.filter(ReviewKeyword.keyword_code == keyword_code)
-        
-        # 총 개수 조회
-        total = query.count()
-        
-        # 페이지네이션 적용
-        reviews = query.order_by(desc(Review.created_at)).offset(offset).limit(limit).all()
-        
-        # 사용자 이름 조회 (병렬 처리)
+                keyword_conditions.append(ReviewKeyword.keyword_code == keyword_code)
+            query = query.filter(Review.keywords.any(and_(*keyword_conditions)))
+        
+        # 자유 텍스트 검색 (PostgreSQL은 제목/내용 트라이그램 인덱스 사용)
+        # 관련도 정렬과 총 개수는 최신 일치 리뷰 후보(SEARCH_MAX_CANDIDATES건) 안에서만 계산
+        if search_terms:
+            candidates = search_candidates(query.filter(search_filter(search_terms)))
+            query = db.query(Review).filter(Review.review_id.in_(candidates))
+        
+        # 총 개수 조회 (필터 조합별 캐시, 커서 조건 적용 전)
+        count_key = (
+            tuple(term.casefold() for term in search_terms), hospital_id, user_id, doctor_id,
+            rating_min, rating_max, keyword_category, keyword_code
+        )
+        total = review_count_cache.get_or_count(count_key, query.count)
+        
+        # 페이지네이션 적용 (다음 페이지 여부는 한 건 더 조회하여 판단)
+        # 이미지 정보는 한 번의 추가 쿼리로 로딩 (image_data는 지연 로딩 컬럼이므로 제외됨)
+        order_by = [desc(Review.created_at), desc(Review.review_id)]
+        if search_terms:
+            order_by.insert(0, desc(search_rank(search_terms, db.bind.dialect.name)))
+        if cursor:
+            query = query.filter(after_cursor(cursor))
+        reviews = query.options(selectinload(Review.images)).order_by(
+            *order_by
+        ).offset(offset).limit(limit + 1).all()
+        has_next = len(reviews) > limit
+        reviews = reviews[:limit]
+        
+        # 키워드 개수는 키워드 행을 로딩하지 않고 집계 쿼리 한 번으로 조회
+        review_ids = [review.review_id for review in reviews]
+        keyword_counts = dict(
+            db.query(ReviewKeyword.review_id, func.count(ReviewKeyword.id))
+            .filter(ReviewKeyword.review_id.in_(review_ids))
+            .group_by(ReviewKeyword.review_id)
+            .all()
+        ) if review_ids else {}
+        
+        # 사용자 이름 조회 (캐시 미스 사용자만 auth-service 일괄 조회 한 번)
         user_ids = [review.user_id for review in reviews]
-        user_names = await get_multiple_user_names(user_ids) if user_ids else {}
+        user_names = await get_user_directory().get_user_names(user_ids) if user_ids else {}
         
         # 응답 데이터 구성
         items = []
         for review in reviews:
-            keyword_count = len(review.keywords)
-            user_name = user_names.get(review.user_id, f"User_{review.user_id}")
+            keyword_count = keyword_counts.get(review.review_id, 0)
+            user_name = user_names.get(review.user_id, fallback_user_name(review.user_id))
             
-            # 이미지 리스트 구성
+            # 이미지 정보 구성 (이미지 데이터는 제외, content_url/thumbnail_url로 별도 조회)
             images = []
-            for image in review.images:
+            for image in sorted(review.images, key=lambda image: image.image_order or 0):
                 images.append({
                     "id": image.id,
-                    "image_data": image.image_data,
                     "image_type": image.image_type,
-                    "original_filename": image.original_filename,
                     "file_size": image.file_size,
                     "width": image.width,
                     "height": image.height,
                     "image_order": image.image_order,
                     "alt_text": image.alt_text,
-                    "created_at": image.created_at
+                    "content_url": image.content_url,
+                    "thumbnail_url": image.thumbnail_url,
+                    "variant_urls": image.variant_urls
                 })
             
-            items.append({
+            item = {
                 "review_id": review.review_id,
                 "hospital_id": review.hospital_id,
                 "user_id": review.user_id,
@@ -298,15 +433,19 @@ async def search_reviews(
                 "created_at": review.created_at,
                 "keyword_count": keyword_count,
                 "images": images
-            })
+            }
+            if search_terms:
+                item["highlight"] = build_highlight(review, search_terms)
+            items.append(item)
         
         return PaginatedResponse(
             items=items,
             total=total,
             limit=limit,
             offset=offset,
-            has_next=offset + limit < total,
-            has_prev=offset > 0
+            has_next=has_next,
+            has_prev=offset > 0 or cursor is not None,
+            next_cursor=encode_cursor(reviews[-1]) if has_next and not search_terms else None
         )
         
     except Exception as e:
@@ -334,6 +473,7 @@ async def create_keyword_template(
         template = ReviewKeywordTemplate(**template_data.dict())
         db.add(template)
         db.commit()
+        keyword_catalogue.invalidate()
         
         logger.info(f"✅ 키워드 템플릿 생성 완료: {template.keyword_code}")
         
@@ -356,24 +496,63 @@ async def get_keyword_templates(
     category: Optional[KeywordCategory] = Query(None, description="키워드 카테고리"),
     is_positive: Optional[bool] = Query(None, description="긍정/부정 필터"),
     is_active: bool = Query(True, description="활성 상태"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: Session = Depends(get_database)
 ):
-    """키워드 템플릿 목록 조회"""
-    query = db.query(ReviewKeywordTemplate).filter(
-        ReviewKeywordTemplate.is_active == is_active
+    """
+    키워드 템플릿 목록 조회
+    프로세스 내 카탈로그 캐시에서 응답하며, ETag는 카탈로그 버전 기준이므로 변경이 없으면 304 응답
+    """
+    body, etag = keyword_catalogue.get_response(
+        db, category.value if category else None, is_positive, is_active
     )
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache"
+    }
     
-    if category:
-        query = query.filter(ReviewKeywordTemplate.category == category)
-    if is_positive is not None:
-        query = query.filter(ReviewKeywordTemplate.is_positive == is_positive)
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
     
-    templates = query.order_by(
-        ReviewKeywordTemplate.category,
-        ReviewKeywordTemplate.keyword_code
-    ).all()
-    
-    return templates
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.put("/keyword-templates/{template_id}", response_model=ApiResponse)
+async def update_keyword_template(
+    template_id: int = Path(..., description="템플릿 ID"),
+    template_data: ReviewKeywordTemplateUpdate = ...,
+    db: Session = Depends(get_database)
+):
+    """키워드 템플릿 수정 (이름/번역/긍정 여부/활성 상태)"""
+    try:
+        template = db.query(ReviewKeywordTemplate).filter(
+            ReviewKeywordTemplate.id == template_id
+        ).first()
+        
+        if not template:
+            raise HTTPException(status_code=404, detail="키워드 템플릿을 찾을 수 없습니다.")
+        
+        update_data = template_data.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(template, field, value)
+        
+        db.commit()
+        keyword_catalogue.invalidate()
+        
+        logger.info(f"✅ 키워드 템플릿 수정 완료: {template.keyword_code} ({', '.join(update_data) or '변경 없음'})")
+        
+        return ApiResponse(
+            success=True,
+            message="키워드 템플릿이 성공적으로 수정되었습니다.",
+            data={"template_id": template.id}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ 키워드 템플릿 수정 실패: {e}")
+        raise HTTPException(status_code=500, detail="키워드 템플릿 수정 중 오류가 발생했습니다.")
 
 
 @router.post("/keyword-templates/bulk", response_model=ApiResponse)
@@ -381,32 +560,23 @@ async def create_bulk_keyword_templates(
     bulk_data: BulkKeywordCreate,
     db: Session = Depends(get_database)
 ):
-    """키워드 템플릿 일괄 생성"""
+    """
+    키워드 템플릿 일괄 생성
+    기존 코드는 건너뛰며, update_translations=true이면 기존 템플릿의 번역을 갱신한다 (카탈로그 동기화)
+    """
     try:
-        created_count = 0
-        skipped_count = 0
-        
-        for template_data in bulk_data.keywords:
-            # 중복 확인
-            existing = db.query(ReviewKeywordTemplate).filter(
-                ReviewKeywordTemplate.keyword_code == template_data.keyword_code
-            ).first()
-            
-            if existing:
-                skipped_count += 1
-                continue
-            
-            template = ReviewKeywordTemplate(**template_data.dict())
-            db.add(template)
-            created_count += 1
+        counts = bulk_write_keyword_templates(db, bulk_data.keywords, bulk_data.update_translations)
         
         db.commit()
+        keyword_catalogue.invalidate()
         
-        logger.info(f"✅ 키워드 템플릿 일괄 생성 완료: {created_count}개 생성, {skipped_count}개 건너뜀")
+        summary = f"{counts['created']}개 생성, {counts['updated']}개 갱신, {counts['skipped']}개 건너뜀"
+        logger.info(f"✅ 키워드 템플릿 일괄 생성 완료: {summary}")
         
         return ApiResponse(
             success=True,
-            message=f"키워드 템플릿 일괄 생성 완료: {created_count}개 생성, {skipped_count}개 건너뜀"
+            message=f"키워드 템플릿 일괄 생성 완료: {summary}",
+            data=counts
         )
         
     except Exception as e:
@@ -429,7 +599,8 @@ async def get_hospital_review_stats(
     
     if not stats:
         # 통계가 없으면 새로 생성
-        stats = await create_hospital_stats(db, hospital_id)
+        stats = rebuild_hospital_stats(db, hospital_id)
+        db.commit()
     
     return stats
 
@@ -439,9 +610,11 @@ async def refresh_hospital_stats(
     hospital_id: int = Path(..., description="병원 ID"),
     db: Session = Depends(get_database)
 ):
-    """병원 리뷰 통계 갱신"""
+    """병원 리뷰 통계 전체 재계산 (증분 통계 복구용)"""
     try:
-        await update_hospital_stats(db, hospital_id)
+        rebuild_hospital_stats(db, hospital_id)
+        db.commit()
+        logger.info(f"✅ 병원 {hospital_id} 통계 재계산 완료")
         
         return ApiResponse(
             success=True,
@@ -449,48 +622,27 @@ async def refresh_hospital_stats(
         )
         
     except Exception as e:
+        db.rollback()
         logger.error(f"❌ 통계 갱신 실패: {e}")
         raise HTTPException(status_code=500, detail="통계 갱신 중 오류가 발생했습니다.")
 
 
-# === Helper Functions ===
+# === Internal ===
 
-async def get_user_name(user_id: int) -> str:
-    """auth-service에서 사용자 이름 조회"""
-    try:
-        response = requests.get(
-            f"{AUTH_SERVICE_URL}/profile/user/{user_id}",
-            timeout=10.0
-        )
-        if response.status_code == 200:
-            user_data = response.json()
-            # nickname이 있으면 nickname 사용, 없으면 username 사용
-            nickname = user_data.get("nickname")
-            if nickname:
-                return nickname
-            return user_data.get("username", f"User_{user_id}")
-        else:
-            logger.warning(f"사용자 {user_id} 정보 조회 실패: {response.status_code}")
-            return f"User_{user_id}"
-    except Exception as e:
-        logger.error(f"사용자 {user_id} 이름 조회 중 오류: {e}")
-        return f"User_{user_id}"
-
-async def get_multiple_user_names(user_ids: List[int]) -> dict:
-    """여러 사용자 이름을 한 번에 조회"""
-    user_names = {}
-    
-    # 중복 제거
-    unique_user_ids = list(set(user_ids))
-    
-    # 병렬로 사용자 정보 조회
-    tasks = [get_user_name(user_id) for user_id in unique_user_ids]
-    results = await asyncio.gather(*tasks)
-    
-    for user_id, user_name in zip(unique_user_ids, results):
-        user_names[user_id] = user_name
+@router.post("/internal/users/invalidate", response_model=ApiResponse)
+async def invalidate_user_names(invalidation: UserCacheInvalidation):
+    """사용자 이름 캐시 무효화 (auth-service 프로필 변경 웹훅)"""
+    removed = get_user_directory().invalidate(invalidation.user_ids)
+    logger.info(f"👤 사용자 이름 캐시 무효화: {invalidation.user_ids} ({removed}건 삭제)")
     
-    return user_names
+    return ApiResponse(
+        success=True,
+        message="사용자 이름 캐시가 무효화되었습니다.",
+        data={"invalidated": removed}
+    )
+
+
+# === Helper Functions ===
 
 def process_base64_image(image_data: str, image_type: str) -> dict:
     """Base64 이미지 처리 및 메타데이터 추출"""
@@ -512,6 +664,7 @@ def process_base64_image(image_data: str, image_type: str) -> dict:
         
         return {
             "file_size": file_size,
+            "content_hash": hashlib.sha256(decoded_image).hexdigest(),
             "width": width,
             "height": height,
             "image_type": format_type,
@@ -521,86 +674,6 @@ def process_base64_image(image_data: str, image_type: str) -> dict:
     except Exception as e:
         raise ValueError(f"이미지 처리 중 오류: {str(e)}")
 
-async def update_hospital_stats(db: Session, hospital_id: int):
-    """병원 리뷰 통계 업데이트"""
-    try:
-        # 기존 통계 조회 또는 생성
-        stats = db.query(ReviewStats).filter(
-            ReviewStats.hospital_id == hospital_id
-        ).first()
-        
-        if not stats:
-            stats = ReviewStats(hospital_id=hospital_id)
-            db.add(stats)
-        
-        # 리뷰 통계 계산
-        reviews = db.query(Review).filter(
-            and_(Review.hospital_id == hospital_id, Review.is_active == True)
-        ).all()
-        
-        if not reviews:
-            stats.total_reviews = 0
-            stats.average_rating = 0.0
-            stats.rating_5 = stats.rating_4 = stats.rating_3 = stats.rating_2 = stats.rating_1 = 0
-        else:
-            stats.total_reviews = len(reviews)
-            stats.average_rating = round(sum(r.rating for r in reviews) / len(reviews), 1)
-            
-            # 평점별 분포
-            ratings = [r.rating for r in reviews]
-            stats.rating_5 = len([r for r in ratings if r >= 4.5])
-            stats.rating_4 = len([r for r in ratings if 3.5 <= r < 4.5])
-            stats.rating_3 = len([r for r in ratings if 2.5 <= r < 3.5])
-            stats.rating_2 = len([r for r in ratings if 1.5 <= r < 2.5])
-            stats.rating_1 = len([r for r in ratings if r < 1.5])
-        
-        # 키워드 통계 계산
-        keyword_stats = {}
-        for category in ["CARE", "SERVICE", "FACILITY"]:
-            keywords = db.query(ReviewKeyword).join(Review).filter(
-                and_(
-                    Review.hospital_id == hospital_id,
-                    Review.is_active == True,
-                    ReviewKeyword.category == category
-                )
-            ).all()
-            
-            category_stats = {}
-            for keyword in keywords:
-                key = f"{keyword.keyword_code}_{keyword.is_positive}"
-                if key not in category_stats:
-                    category_stats[key] = {
-                        "keyword_code": keyword.keyword_code,
-                        "keyword_name": keyword.keyword_name,
-                        "is_positive": keyword.is_positive,
-                        "count": 0
-                    }
-                category_stats[key]["count"] += 1
-            
-            keyword_stats[category.lower() + "_keywords"] = list(category_stats.values())
-        
-        stats.care_keywords = keyword_stats.get("care_keywords", [])
-        stats.service_keywords = keyword_stats.get("service_keywords", [])
-        stats.facility_keywords = keyword_stats.get("facility_keywords", [])
-        
-        stats.last_updated = datetime.now()
-        db.commit()
-        
-        logger.info(f"✅ 병원 {hospital_id} 통계 업데이트 완료")
-        
-    except Exception as e:
-        db.rollback()
-        logger.error(f"❌ 통계 업데이트 실패: {e}")
-        raise
-
-
-async def create_hospital_stats(db: Session, hospital_id: int) -> ReviewStats:
-    """새 병원 통계 생성"""
-    stats = ReviewStats(hospital_id=hospital_id)
-    db.add(stats)
-    await update_hospital_stats(db, hospital_id)
-    return stats
-
 
 # === Health Check ===
 
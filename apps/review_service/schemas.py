@@ -54,11 +54,28 @@ class ReviewImageResponse(ReviewImageBase):
     """리뷰 이미지 응답 스키마"""
     id: int
     review_id: int
+    content_url: str = Field(..., description="이미지 다운로드 경로 (ETag 캐시 지원)")
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class ReviewImageDescriptor(BaseModel):
+    """리뷰 목록용 이미지 정보 (이미지 데이터 제외, 이미지는 content_url/thumbnail_url로 조회)"""
+    id: int
+    image_type: str
+    file_size: int
+    width: Optional[int]
+    height: Optional[int]
+    image_order: int
+    alt_text: Optional[str] = None
+    content_url: str
+    thumbnail_url: str
+    variant_urls: Dict[str, str] = {}
+
+    class Config:
+        from_attributes = True
+
 # === Review Schemas ===
 
 class ReviewBase(BaseModel):
@@ -114,6 +131,11 @@ class ReviewResponse(ReviewBase):
     class Config:
         from_attributes = True
 
+class ReviewSearchHighlight(BaseModel):
+    """검색어 하이라이트 (일치 부분을 <mark>로 감싼 HTML 이스케이프 문자열)"""
+    title: str
+    content: Optional[str] = None
+
 class ReviewListResponse(BaseModel):
     """리뷰 목록 응답 스키마"""
     review_id: int
@@ -126,7 +148,8 @@ class ReviewListResponse(BaseModel):
     rating: float
     created_at: datetime
     keyword_count: int = 0
-    images: List[ReviewImageResponse] = []
+    images: List[ReviewImageDescriptor] = []
+    highlight: Optional[ReviewSearchHighlight] = None
 
     class Config:
         from_attributes = True
@@ -213,6 +236,7 @@ class PaginatedResponse(BaseModel):
     offset: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 class ApiResponse(BaseModel):
     """API 응답 스키마"""
@@ -220,11 +244,18 @@ class ApiResponse(BaseModel):
     message: str
     data: Optional[Any] = None
 
+class UserCacheInvalidation(BaseModel):
+    """사용자 이름 캐시 무효화 요청 (auth-service 프로필 변경 웹훅)"""
+    event_type: Optional[str] = None
+    user_ids: List[int] = Field(..., min_length=1, max_length=500)
+    updated_fields: List[str] = []
+
 # === Bulk Operations ===
 
 class BulkKeywordCreate(BaseModel):
     """키워드 템플릿 일괄 생성"""
     keywords: List[ReviewKeywordTemplateCreate]
+    update_translations: bool = Field(False, description="기존 템플릿의 번역(keyword_name_en/jp) 갱신 여부 (업서트 모드)")
 
 class ReviewAnalytics(BaseModel):
     """리뷰 분석 데이터"""
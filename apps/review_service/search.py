@@ -0,0 +1,158 @@
+"""
+search.py - Review Full-Text Search
+리뷰 제목/내용 자유 텍스트 검색 (한국어/일본어/영어)
+
+- 형태소 분석 없이 부분 문자열로 일치시키므로 띄어쓰기가 없는 일본어("英語対応")나 조사가 붙은 한국어도 검색된다
+- PostgreSQL에서는 pg_trgm 트라이그램 GIN 인덱스로 ILIKE '%검색어%'를 인덱스 검색한다 (database.py SEARCH_MIGRATIONS)
+  CJK 문자의 트라이그램 추출에는 UTF-8 로케일(LC_CTYPE) 데이터베이스가 필요하다
+- 3글자 미만 검색어("친절", "통증", "英語")는 트라이그램을 만들 수 없어 pg_trgm 인덱스를 쓰지 못하므로
+  lower(컬럼) LIKE로 조회하여 pg_bigm 바이그램 인덱스를 사용한다 (pg_bigm은 ILIKE를 지원하지 않음)
+  pg_bigm 확장이 설치되지 않은 서버에서는 짧은 검색어만 인덱스 없이 순차 검색된다
+- 검색어는 공백으로 나누어 모든 검색어가 제목 또는 내용에 포함된 리뷰만 조회 (AND)
+- 관련도: 제목 일치 > 내용 일치, PostgreSQL에서는 제목 트라이그램 단어 유사도를 더해 같은 점수 안에서 정렬
+- 관련도 정렬과 총 개수는 조건에 맞는 최신 리뷰 SEARCH_MAX_CANDIDATES건 안에서만 계산한다
+  (흔한 검색어도 일치하는 모든 행을 점수 계산/정렬하지 않음, 그보다 오래된 일치 리뷰는 검색 결과에서 제외)
+- 하이라이트: 일치 부분을 <mark>로 감싼 제목과 내용 발췌 (HTML 이스케이프 후 태그 삽입)
+"""
+
+import html
+import os
+import re
+from typing import List, Optional
+
+from sqlalchemy import and_, case, desc, func, literal, or_, select
+
+from models import Review
+
+# 검색어 제한
+SEARCH_MAX_TERMS = 5
+SEARCH_MAX_QUERY_LENGTH = 100
+
+# 관련도 정렬 대상 최대 후보 수 (조건에 맞는 최신 리뷰 기준)
+SEARCH_MAX_CANDIDATES = int(os.getenv("REVIEW_SEARCH_MAX_CANDIDATES", "1000"))
+
+# pg_trgm 인덱스를 사용할 수 있는 최소 검색어 길이 (더 짧으면 pg_bigm 인덱스용 조건 사용)
+SEARCH_TRIGRAM_MIN_LENGTH = 3
+
+# 내용 발췌 길이 (문자 수) 및 첫 일치 앞에 남길 문맥 길이
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 40
+
+# 관련도 가중치
+TITLE_MATCH_WEIGHT = 2.0
+CONTENT_MATCH_WEIGHT = 1.0
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+
+def parse_search_terms(q: str) -> List[str]:
+    """검색어 문자열을 중복 없는 검색어 목록으로 분리 (대소문자 무시, 최대 SEARCH_MAX_TERMS개)"""
+    terms = []
+    seen = set()
+    for term in q.strip()[:SEARCH_MAX_QUERY_LENGTH].split():
+        key = term.casefold()
+        if key not in seen:
+            seen.add(key)
+            terms.append(term)
+    return terms[:SEARCH_MAX_TERMS]
+
+def _like_pattern(term: str) -> str:
+    """LIKE 특수 문자를 이스케이프한 부분 일치 패턴"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _term_match(column, term: str):
+    """검색어 부분 일치 조건 (짧은 검색어는 바이그램 인덱스 lower(컬럼) gin_bigm_ops와 같은 식으로 비교)"""
+    if len(term) < SEARCH_TRIGRAM_MIN_LENGTH:
+        return func.lower(column).like(_like_pattern(term.lower()), escape="\\")
+    return column.ilike(_like_pattern(term), escape="\\")
+
+def _title_match(term: str):
+    return _term_match(Review.title, term)
+
+def _content_match(term: str):
+    return _term_match(Review.content, term)
+
+def search_filter(terms: List[str]):
+    """모든 검색어가 제목 또는 내용에 포함되는 조건 (제목/내용 트라이그램 또는 바이그램 인덱스의 BitmapOr로 실행)"""
+    return and_(*[or_(_title_match(term), _content_match(term)) for term in terms])
+
+def search_candidates(query, limit: int = SEARCH_MAX_CANDIDATES):
+    """
+    검색 조건이 적용된 리뷰 쿼리에서 최신 리뷰 ID 최대 limit건을 고르는 서브쿼리
+    (created_at, review_id) 인덱스 순서로 읽다가 limit건에서 멈추므로 일치 행 수와 무관하게 비용이 제한된다
+    """
+    candidates = query.with_entities(Review.review_id).order_by(
+        desc(Review.created_at), desc(Review.review_id)
+    ).limit(limit).subquery()
+    return select(candidates.c.review_id)
+
+def search_rank(terms: List[str], dialect_name: str):
+    """
+    관련도 정렬 식 (클수록 관련도 높음)
+    검색어별 제목/내용 일치 가중치 합, PostgreSQL에서는 제목의 pg_trgm word_similarity를 보조 점수로 더한다
+    (긴 내용의 유사도 계산은 비용이 커서 제외)
+    """
+    rank = literal(0.0)
+    for term in terms:
+        rank = rank + case((_title_match(term), TITLE_MATCH_WEIGHT), else_=0.0)
+        rank = rank + case((_content_match(term), CONTENT_MATCH_WEIGHT), else_=0.0)
+
+    if dialect_name == "postgresql":
+        query_text = " ".join(terms)
+        # 유사도(0~1)는 일치 가중치보다 작게 반영하여 검색어 일치 개수가 우선하도록 한다
+        rank = rank + func.word_similarity(query_text, Review.title) * (TITLE_MATCH_WEIGHT / 10)
+    return rank
+
+def _match_spans(text: str, terms: List[str]) -> List[tuple]:
+    """검색어 일치 구간 목록 (겹치는 구간은 병합, 대소문자 무시)"""
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    spans = []
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+def _mark(text: str, spans: List[tuple], offset: int = 0) -> str:
+    """text[offset:] 범위 구간을 <mark>로 감싼 HTML (나머지는 이스케이프)"""
+    parts = []
+    position = offset
+    for start, end in spans:
+        start, end = max(start, offset), min(end, offset + len(text))
+        if start >= end:
+            continue
+        parts.append(html.escape(text[position - offset:start - offset]))
+        parts.append(HIGHLIGHT_OPEN + html.escape(text[start - offset:end - offset]) + HIGHLIGHT_CLOSE)
+        position = end
+    parts.append(html.escape(text[position - offset:]))
+    return "".join(parts)
+
+def highlight_title(title: str, terms: List[str]) -> str:
+    """제목 전체에 일치 부분 표시"""
+    return _mark(title, _match_spans(title, terms))
+
+def highlight_snippet(content: str, terms: List[str], length: int = SNIPPET_LENGTH) -> Optional[str]:
+    """
+    첫 일치 위치 주변 내용 발췌에 일치 부분 표시
+    내용에 일치가 없으면(제목만 일치) 내용 앞부분을 발췌
+    """
+    spans = _match_spans(content, terms)
+    start = max(0, spans[0][0] - SNIPPET_CONTEXT) if spans else 0
+    end = min(len(content), start + length)
+    start = max(0, min(start, end - length))
+
+    snippet = _mark(content[start:end], spans, offset=start)
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(content):
+        snippet = snippet + "…"
+    return snippet
+
+def build_highlight(review: Review, terms: List[str]) -> dict:
+    return {
+        "title": highlight_title(review.title, terms),
+        "content": highlight_snippet(review.content, terms),
+    }
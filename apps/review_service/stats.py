@@ -0,0 +1,378 @@
+"""
+stats.py - Review Service Hospital Statistics
+병원별 리뷰 통계 증분 유지 (리뷰 한 건의 변경분만 반영, 백그라운드 병합)
+
+- 리뷰 생성/수정/삭제는 같은 트랜잭션에서 그 리뷰의 변경분(리뷰 수, 평점 합계, 평점 구간, 키워드 개수)을
+  review_stats_deltas에 INSERT만 하고 바로 응답한다 (같은 병원의 동시 쓰기도 공유 행을 잠그지 않음)
+- 백그라운드 작업이 가장 오래된 변경분이 병합 구간을 지난 병원을 모아, 변경분을 GROUP BY로 합산하여
+  통계 행에 한 번 반영하고 반영한 변경분을 삭제한다 (같은 트랜잭션)
+- 변경분은 더하기만 하므로 여러 작업자가 같은 병원의 서로 다른 변경분을 반영해도 결과가 같다
+
+전체 재계산 (복구용):
+    python stats.py rebuild [hospital_id]
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, text
+from sqlalchemy.orm import Session
+
+from database import dialect_insert
+from models import Review, ReviewKeyword, ReviewStats, ReviewStatsDelta, KST
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+STATS_COALESCE_SECONDS = float(os.getenv("REVIEW_STATS_COALESCE_SECONDS", "2"))
+STATS_POLL_INTERVAL = float(os.getenv("REVIEW_STATS_POLL_INTERVAL", "1"))
+STATS_BATCH_SIZE = int(os.getenv("REVIEW_STATS_BATCH_SIZE", "50"))
+
+# 변경분 기록(공유)과 전체 재계산(배타)을 병원 단위로 구분하는 PostgreSQL advisory lock 키
+# 공유 잠금끼리는 서로 기다리지 않으므로 리뷰 쓰기는 같은 병원이어도 직렬화되지 않는다
+STATS_REBUILD_LOCK_KEY = 7301042
+
+KEYWORD_CATEGORIES = ["CARE", "SERVICE", "FACILITY"]
+
+# 평점 분포 구간 (하한 이상, 반올림 기준 0.5) -> 통계 컬럼
+RATING_BUCKETS = [(4.5, "rating_5"), (3.5, "rating_4"), (2.5, "rating_3"), (1.5, "rating_2")]
+RATING_COLUMNS = [column for _, column in RATING_BUCKETS] + ["rating_1"]
+
+def rating_bucket(rating: float) -> str:
+    """평점이 속하는 분포 컬럼 이름"""
+    for lower, column in RATING_BUCKETS:
+        if rating >= lower:
+            return column
+    return "rating_1"
+
+def keyword_stats_column(category: str) -> str:
+    """키워드 카테고리의 통계 컬럼 이름 (CARE -> care_keywords)"""
+    return f"{str(category).lower()}_keywords"
+
+def review_contribution(review: Review, keywords: Iterable[ReviewKeyword] = ()) -> Optional[dict]:
+    """
+    리뷰 한 건이 병원 통계에 기여하는 값 (비활성 리뷰는 None)
+    keywords를 생략하면 키워드 통계는 변경하지 않는다 (평점만 수정하는 경우)
+    """
+    if review.is_active is False:
+        return None
+    return {
+        "rating": review.rating,
+        "keywords": [
+            (str(getattr(keyword.category, "value", keyword.category)), keyword.keyword_code, keyword.keyword_name, keyword.is_positive)
+            for keyword in keywords
+        ],
+    }
+
+def record_review_delta(db: Session, hospital_id: int, previous: Optional[dict], current: Optional[dict]):
+    """
+    리뷰 변경 전/후 기여값 차이를 변경분 대기열에 추가 (커밋은 호출자, 리뷰 변경과 같은 트랜잭션)
+    수정/삭제는 리뷰 행을 잠근 뒤 변경 전 기여값을 읽어야 동시 수정에서도 변경분이 어긋나지 않는다
+    """
+    if previous == current:
+        return
+
+    if db.bind.dialect.name == "postgresql":
+        # 재계산이 진행 중이면 끝날 때까지 대기 (재계산 집계와 변경분이 중복 반영되지 않도록)
+        db.execute(
+            text("SELECT pg_advisory_xact_lock_shared(:key, :hospital_id)"),
+            {"key": STATS_REBUILD_LOCK_KEY, "hospital_id": hospital_id}
+        )
+    delta = ReviewStatsDelta(hospital_id=hospital_id, total_reviews=0, rating_sum=0.0)
+    for column in RATING_COLUMNS:
+        setattr(delta, column, 0)
+    keyword_deltas: Counter = Counter()
+    keyword_names: Dict[tuple, str] = {}
+    for sign, contribution in ((-1, previous), (1, current)):
+        if contribution is None:
+            continue
+        rating = contribution["rating"]
+        delta.total_reviews += sign
+        delta.rating_sum += sign * rating
+        column = rating_bucket(rating)
+        setattr(delta, column, getattr(delta, column) + sign)
+        for category, keyword_code, keyword_name, is_positive in contribution["keywords"]:
+            key = (category, keyword_code, is_positive)
+            keyword_deltas[key] += sign
+            keyword_names.setdefault(key, keyword_name)
+
+    delta.keyword_deltas = [
+        [category, keyword_code, keyword_names[(category, keyword_code, is_positive)], is_positive, count]
+        for (category, keyword_code, is_positive), count in keyword_deltas.items() if count
+    ] or None
+    db.add(delta)
+
+def _lock_stats(db: Session, hospital_id: int) -> Tuple[ReviewStats, bool]:
+    """병원 통계 행을 잠금 조회 (없으면 생성), (통계, 새로 생성 여부) 반환"""
+    stats = db.query(ReviewStats).filter(
+        ReviewStats.hospital_id == hospital_id
+    ).with_for_update().first()
+    if stats:
+        return stats, False
+
+    insert = dialect_insert(db.bind.dialect.name)
+    if insert is not None:
+        # 동시 생성 시 유니크 제약 충돌 없이 한 행만 생성
+        db.execute(insert(ReviewStats).values(
+            hospital_id=hospital_id, rating_sum=0.0
+        ).on_conflict_do_nothing(index_elements=["hospital_id"]))
+        stats = db.query(ReviewStats).filter(
+            ReviewStats.hospital_id == hospital_id
+        ).with_for_update().one()
+    else:
+        stats = ReviewStats(hospital_id=hospital_id)
+        db.add(stats)
+    return stats, True
+
+def claim_pending_deltas(db: Session, coalesce_seconds: float = STATS_COALESCE_SECONDS, batch_size: int = STATS_BATCH_SIZE) -> List[int]:
+    """
+    가장 오래된 변경분이 병합 구간을 지난 병원들의 변경분을 잠그고 ID 목록 반환 (커밋은 호출자)
+    병합 구간 동안 같은 병원에 쌓인 변경분은 한 번에 반영된다
+    """
+    cutoff = datetime.now(KST) - timedelta(seconds=coalesce_seconds)
+    oldest = func.min(ReviewStatsDelta.created_at)
+    hospital_ids = [
+        row.hospital_id for row in db.query(ReviewStatsDelta.hospital_id).group_by(
+            ReviewStatsDelta.hospital_id
+        ).having(oldest <= cutoff).order_by(oldest).limit(batch_size).all()
+    ]
+    if not hospital_ids:
+        return []
+
+    query = db.query(ReviewStatsDelta.id).filter(ReviewStatsDelta.hospital_id.in_(hospital_ids))
+    if db.bind.dialect.name == "postgresql":
+        # 다른 작업자가 반영 중인 변경분은 건너뜀 (변경분은 더하기만 하므로 나눠서 반영해도 결과가 같음)
+        query = query.with_for_update(skip_locked=True)
+    return [row.id for row in query.all()]
+
+def apply_pending_deltas(db: Session, coalesce_seconds: float = STATS_COALESCE_SECONDS, batch_size: int = STATS_BATCH_SIZE) -> int:
+    """
+    변경분 한 배치를 병원별로 합산하여 통계에 반영하고 삭제 (한 트랜잭션), 처리한 병원 수 반환
+    통계 행이 없거나 rating_sum 도입 이전 행이면 리뷰 기준으로 한 번 재계산한다
+    """
+    delta_ids = claim_pending_deltas(db, coalesce_seconds, batch_size)
+    if not delta_ids:
+        return 0
+
+    totals = db.query(
+        ReviewStatsDelta.hospital_id,
+        func.sum(ReviewStatsDelta.total_reviews),
+        func.sum(ReviewStatsDelta.rating_sum),
+        *[func.sum(getattr(ReviewStatsDelta, column)) for column in RATING_COLUMNS]
+    ).filter(ReviewStatsDelta.id.in_(delta_ids)).group_by(ReviewStatsDelta.hospital_id).all()
+
+    keyword_deltas: Dict[int, Counter] = {}
+    keyword_names: Dict[tuple, str] = {}
+    for hospital_id, items in db.query(ReviewStatsDelta.hospital_id, ReviewStatsDelta.keyword_deltas).filter(
+        and_(ReviewStatsDelta.id.in_(delta_ids), ReviewStatsDelta.keyword_deltas.isnot(None))
+    ).all():
+        counter = keyword_deltas.setdefault(hospital_id, Counter())
+        for category, keyword_code, keyword_name, is_positive, count in items:
+            key = (category, keyword_code, is_positive)
+            counter[key] += count
+            keyword_names.setdefault(key, keyword_name)
+
+    for hospital_id, total_reviews, rating_sum, *bucket_counts in totals:
+        stats, created = _lock_stats(db, hospital_id)
+        if created or stats.rating_sum is None:
+            db.flush()
+            rebuild_hospital_stats(db, hospital_id, stats)
+            continue
+
+        stats.total_reviews = (stats.total_reviews or 0) + total_reviews
+        stats.rating_sum = round(stats.rating_sum + rating_sum, 1)
+        for column, count in zip(RATING_COLUMNS, bucket_counts):
+            setattr(stats, column, (getattr(stats, column) or 0) + count)
+        if stats.total_reviews > 0:
+            stats.average_rating = round(stats.rating_sum / stats.total_reviews, 1)
+        else:
+            stats.total_reviews = 0
+            stats.rating_sum = 0.0
+            stats.average_rating = 0.0
+
+        deltas = keyword_deltas.get(hospital_id, Counter())
+        for category in KEYWORD_CATEGORIES:
+            category_deltas = {key: count for key, count in deltas.items() if key[0] == category and count}
+            if category_deltas:
+                column = keyword_stats_column(category)
+                # JSON 컬럼은 새 리스트를 대입해야 변경이 감지됨
+                setattr(stats, column, _apply_keyword_deltas(getattr(stats, column) or [], category_deltas, keyword_names))
+        stats.last_updated = datetime.now(KST)
+
+    db.query(ReviewStatsDelta).filter(ReviewStatsDelta.id.in_(delta_ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(totals)
+
+def _apply_keyword_deltas(items: List[dict], deltas: Dict[tuple, int], keyword_names: Dict[tuple, str]) -> List[dict]:
+    """키워드 통계 리스트에 변경분 반영 (개수가 0 이하가 된 항목은 제거)"""
+    updated = []
+    for item in items:
+        key = next((key for key in deltas if key[1] == item["keyword_code"] and key[2] == item["is_positive"]), None)
+        if key is None:
+            updated.append(item)
+            continue
+        count = item["count"] + deltas.pop(key)
+        if count > 0:
+            updated.append({**item, "count": count})
+
+    for key, delta in deltas.items():
+        if delta > 0:
+            updated.append({
+                "keyword_code": key[1],
+                "keyword_name": keyword_names[key],
+                "is_positive": key[2],
+                "count": delta
+            })
+    return updated
+
+def rebuild_hospital_stats(db: Session, hospital_id: int, stats: Optional[ReviewStats] = None) -> ReviewStats:
+    """
+    병원 통계를 활성 리뷰 기준으로 재계산 (커밋은 호출자)
+    리뷰/키워드 행을 읽어오지 않고 GROUP BY 집계 쿼리로 계산
+    재계산이 모든 리뷰를 반영하므로 대기 중인 변경분은 삭제한다
+    (PostgreSQL은 배타 advisory lock으로 새 변경분 커밋을 막은 상태에서 삭제와 집계를 수행)
+    """
+    if db.bind.dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:key, :hospital_id)"),
+            {"key": STATS_REBUILD_LOCK_KEY, "hospital_id": hospital_id}
+        )
+    # 통계 행보다 변경분을 먼저 잠가 변경분 반영 작업과 같은 순서로 잠근다
+    db.query(ReviewStatsDelta).filter(
+        ReviewStatsDelta.hospital_id == hospital_id
+    ).delete(synchronize_session=False)
+    if stats is None:
+        stats, _ = _lock_stats(db, hospital_id)
+
+    active = and_(Review.hospital_id == hospital_id, Review.is_active == True)
+    bucket = case(
+        *[(Review.rating >= lower, column) for lower, column in RATING_BUCKETS],
+        else_="rating_1"
+    )
+    total, rating_sum = db.query(
+        func.count(Review.review_id), func.coalesce(func.sum(Review.rating), 0.0)
+    ).filter(active).one()
+    bucket_counts = dict(
+        db.query(bucket, func.count(Review.review_id)).filter(active).group_by(bucket).all()
+    )
+
+    stats.total_reviews = total
+    stats.rating_sum = round(float(rating_sum), 1)
+    stats.average_rating = round(stats.rating_sum / total, 1) if total else 0.0
+    for column in RATING_COLUMNS:
+        setattr(stats, column, bucket_counts.get(column, 0))
+
+    keyword_rows = db.query(
+        ReviewKeyword.category,
+        ReviewKeyword.keyword_code,
+        ReviewKeyword.is_positive,
+        func.max(ReviewKeyword.keyword_name),
+        func.count(ReviewKeyword.id)
+    ).join(Review).filter(active).group_by(
+        ReviewKeyword.category,
+        ReviewKeyword.keyword_code,
+        ReviewKeyword.is_positive
+    ).order_by(ReviewKeyword.category, ReviewKeyword.keyword_code).all()
+
+    keyword_stats = {category: [] for category in KEYWORD_CATEGORIES}
+    for category, keyword_code, is_positive, keyword_name, count in keyword_rows:
+        keyword_stats.setdefault(category, []).append({
+            "keyword_code": keyword_code,
+            "keyword_name": keyword_name,
+            "is_positive": is_positive,
+            "count": count
+        })
+    for category in KEYWORD_CATEGORIES:
+        setattr(stats, keyword_stats_column(category), keyword_stats[category])
+
+    stats.last_updated = datetime.now(KST)
+    return stats
+
+def rebuild_all_stats(db: Session) -> int:
+    """리뷰 또는 통계가 있는 모든 병원의 통계 재계산 (병원별 커밋), 처리한 병원 수 반환"""
+    hospital_ids = {row[0] for row in db.query(Review.hospital_id).distinct().all()}
+    hospital_ids |= {row[0] for row in db.query(ReviewStats.hospital_id).all()}
+
+    for hospital_id in sorted(hospital_ids):
+        rebuild_hospital_stats(db, hospital_id)
+        db.commit()
+    return len(hospital_ids)
+
+class StatsWorker:
+    """대기 중인 통계 변경분을 주기적으로 병합하여 반영하는 백그라운드 작업"""
+
+    def __init__(self, session_factory, interval: float = STATS_POLL_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def recompute_once(self) -> int:
+        """병합 구간이 지난 변경분이 남지 않을 때까지 배치 반복"""
+        db = self.session_factory()
+        try:
+            total = 0
+            while True:
+                count = apply_pending_deltas(db)
+                total += count
+                if count < STATS_BATCH_SIZE:
+                    return total
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                # 집계 쿼리가 이벤트 루프를 막지 않도록 스레드에서 실행
+                count = await asyncio.to_thread(self.recompute_once)
+                if count:
+                    logger.info(f"📊 병원 {count}곳 리뷰 통계 변경분 반영")
+            except Exception as e:
+                logger.error(f"❌ 리뷰 통계 변경분 반영 실패: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📊 리뷰 통계 작업 시작 (병합 구간 {STATS_COALESCE_SECONDS}초, 주기 {self.interval}초)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+if __name__ == "__main__":
+    import sys
+    from database import SessionLocal, create_tables
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("사용법: python stats.py rebuild [hospital_id]")
+        sys.exit(1)
+
+    create_tables()
+    session = SessionLocal()
+    try:
+        if len(sys.argv) > 2:
+            rebuild_hospital_stats(session, int(sys.argv[2]))
+            session.commit()
+            logger.info(f"✅ 병원 {sys.argv[2]} 리뷰 통계 재계산 완료")
+        else:
+            count = rebuild_all_stats(session)
+            logger.info(f"✅ 병원 {count}곳 리뷰 통계 재계산 완료")
+    finally:
+        session.close()
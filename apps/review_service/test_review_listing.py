@@ -0,0 +1,104 @@
+"""
+test_review_listing.py - Review Service Listing Query Count Test
+리뷰 목록 한 페이지의 SQL 문 수가 페이지 크기와 무관하게 일정한지 검사 (N+1 회귀 방지)
+
+    cd apps/review_service && python -m pytest -q test_review_listing.py
+"""
+
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+
+# 서비스 모듈은 서비스 디렉터리 기준으로 import (컨테이너 실행 환경과 동일)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# database.py가 import 시점에 엔진을 만들므로 모듈 import 전에 임시 SQLite DB 지정
+_DATA_DIR = tempfile.mkdtemp(prefix="review-listing-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'reviews.db')}"
+# auth-service는 연결 거부되는 주소로 지정 (사용자 이름은 대체 이름으로 응답)
+os.environ["AUTH_SERVICE_URL"] = "http://127.0.0.1:9"
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import routes
+from database import engine, SessionLocal, create_tables
+from models import API_PREFIX, Review, ReviewKeyword, ReviewImage
+from pagination import review_count_cache
+
+HOSPITAL_ID = 1
+SEED_REVIEWS = 120
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수 집계"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+@pytest.fixture(scope="module")
+def client():
+    create_tables()
+    db = SessionLocal()
+    try:
+        for index in range(SEED_REVIEWS):
+            photo = f"photo-{index}".encode()
+            review = Review(
+                hospital_id=HOSPITAL_ID,
+                user_id=index % 7 + 1,
+                title=f"리뷰 {index}",
+                content="진료가 친절하고 시설이 깨끗했습니다.",
+                rating=index % 5 + 1,
+                is_active=True
+            )
+            review.keywords = [
+                ReviewKeyword(category="CARE", keyword_code=f"CARE_{code}", keyword_name=f"진료{code}", is_positive=True)
+                for code in (index % 3, 3 + index % 4)
+            ]
+            review.images = [
+                ReviewImage(
+                    image_data=base64.b64encode(photo).decode(),
+                    content_hash=hashlib.sha256(photo).hexdigest(),
+                    image_type="jpeg",
+                    file_size=len(photo),
+                    image_order=1
+                )
+            ]
+            db.add(review)
+        db.commit()
+    finally:
+        db.close()
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix=API_PREFIX)
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+def page_queries(client, query_counter, params: str, limit: int) -> int:
+    """총 개수 캐시를 비운 상태에서 목록 한 페이지 요청의 SQL 문 수"""
+    review_count_cache.clear()
+    before = query_counter.count
+    response = client.get(f"{API_PREFIX}/reviews?{params}&limit={limit}")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == limit
+    return query_counter.count - before
+
+@pytest.mark.parametrize("params", [
+    f"hospital_id={HOSPITAL_ID}",
+    f"hospital_id={HOSPITAL_ID}&keyword_category=CARE",
+], ids=["hospital", "keyword"])
+def test_page_query_count_independent_of_limit(client, query_counter, params):
+    assert page_queries(client, query_counter, params, 1) == page_queries(client, query_counter, params, 100)
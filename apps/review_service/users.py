@@ -0,0 +1,162 @@
+"""
+users.py - Review Service User Names
+auth-service 사용자 표시 이름 조회 (일괄 조회 + 로컬 캐시)
+
+- 연결 풀을 재사용하는 비동기 클라이언트 하나로 auth-service의 일괄 조회 API를 호출한다
+- 표시 이름은 TTL/LRU 캐시에 보관하여 리뷰 목록 한 페이지는 캐시 미스 사용자에 대해서만 원격 호출을 최대 한 번 한다
+- auth-service가 닉네임 변경 시 무효화 웹훅(/internal/users/invalidate)을 호출하며, 놓친 알림은 TTL이 지나면 반영된다
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수 설정
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "https://wellness-meditrip-backend.eastus2.cloudapp.azure.com:8013")
+AUTH_SERVICE_TIMEOUT = float(os.getenv("AUTH_SERVICE_TIMEOUT", "3.0"))
+AUTH_SERVICE_MAX_CONNECTIONS = int(os.getenv("AUTH_SERVICE_MAX_CONNECTIONS", "20"))
+USER_NAME_CACHE_TTL = float(os.getenv("USER_NAME_CACHE_TTL", "300"))
+USER_NAME_CACHE_MAX_ENTRIES = int(os.getenv("USER_NAME_CACHE_MAX_ENTRIES", "10000"))
+
+# auth-service 일괄 조회 API 한 번에 보낼 수 있는 최대 사용자 수
+USER_BATCH_MAX_IDS = 500
+
+def fallback_user_name(user_id: int) -> str:
+    """조회하지 못한 사용자의 표시 이름"""
+    return f"User_{user_id}"
+
+def display_name(user: dict, user_id: int) -> str:
+    """nickname이 있으면 nickname, 없으면 username"""
+    return user.get("nickname") or user.get("username") or fallback_user_name(user_id)
+
+class UserNameCache:
+    """
+    사용자 ID -> 표시 이름 캐시 (TTL 만료, 최대 개수 초과 시 오래 사용하지 않은 항목부터 제거)
+    이벤트 루프 안에서만 사용하며 await 없이 동작하므로 잠금이 필요 없다
+    """
+
+    def __init__(self, ttl: float = USER_NAME_CACHE_TTL, max_entries: int = USER_NAME_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # 사용자 ID -> (표시 이름, 만료 시각)
+        self._entries: "OrderedDict[int, Tuple[str, float]]" = OrderedDict()
+
+    def get_many(self, user_ids: Iterable[int]) -> Tuple[Dict[int, str], List[int]]:
+        """캐시된 이름과 캐시 미스 사용자 ID 목록 반환"""
+        now = time.monotonic()
+        found: Dict[int, str] = {}
+        missing: List[int] = []
+        for user_id in user_ids:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= now:
+                self._entries.pop(user_id, None)
+                missing.append(user_id)
+                continue
+            self._entries.move_to_end(user_id)
+            found[user_id] = entry[0]
+        return found, missing
+
+    def put_many(self, names: Dict[int, str]):
+        expires_at = time.monotonic() + self.ttl
+        for user_id, name in names.items():
+            self._entries[user_id] = (name, expires_at)
+            self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[int]) -> int:
+        """캐시 항목 삭제, 삭제한 개수 반환"""
+        return sum(1 for user_id in user_ids if self._entries.pop(user_id, None) is not None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class UserDirectory:
+    """auth-service 사용자 표시 이름 조회 (풀링된 비동기 클라이언트 + 캐시)"""
+
+    def __init__(self, base_url: str = AUTH_SERVICE_URL, cache: Optional[UserNameCache] = None):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache or UserNameCache()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=AUTH_SERVICE_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=AUTH_SERVICE_MAX_CONNECTIONS,
+                    max_keepalive_connections=AUTH_SERVICE_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def get_user_names(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        사용자 ID 목록의 표시 이름 반환 (모든 ID에 대해 값이 있음)
+        캐시 미스 사용자만 auth-service에 일괄 조회하고, 조회 실패/미존재 사용자는 기본 이름으로 대체한다
+        기본 이름은 캐시하지 않으므로 auth-service가 복구되거나 사용자가 생기면 다음 요청에서 바로 반영된다
+        """
+        unique_user_ids = list(dict.fromkeys(user_ids))
+        names, missing = self.cache.get_many(unique_user_ids)
+        if missing:
+            fetched = await self._fetch_user_names(missing)
+            self.cache.put_many(fetched)
+            names.update(fetched)
+        for user_id in missing:
+            names.setdefault(user_id, fallback_user_name(user_id))
+        return names
+
+    async def _fetch_user_names(self, user_ids: List[int]) -> Dict[int, str]:
+        """auth-service 일괄 조회 (리뷰 목록 한 페이지는 최대 100명이므로 보통 한 번 호출)"""
+        names: Dict[int, str] = {}
+        for start in range(0, len(user_ids), USER_BATCH_MAX_IDS):
+            chunk = user_ids[start:start + USER_BATCH_MAX_IDS]
+            try:
+                response = await self.client.post("/profile/users/batch", json={"user_ids": chunk})
+                response.raise_for_status()
+                users = response.json().get("users", {})
+            except Exception as e:
+                logger.warning(f"⚠️ 사용자 {len(chunk)}명 이름 일괄 조회 실패: {e}")
+                continue
+            for key, user in users.items():
+                user_id = int(key)
+                names[user_id] = display_name(user, user_id)
+        return names
+
+    def invalidate(self, user_ids: Iterable[int]) -> int:
+        return self.cache.invalidate(user_ids)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_user_directory: Optional[UserDirectory] = None
+
+def get_user_directory() -> UserDirectory:
+    """프로세스 전역 사용자 이름 조회기"""
+    global _user_directory
+    if _user_directory is None:
+        _user_directory = UserDirectory(AUTH_SERVICE_URL)
+        logger.info(
+            f"👤 사용자 이름 조회: {AUTH_SERVICE_URL} "
+            f"(캐시 TTL {USER_NAME_CACHE_TTL:.0f}초, 최대 {USER_NAME_CACHE_MAX_ENTRIES}명)"
+        )
+    return _user_directory
+
+async def close_user_directory():
+    global _user_directory
+    if _user_directory is not None:
+        await _user_directory.close()
+        _user_directory = None